@@ -0,0 +1,354 @@
+"""
+Rename/unrename benchmark on synthetic trees, every tree has to round-trip.
+
+Runs `dir_renamer`, `get_unrename_dir` and `unrename_from_json` on every tree
+shape (see trees.py), `Renamer(incremental=True)` after a few new arrivals,
+`build_plan` and `apply_plan` separately, `RenameArchive.pack` and
+`Unrenamer(archive=...)`, and `file_renamer`, `get_dir_name`, `DirNameIndex`
+and `RandomNameIndex` on their own, in a tmpfs directory when one is
+available. The results are printed as JSON, so they can be saved and compared
+across commits.
+
+$ python3 benchmarks/renaming.py [--scale 1.0] [--repeat 1] [--dir /dev/shm]
+                                 [--output results.json] [--compare old.json]
+"""
+
+import argparse
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from json import dumps, load
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from trees import SHAPES, make_flat, make_tree
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from frenamer import (  # noqa: E402
+    DirNameIndex,
+    NameIndex,
+    RandomNameIndex,
+    RenameArchive,
+    RenameDataIndex,
+    Renamer,
+    Unrenamer,
+    apply_plan,
+    build_plan,
+    dir_renamer,
+    file_renamer,
+    get_dir_name,
+    get_json_files,
+    get_unrename_dir,
+    unrename_from_json,
+)
+from frenamer.reporter import Reporter  # noqa: E402
+from frenamer.snapshot import TreeSnapshot  # noqa: E402
+
+DATA_FILENAME = "rename_data.json"
+FILE_RENAMER_FILES = 20_000
+GET_DIR_NAME_CALLS = 2_000
+DIR_NAME_INDEX_CALLS = 1_000_000
+RANDOM_NAME_INDEX_CALLS = 1_000_000
+# عدد الاسماء في كل مجلد عند قياس الاسماء العشوائية
+RANDOM_NAMES_PER_DIRECTORY = 10_000
+# عدد المجلدات التي يضاف اليها ملف جديد قبل اعادة التسمية بـ --incremental
+INCREMENTAL_ARRIVALS = 10
+
+
+def default_directory() -> str:
+    """ارجاع مجلد في tmpfs ان وجد، لكي لا يتم قياس سرعة القرص"""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def listing(root: Path) -> List[str]:
+    """جميع المسارات داخل المجلد مرتبة"""
+    return sorted(
+        os.path.relpath(os.path.join(directory, name), root)
+        for directory, dirs, files in os.walk(root)
+        for name in dirs + files
+    )
+
+
+def result(name: str, tree: str, entries: int, seconds: float) -> dict:
+    return {
+        "name": name,
+        "tree": tree,
+        "entries": entries,
+        "seconds": round(seconds, 6),
+        "us_per_entry": round(seconds / max(entries, 1) * 1e6, 3),
+    }
+
+
+def bench_tree(
+    base: str, shape: str, scale: float, seed: int
+) -> Tuple[List[dict], bool]:
+    """اعادة تسمية الشجرة مع حفظ البيانات ثم التراجع عنها كما يفعل unrename"""
+    root = Path(base, shape)
+    dirs, files = make_tree(root.as_posix(), shape, scale=scale, seed=seed)
+    entries = dirs + files
+    before = listing(root)
+    with Reporter(quiet=True) as reporter:
+        start = perf_counter()
+        dir_renamer(
+            root,
+            is_root=True,
+            save_data=True,
+            data_filename=DATA_FILENAME,
+            snapshot=TreeSnapshot(),
+            reporter=reporter,
+        )
+        rename_seconds = perf_counter() - start
+
+        snapshot = TreeSnapshot()
+        json_files = list(map(Path, get_json_files(root, DATA_FILENAME, snapshot)))
+        index = RenameDataIndex(json_files)
+        unrename_dir_seconds = 0.0
+        unrename_seconds = 0.0
+        for json_file in json_files:
+            start = perf_counter()
+            get_unrename_dir(json_file.parent, json_files, root.name, index=index)
+            unrename_dir_seconds += perf_counter() - start
+            start = perf_counter()
+            unrename_from_json(
+                json_file,
+                delete=True,
+                snapshot=snapshot,
+                reporter=reporter,
+                index=index,
+            )
+            unrename_seconds += perf_counter() - start
+    roundtrip = listing(root) == before
+    shutil.rmtree(root)
+    return [
+        result("dir_renamer", shape, entries, rename_seconds),
+        result("get_unrename_dir", shape, len(json_files), unrename_dir_seconds),
+        result("unrename_from_json", shape, entries, unrename_seconds),
+    ], roundtrip
+
+
+def bench_incremental(base: str, scale: float, seed: int) -> dict:
+    """اعادة تسمية الملفات الجديدة فقط في شجرة تمت اعادة تسميتها مسبقاً"""
+    root = Path(base, "incremental")
+    make_tree(root.as_posix(), "saved", scale=scale, seed=seed)
+    renamer = Renamer(data_filename=DATA_FILENAME, incremental=True)
+    for _ in renamer.rename(root):
+        pass
+    # وقت تعديل قديم لكي يتم حفظه في حالة المجلدات، لان الوقت القريب من الوقت
+    # الحالي لا يتم حفظه
+    directories = [directory for directory, _, _ in os.walk(root)]
+    for directory in directories:
+        os.utime(directory, (0, 0))
+    for _ in renamer.rename(root):
+        pass
+    step = max(1, len(directories) // INCREMENTAL_ARRIVALS)
+    arrivals = directories[::step][:INCREMENTAL_ARRIVALS]
+    for directory in arrivals:
+        open(os.path.join(directory, "arrival.txt"), "w").close()
+    start = perf_counter()
+    renamed = sum(1 for _ in renamer.rename(root))
+    seconds = perf_counter() - start
+    shutil.rmtree(root)
+    assert renamed == len(arrivals), (renamed, len(arrivals))
+    return result("Renamer(incremental=True)", "saved", renamed, seconds)
+
+
+def bench_plan(base: str, scale: float, seed: int) -> List[dict]:
+    """بناء خطة اعادة التسمية ثم تنفيذها، تنفيذ الخطة بدون قراءة او بحث"""
+    root = Path(base, "plan")
+    dirs, files = make_tree(root.as_posix(), "saved", scale=scale, seed=seed)
+    start = perf_counter()
+    plan = build_plan([root], options={"save_data": True})
+    plan_seconds = perf_counter() - start
+    start = perf_counter()
+    renamed = sum(1 for _ in apply_plan(plan))
+    apply_seconds = perf_counter() - start
+    shutil.rmtree(root)
+    assert renamed == dirs + files, (renamed, dirs + files)
+    return [
+        result("build_plan", "saved", renamed, plan_seconds),
+        result("apply_plan", "saved", renamed, apply_seconds),
+    ]
+
+
+def bench_archive(base: str, scale: float, seed: int) -> List[dict]:
+    """ضغط ملفات البيانات في ارشيف ثم التراجع منه، بدون ملفات البيانات"""
+    root = Path(base, "archive")
+    dirs, files = make_tree(root.as_posix(), "saved", scale=scale, seed=seed)
+    before = listing(root)
+    for _ in Renamer(save_data=True, data_filename=DATA_FILENAME).rename(root):
+        pass
+    archive_file = os.path.join(base, "rename_data.fra")
+    start = perf_counter()
+    packed = RenameArchive.pack(archive_file, root, DATA_FILENAME, delete=True)
+    pack_seconds = perf_counter() - start
+    start = perf_counter()
+    with RenameArchive(archive_file, root) as archive:
+        unrenamer = Unrenamer(data_filename=DATA_FILENAME, archive=archive)
+        unrenamed = sum(1 for _ in unrenamer.unrename(root))
+    unrename_seconds = perf_counter() - start
+    assert listing(root) == before
+    shutil.rmtree(root)
+    os.remove(archive_file)
+    assert unrenamed == dirs + files, (unrenamed, dirs + files)
+    return [
+        result("RenameArchive.pack", "saved", packed, pack_seconds),
+        result("Unrenamer(archive=...)", "saved", unrenamed, unrename_seconds),
+    ]
+
+
+def bench_file_renamer(base: str, scale: float, seed: int) -> dict:
+    """اعادة تسمية ملفات مجلد واحد باستخدام file_renamer وفهرس واحد للمجلد"""
+    root = Path(base, "file_renamer")
+    make_flat(root.as_posix(), max(1, int(FILE_RENAMER_FILES * scale)), seed=seed)
+    snapshot = TreeSnapshot()
+    _, _, names = snapshot.content(root)
+    index = NameIndex(root.name, names)
+    paths = [root / name for name in list(names)]
+    start = perf_counter()
+    for path in paths:
+        file_renamer(path, index=index, snapshot=snapshot)
+    seconds = perf_counter() - start
+    shutil.rmtree(root)
+    return result("file_renamer", "flat", len(paths), seconds)
+
+
+def bench_get_dir_name(base: str, scale: float) -> dict:
+    """جلب اسماء مجلدات جديدة في نفس المجلد بدون انشائها (صورة المجلد فقط)"""
+    root = Path(base, "get_dir_name")
+    root.mkdir()
+    calls = max(1, int(GET_DIR_NAME_CALLS * scale))
+    snapshot = TreeSnapshot()
+    start = perf_counter()
+    for _ in range(calls):
+        name = get_dir_name("", root.as_posix(), snapshot=snapshot)
+        snapshot.add(root / name, is_dir=True)
+    seconds = perf_counter() - start
+    shutil.rmtree(root)
+    return result("get_dir_name", "empty", calls, seconds)
+
+
+def bench_dir_name_index(scale: float) -> dict:
+    """حجز اسماء مجلدات ابجدية متتالية من فهرس واحد، كما يتم داخل كل مجلد"""
+    calls = max(1, int(DIR_NAME_INDEX_CALLS * scale))
+    index = DirNameIndex()
+    start = perf_counter()
+    for _ in range(calls):
+        index.allocate()
+    seconds = perf_counter() - start
+    return result("DirNameIndex.allocate", "empty", calls, seconds)
+
+
+def bench_random_name_index(scale: float) -> dict:
+    """حجز اسماء عشوائية من فهرس لكل مجلد، كما يفعل --random"""
+    calls = max(1, int(RANDOM_NAME_INDEX_CALLS * scale))
+    start = perf_counter()
+    for directory_start in range(0, calls, RANDOM_NAMES_PER_DIRECTORY):
+        allocate = RandomNameIndex().allocate
+        for _ in range(min(RANDOM_NAMES_PER_DIRECTORY, calls - directory_start)):
+            allocate()
+    seconds = perf_counter() - start
+    return result("RandomNameIndex.allocate", "empty", calls, seconds)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[dict], base_file: str) -> None:
+    """طباعة نسبة التغير في المدة مقارنة بنتائج سابقة"""
+    with open(base_file, "r", encoding="utf-8") as f:
+        base = {(item["name"], item["tree"]): item for item in load(f)["results"]}
+    for item in results:
+        old = base.get((item["name"], item["tree"]))
+        if old is None or not old["seconds"]:
+            continue
+        print(
+            f"{item['name']}[{item['tree']}]: {old['seconds']}s -> {item['seconds']}s"
+            f" (x{item['seconds'] / old['seconds']:.2f})",
+            file=sys.stderr,
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    parser.add_argument("--dir", default=default_directory())
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    # افضل مدة لكل قياس من جميع التكرارات
+    best: Dict[Tuple[str, str], dict] = {}
+    roundtrip: Dict[str, bool] = {}
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory(
+            prefix="frenamer-bench-", dir=args.dir
+        ) as base:
+            runs: List[dict] = []
+            for shape in args.shapes:
+                results, ok = bench_tree(base, shape, args.scale, args.seed)
+                runs.extend(results)
+                roundtrip[shape] = roundtrip.get(shape, True) and ok
+            runs.append(bench_incremental(base, args.scale, args.seed))
+            runs.extend(bench_plan(base, args.scale, args.seed))
+            runs.extend(bench_archive(base, args.scale, args.seed))
+            runs.append(bench_file_renamer(base, args.scale, args.seed))
+            runs.append(bench_get_dir_name(base, args.scale))
+            runs.append(bench_dir_name_index(args.scale))
+            runs.append(bench_random_name_index(args.scale))
+        for item in runs:
+            key = (item["name"], item["tree"])
+            if key not in best or item["seconds"] < best[key]["seconds"]:
+                best[key] = item
+
+    report = {
+        "benchmark": "renaming",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "directory": args.dir,
+        "scale": args.scale,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": list(best.values()),
+        "roundtrip": roundtrip,
+    }
+    output = dumps(report, indent=4)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    if args.compare:
+        compare(report["results"], args.compare)
+    failed = [shape for shape, ok in roundtrip.items() if not ok]
+    if failed:
+        print(
+            f"unrename did not restore the original tree: {', '.join(failed)}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
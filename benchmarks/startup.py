@@ -0,0 +1,161 @@
+"""
+Startup benchmark: importing frenamer has to stay under a fixed import-time budget,
+and `frenamer --version` with a stale update-check cache, so the check starts in the
+background, has to stay under a fixed run-time budget. Importing frenamer must not
+import `requests`, and importing the library API (`import frenamer`) must not import
+`typer` either.
+
+$ python3 benchmarks/startup.py [--runs 10] [--budget 150] [--version-budget 250]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from json import dumps
+from statistics import median
+from time import perf_counter
+
+# اقصى مدة (بالملي ثانية) لاستيراد frenamer
+IMPORT_BUDGET_MS = 150
+# اقصى مدة (بالملي ثانية) لتشغيل `frenamer --version` كاملاً مع بدء التحقق من
+# وجود تحديث
+VERSION_BUDGET_MS = 250
+
+
+def import_time_ms(env: dict) -> float:
+    """مدة استيراد frenamer بالملي ثانية باستخدام -X importtime"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import frenamer.__main__"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    # السطر الخاص بالحزمة نفسها يحتوي على المدة التراكمية لجميع ما تستورده
+    cumulative = [
+        int(match.group(1))
+        for match in re.finditer(
+            r"^import time:\s+\d+ \|\s+(\d+) \| frenamer(?:\.__main__)?$",
+            stderr,
+            flags=re.MULTILINE,
+        )
+    ]
+    return sum(cumulative) / 1000
+
+
+def imports_requests(env: dict) -> bool:
+    """هل يتم استيراد requests عند استيراد frenamer"""
+    return (
+        subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, frenamer.__main__; sys.exit('requests' in sys.modules)",
+            ],
+            env=env,
+        ).returncode
+        != 0
+    )
+
+
+def api_imports(env: dict) -> list:
+    """الحزم التي لا يجب استيرادها عند استيراد frenamer كمكتبة"""
+    return subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, frenamer; from frenamer import Renamer, Unrenamer;"
+            " print(' '.join(m for m in ('typer', 'click', 'requests') if m in sys.modules))",
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+
+def version_time_ms(env: dict) -> float:
+    """مدة تشغيل `frenamer --version` بالملي ثانية، بعد انتهاء صلاحية الاصدار المحفوظ"""
+    cache_file = os.path.join(env["XDG_CACHE_HOME"], "frenamer", "latest_version.json")
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    with open(cache_file, "w", encoding="utf-8") as f:
+        f.write(dumps({"checked": 0, "attempted": 0, "latestVersion": None}))
+    start = perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "frenamer", "--version"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    return (perf_counter() - start) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--version-budget", type=float, default=VERSION_BUDGET_MS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_home:
+        check_env = dict(
+            os.environ,
+            XDG_CACHE_HOME=cache_home,
+            PYTHONPATH=os.pathsep.join(
+                filter(
+                    None,
+                    (
+                        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        os.environ.get("PYTHONPATH"),
+                    ),
+                )
+            ),
+        )
+        check_env.pop("FRENAMER_NO_UPDATE_CHECK", None)
+        env = dict(check_env, FRENAMER_NO_UPDATE_CHECK="1")
+        import_times = [import_time_ms(env) for _ in range(args.runs)]
+        version_times = [version_time_ms(check_env) for _ in range(args.runs)]
+        requests_imported = imports_requests(env)
+        api_imported = api_imports(env)
+
+    result = {
+        "benchmark": "startup",
+        "runs": args.runs,
+        "import_ms": round(median(import_times), 2),
+        "version_ms": round(median(version_times), 2),
+        "budget_ms": args.budget,
+        "version_budget_ms": args.version_budget,
+        "requests_imported": requests_imported,
+        "api_imports": api_imported,
+    }
+    print(dumps(result, indent=4))
+    if requests_imported:
+        print("frenamer imports requests at startup", file=sys.stderr)
+        return 1
+    if api_imported:
+        print(
+            f"import frenamer imports {', '.join(api_imported)}",
+            file=sys.stderr,
+        )
+        return 1
+    if result["import_ms"] > args.budget:
+        print(
+            f"Import time {result['import_ms']}ms is over the budget ({args.budget}ms)",
+            file=sys.stderr,
+        )
+        return 1
+    if result["version_ms"] > args.version_budget:
+        print(
+            f"frenamer --version took {result['version_ms']}ms, over the budget"
+            f" ({args.version_budget}ms)",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
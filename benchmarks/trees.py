@@ -0,0 +1,118 @@
+"""
+Deterministic generator of synthetic trees for the benchmarks.
+
+$ python3 benchmarks/trees.py SHAPE ROOT [--scale 1.0] [--seed 0]
+"""
+
+import argparse
+import os
+import sys
+from random import Random
+from typing import Tuple
+
+# flat: مجلد واحد يحتوي على عدد كبير من الملفات
+# deep: سلسلة مجلدات عميقة في كل مجلد منها ملفين
+# wide: مجلد يحتوي على عدد كبير من المجلدات، وكل منها يحتوي على مجلدات
+# saved: مجلدات كثيرة في كل منها عدة ملفات، لاختبار ملفات البيانات
+SHAPES = ("flat", "deep", "wide", "saved")
+
+FLAT_FILES = 100_000
+DEEP_DEPTH = 400
+WIDE_FAN_OUT = (300, 30)
+SAVED_FAN_OUT = (17, 17, 17)
+SAVED_FILES = 5
+
+_SUFFIXES = ("", ".txt", ".tar.gz", ".jpg", ".py")
+
+
+def _scaled(value: int, scale: float) -> int:
+    return max(1, int(value * scale))
+
+
+def _make_files(rng: Random, directory: str, count: int) -> int:
+    for i in range(count):
+        name = f"{rng.choice('abcdefgh')}{i}{rng.choice(_SUFFIXES)}"
+        open(os.path.join(directory, name), "w").close()
+    return count
+
+
+def _make_fan_out(
+    rng: Random, directory: str, fan_out: Tuple[int, ...], files: int
+) -> Tuple[int, int]:
+    total_dirs = 0
+    total_files = _make_files(rng, directory, files)
+    if fan_out:
+        for i in range(fan_out[0]):
+            sub_directory = os.path.join(directory, f"dir{i}")
+            os.mkdir(sub_directory)
+            dirs, files_ = _make_fan_out(rng, sub_directory, fan_out[1:], files)
+            total_dirs += dirs + 1
+            total_files += files_
+    return total_dirs, total_files
+
+
+def make_flat(root: str, files: int, seed: int = 0) -> int:
+    """انشاء مجلد يحتوي على عدد الملفات المعطى فقط
+
+    المعطيات:
+        root (str): المجلد، يتم انشائه اذ لم يكن موجود
+        files (int): عدد الملفات
+        seed (int, optional): البذرة المستخدمة في اختيار الاسماء. Defaults to 0.
+
+    المخرجات:
+        int: عدد الملفات
+    """
+    os.makedirs(root, exist_ok=True)
+    return _make_files(Random(f"flat-{seed}"), root, files)
+
+
+def make_tree(
+    root: str, shape: str, scale: float = 1.0, seed: int = 0
+) -> Tuple[int, int]:
+    """انشاء شجرة بالشكل المعطى، نفس المعطيات تنشئ نفس الشجرة دائماً
+
+    المعطيات:
+        root (str): المجلد الذي سوف يتم انشاء الشجرة فيه، يتم انشائه اذ لم يكن موجود
+        shape (str): شكل الشجرة، احد SHAPES
+        scale (float, optional): نسبة حجم الشجرة من الحجم الافتراضي. Defaults to 1.0.
+        seed (int, optional): البذرة المستخدمة في اختيار الاسماء. Defaults to 0.
+
+    المخرجات:
+        Tuple[int, int]: عدد المجلدات، عدد الملفات
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape '{shape}', the shapes are {', '.join(SHAPES)}")
+    if shape == "flat":
+        return 0, make_flat(root, _scaled(FLAT_FILES, scale), seed=seed)
+    rng = Random(f"{shape}-{seed}")
+    os.makedirs(root, exist_ok=True)
+    if shape == "deep":
+        directory = root
+        total_files = _make_files(rng, directory, 2)
+        depth = _scaled(DEEP_DEPTH, scale)
+        for _ in range(depth):
+            directory = os.path.join(directory, "dir")
+            os.mkdir(directory)
+            total_files += _make_files(rng, directory, 2)
+        return depth, total_files
+    if shape == "wide":
+        fan_out = (_scaled(WIDE_FAN_OUT[0], scale), WIDE_FAN_OUT[1])
+        return _make_fan_out(rng, root, fan_out, 2)
+    fan_out = tuple(_scaled(width, scale ** (1 / 3)) for width in SAVED_FAN_OUT)
+    return _make_fan_out(rng, root, fan_out, SAVED_FILES)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("shape", choices=SHAPES)
+    parser.add_argument("root")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    dirs, files = make_tree(args.root, args.shape, scale=args.scale, seed=args.seed)
+    print(f"{args.root}: {dirs} directories, {files} files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,8 +24,62 @@
 Rename and unrename all files in the directory, alphabetically or randomly
 """
 
-from .frenamer import *
+from .api import *
+from .archive import *
+from .filters import *
+from .index import *
+from .plan import *
 from .version import *
+from .watch import *
+from .api import __all__ as _api_all
+from .archive import __all__ as _archive_all
+from .filters import __all__ as _filters_all
+from .index import __all__ as _index_all
+from .plan import __all__ as _plan_all
+from .version import __all__ as _version_all
+from .watch import __all__ as _watch_all
+
+# واجهة سطر الاوامر تستورد typer، لذلك يتم استيرادها فقط عند طلب احد اسمائها
+_CLI = (
+    "app",
+    "print_dir_path",
+    "print_old_new_name",
+    "dir_renamer",
+    "unrename_from_json",
+    "get_unrename_dir",
+    "get_name_from_json",
+    "unrename_from_store",
+    "rollback_from_journal",
+    "rename",
+    "unrename",
+    "watch",
+    "verify",
+    "archive",
+    "extract",
+    "resume",
+    "rollback",
+)
+
+__all__ = (
+    _api_all
+    + _archive_all
+    + _filters_all
+    + _index_all
+    + _plan_all
+    + _version_all
+    + _watch_all
+    + _CLI
+)
+
+
+def __getattr__(name: str):
+    if name == "frenamer" or name in _CLI:
+        from importlib import import_module
+
+        cli = import_module(".frenamer", __name__)
+        return cli if name == "frenamer" else getattr(cli, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __author__ = "Awiteb <https://github.com/TheAwiteb>"
 __copyright__ = "Copyright (c) 2021 <Awiteb@hotmail.com>"
@@ -0,0 +1,1146 @@
+import os
+import time
+import warnings
+from functools import partial
+from json import dump
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .archive import RenameArchive
+from .data import (
+    DataFormat,
+    RenameDataFile,
+    RenameDataWriter,
+    name_pair,
+    write_state,
+)
+from .filters import EntryFilter
+from .index import DirNameIndex, NameIndex, RandomNameIndex, RenameDataIndex
+from .journal import Journal
+from .snapshot import TreeSnapshot
+from .stats import Stats
+from .store import SQLiteStore
+from .version import version
+
+__all__ = (
+    "DIRECTORY",
+    "DRIFTED",
+    "FILE",
+    "FOREIGN",
+    "MISSING",
+    "Mismatch",
+    "RenameEvent",
+    "Renamer",
+    "Unrenamer",
+    "file_renamer",
+    "get_dir_content",
+    "get_dir_name",
+    "get_json_files",
+    "rename_directory",
+    "unrename_data_file",
+    "unrename_run",
+    "verify_data_file",
+)
+
+# نوع العنصر في RenameEvent
+FILE = "file"
+DIRECTORY = "directory"
+
+# نوع Mismatch
+# العنصر موجود في نفس المجلد باسم اخر
+DRIFTED = "drifted"
+# العنصر غير موجود
+MISSING = "missing"
+# يوجد عنصر اخر بنفس الاسم
+FOREIGN = "foreign"
+
+# لا يتم حفظ وقت تعديل المجلد اذ كان قبل قرائته باقل من هذه المدة، لان العناصر
+# التي تضاف في نفس اللحظة قد لا تغير الوقت في بعض انظمة الملفات
+_RACY_MTIME_NS = 2_000_000_000
+
+
+class RenameEvent(NamedTuple):
+    """عملية اعادة تسمية تمت على عنصر واحد"""
+
+    old_path: str
+    new_path: str
+    kind: str
+
+    @property
+    def parent(self) -> str:
+        """المجلد الذي يحتوي على العنصر"""
+        return os.path.dirname(self.new_path)
+
+    @property
+    def old_name(self) -> str:
+        """الاسم قبل اعادة التسمية"""
+        return os.path.basename(self.old_path)
+
+    @property
+    def new_name(self) -> str:
+        """الاسم بعد اعادة التسمية"""
+        return os.path.basename(self.new_path)
+
+    @property
+    def is_dir(self) -> bool:
+        """هل العنصر مجلد"""
+        return self.kind == DIRECTORY
+
+
+class Mismatch(NamedTuple):
+    """عنصر في ملف البيانات لا يطابق محتوى المجلد"""
+
+    kind: str
+    # المسار الجديد المحفوظ في ملف البيانات
+    path: str
+    # المسار الحالي للعنصر مع DRIFTED، والا None
+    actual: Optional[str] = None
+
+
+def _warn(text: str, level: str) -> None:
+    warnings.warn(text, RuntimeWarning, stacklevel=3)
+
+
+def _timed(stats: Optional[Stats], phase: str, func: Callable, *args, **kwargs) -> Any:
+    """استدعاء الدالة واضافة مدتها الى المرحلة اذ تم اعطاء stats"""
+    if stats is None:
+        return func(*args, **kwargs)
+    start = stats.clock()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        stats.lap(phase, start)
+
+
+def get_dir_content(
+    path: str, snapshot: Optional[TreeSnapshot] = None
+) -> Tuple[str, List[Optional[str]], List[Optional[str]]]:
+    """ارجاع محتوى المجلد
+
+    المعطيات:
+        path (str): المجلد المراد جلب محتوياته
+        snapshot (Optional[TreeSnapshot], optional): صورة المجلدات التي سوف يتم جلب المحتوى منها بدلاً من قراءة المجلد. Defaults to None.
+
+    المخرجات:
+        Tuple[str, List[Optional[str]], List[Optional[str]]]: مسار المجلد، المجلدات التي يحتويها، الملفات التي يحتويها
+    """
+    if snapshot is not None:
+        return snapshot.content(path)
+    for root, dirs, files in os.walk(path, topdown=True):
+        return (root, dirs, files)
+
+
+def get_dir_name(
+    start_with: str,
+    root: str,
+    random: Optional[bool] = False,
+    length: Optional[int] = 10,
+    snapshot: Optional[TreeSnapshot] = None,
+) -> str:
+    """ارجاع اسم مجلد الجديد (يمكن استخدامه في المسار)
+
+    عند اعادة تسمية اكثر من مجلد في نفس المجلد استخدم DirNameIndex بدلاً منها،
+    لانها تقرأ المجلد مع كل استدعاء.
+
+    المعطيات:
+        start_with (str): بداية اسم للمجلد المراد جلبه، مثل 'Z' للاسماء 'Z-a' و 'Z-b'
+        root (str): المسار الذي سوف يتم وضع المجلد فيه
+        random (Optional[bool], optional): تحديد ما إذا كنت تريد الاسم عشوائي ام لا. Defaults to False.
+        length (Optional[int], optional): طول الاسم العشوائي اذ كنت تريد، يتم زيادته اذ كان قصير بالنسبة لعدد المجلدات. Defaults to 10.
+        snapshot (Optional[TreeSnapshot], optional): صورة المجلدات المستخدمة بدلاً من قراءة المجلد. Defaults to None.
+
+    المخرجات:
+        str: اسم مجلد يمكن وضعه في المسار المعطى
+    """
+    _, dirs, _ = get_dir_content(root, snapshot)
+    if random:
+        return RandomNameIndex(dirs, length=length).allocate()
+    # اول اسم ابجدي متاح 'a' ... 'Z' ثم 'aa' ... 'ZZ' ثم 'aaa' ...
+    return DirNameIndex(dirs, prefix=start_with).allocate()
+
+
+def _top_index(random: bool, length: int) -> Union[DirNameIndex, RandomNameIndex]:
+    """فهرس فارغ لاعادة تسمية المجلد نفسه بدون قراءة المجلد الذي يحتويه
+
+    المجلد الاب قد يكون كبيراً، والاسماء الموجودة يتم تخطيها عند اعادة
+    التسمية لذلك ينتج نفس الاسم الذي كانت ترجعه get_dir_name.
+    """
+    return RandomNameIndex(length=length) if random else DirNameIndex()
+
+
+def _rename_free(
+    directory: str,
+    name: str,
+    index: Union[NameIndex, RandomNameIndex, DirNameIndex],
+    snapshot: TreeSnapshot,
+    suffix: Optional[str] = "",
+    is_dir: Optional[bool] = False,
+    journal: Optional[Journal] = None,
+    stats: Optional[Stats] = None,
+) -> str:
+    """اعادة تسمية العنصر الى اول اسم من الفهرس غير موجود في المجلد
+
+    اعادة التسمية لا تستبدل العنصر الموجود بنفس الاسم (rename_noreplace)،
+    لذلك اذ كان الاسم موجوداً ولم يكن في الفهرس، مثل عنصر تمت اضافته بعد
+    قراءة المجلد، يتم تسجيل ذلك في السجل وتجربة الاسم التالي. الاسم الموجود
+    يبقى محجوزاً في الفهرس.
+
+    المعطيات:
+        directory (str): المجلد الذي يحتوي على العنصر
+        name (str): اسم العنصر
+        index (Union[NameIndex, RandomNameIndex, DirNameIndex]): فهرس الاسماء الخاص بالمجلد
+        snapshot (TreeSnapshot): صورة المجلدات التي يتم تحديثها
+        suffix (Optional[str], optional): الامتداد الذي يضاف الى الاسم. Defaults to "".
+        is_dir (Optional[bool], optional): هل العنصر مجلد. Defaults to False.
+        journal (Optional[Journal], optional): يتم تسجيل اعادة التسمية فيه قبل تنفيذها. Defaults to None.
+        stats (Optional[Stats], optional): يتم اضافة مدة اختيار الاسم واعادة التسمية اليه. Defaults to None.
+
+    المخرجات:
+        str: الاسم الجديد
+    """
+    while True:
+        new_name = f"{_timed(stats, 'naming', index.allocate)}{suffix}"
+        if journal is not None:
+            _timed(stats, "journal", journal.rename, directory, name, new_name, is_dir)
+        try:
+            _timed(
+                stats, "rename", snapshot.rename_entry, directory, name, new_name, True
+            )
+        except FileExistsError:
+            if journal is not None:
+                _timed(stats, "journal", journal.failed, directory, name, new_name)
+            if stats is not None:
+                stats.count("collisions")
+            continue
+        if stats is not None:
+            stats.count("renames")
+        index.release(name)
+        return new_name
+
+
+def file_renamer(
+    file: Path,
+    index: Union[NameIndex, RandomNameIndex, None] = None,
+    snapshot: Optional[TreeSnapshot] = None,
+    journal: Optional[Journal] = None,
+    stats: Optional[Stats] = None,
+    random: Optional[bool] = False,
+    length: Optional[int] = 10,
+) -> dict:
+    """اعادة تسمية الملف المعطى
+
+    المعطيات:
+        file (Path): الملف المراد اعادة تسميته
+        index (Union[NameIndex, RandomNameIndex, None], optional): فهرس الاسماء الخاص بمجلد الملف، يتم بناءه اذ لم يعطى. Defaults to None.
+        snapshot (Optional[TreeSnapshot], optional): صورة المجلدات التي سوف يتم تحديثها بعد اعادة التسمية. Defaults to None.
+        journal (Optional[Journal], optional): يتم تسجيل اعادة التسمية فيه قبل تنفيذها. Defaults to None.
+        stats (Optional[Stats], optional): يتم اضافة مدة اختيار الاسم واعادة التسمية اليه. Defaults to None.
+        random (Optional[bool], optional): اعادة التسمية باسم عشوائي بدلاً من اسم المجلد ورقم، اذ لم يعطى الفهرس. Defaults to False.
+        length (Optional[int], optional): طول الاسم العشوائي. Defaults to 10.
+
+    المخرجات:
+        dict: الاسم القديم والجديد الخاص بالملف
+    """
+    directory = file.parent
+    if snapshot is None:
+        snapshot = TreeSnapshot()
+    if index is None:
+        # يجب قراءة المجلد، لان تخطي الاسماء الموجودة عند اعادة التسمية لا يمنع
+        # تكرار الرقم بامتداد اخر (dir-1.txt بجانب dir-1.png)
+        _, dirs, files = get_dir_content(directory.as_posix(), snapshot)
+        index = (
+            RandomNameIndex(dirs + files, length=length)
+            if random
+            else NameIndex(directory.name, files)
+        )
+    new_file_name = _rename_free(
+        directory.as_posix(),
+        file.name,
+        index,
+        snapshot,
+        suffix="".join(file.suffixes),
+        journal=journal,
+        stats=stats,
+    )
+    return {"old": file.name, "new": new_file_name}
+
+
+def rename_directory(
+    directory: Union[str, Path],
+    random: Optional[bool] = False,
+    length: Optional[int] = 10,
+    save_data: Optional[bool] = False,
+    data_filename: Optional[str] = "rename_data.json",
+    data_format: Optional[DataFormat] = None,
+    snapshot: Optional[TreeSnapshot] = None,
+    store: Optional[SQLiteStore] = None,
+    run: Optional[int] = None,
+    journal: Optional[Journal] = None,
+    resumed: Optional[Dict[str, List[dict]]] = None,
+    stats: Optional[Stats] = None,
+    incremental: Optional[bool] = False,
+    descend: Optional[List[str]] = None,
+    entry_filter: Optional[EntryFilter] = None,
+    depth: Optional[int] = 0,
+    states: Optional[Dict[str, dict]] = None,
+) -> Iterator[RenameEvent]:
+    """اعادة تسمية محتوى مجلد واحد بدون محتوى مجلداته الفرعية
+
+    يتم اعادة تسمية العناصر اثناء المرور على النتائج، الملفات اولاً ثم
+    المجلدات، ويتم حفظ الاسماء في ملف البيانات او قاعدة البيانات وتسجيلها في
+    السجل. يجب المرور على جميع النتائج لكي يتم الانتهاء من المجلد.
+
+    مع incremental يتم اعادة تسمية العناصر الجديدة فقط، وهي العناصر غير
+    الموجودة في ملف البيانات (بصيغة JSON Lines)، ويتم اضافة اسمائها الى نهايته
+    مع حالة المجلد: وقت تعديله، والرقم التالي للملفات والمجلدات، ومجلداته
+    الفرعية. اذ لم يتغير وقت تعديل المجلد منذ اخر مرة لا يتم قراءته ابداً.
+    المجلد الذي ليس له ملف بيانات (لم تتم اعادة تسمية اي عنصر فيه) يتم حفظ
+    حالته في ملف بيانات اقرب مجلد اعلى منه، ويتم قرائتها من states.
+
+    المعطيات:
+        directory (Union[str, Path]): المجلد المراد اعادة تسمية محتوياته
+        random (Optional[bool], optional): اعادة التسمية باسماء عشوائية. Defaults to False.
+        length (Optional[int], optional): طول الاسم العشوائي. Defaults to 10.
+        save_data (Optional[bool], optional): حفظ الاسماء القديمة في ملف داخل المجلد. Defaults to False.
+        data_filename (Optional[str], optional): اسم ملف البيانات. Defaults to "rename_data.json".
+        data_format (Optional[DataFormat], optional): صيغة ملف البيانات، يتم استخدام json اذ لم تعطى. Defaults to None.
+        snapshot (Optional[TreeSnapshot], optional): صورة المجلدات التي يتم جلب المحتوى منها وتحديثها. Defaults to None.
+        store (Optional[SQLiteStore], optional): يتم حفظ الاسماء فيه ان وجد. Defaults to None.
+        run (Optional[int], optional): رقم العملية في قاعدة البيانات. Defaults to None.
+        journal (Optional[Journal], optional): يتم تسجيل كل اعادة تسمية فيه قبل تنفيذها. Defaults to None.
+        resumed (Optional[Dict[str, List[dict]]], optional): عمليات السجل الخاصة بالمجلدات التي توقفت قبل الانتهاء منها. Defaults to None.
+        stats (Optional[Stats], optional): يتم قياس مدة كل مرحلة وعدد العمليات فيه. Defaults to None.
+        incremental (Optional[bool], optional): اعادة تسمية العناصر التي لم يتم حفظها في ملف البيانات فقط. Defaults to False.
+        descend (Optional[List[str]], optional): يتم اضافة المجلدات الفرعية التي يجب اكمال العمل عليها اليها. Defaults to None.
+        entry_filter (Optional[EntryFilter], optional): يتم اعادة تسمية العناصر التي يقبلها فقط، والمرور على المجلدات التي لا يستبعدها. Defaults to None.
+        depth (Optional[int], optional): عمق المجلد بالنسبة للمجلد الاساسي، يستخدم مع entry_filter. Defaults to 0.
+        states (Optional[Dict[str, dict]], optional): حالات المجلدات التي ليس لها ملف بيانات (المسار -> الحالة) مع incremental، يتم اضافة حالات المجلدات الفرعية اليها من ملف البيانات، وتحذف حالة المجلد منها عند استخدامها. Defaults to None.
+
+    المخرجات:
+        Iterator[RenameEvent]: العمليات بنفس ترتيب تنفيذها، بما فيها العمليات التي تمت قبل التوقف عند الاكمال
+    """
+    directory = Path(directory)
+    directory_path = directory.as_posix()
+    if snapshot is None:
+        snapshot = TreeSnapshot()
+    if data_format is None:
+        data_format = DataFormat.json
+    directory_start = stats.clock() if stats is not None else 0.0
+    data_path = os.path.join(directory_path, data_filename)
+    rename_data = state = None
+    # وقت تعديل المجلد قبل اعادة التسمية، والوقت الذي تمت قرائته فيه
+    mtime = listed_at = 0
+    if incremental:
+        save_data = True
+        data_format = DataFormat.jsonl
+        if os.path.isfile(data_path):
+            rename_data = _timed(stats, "data", RenameDataFile, data_path)
+            if not rename_data.valid:
+                raise ValueError(f"Invalid frenamer format: {data_path}")
+            state, children = _timed(stats, "data", rename_data.states)
+            if states is not None:
+                for child, child_state in children.items():
+                    states[Path(directory_path, child).as_posix()] = child_state
+        elif states is not None:
+            state = states.pop(directory_path, None)
+        if stats is not None:
+            stats.count("stats")
+        listed_at = time.time_ns()
+        mtime = os.stat(directory_path).st_mtime_ns
+        if state is not None and state["mtime"] is not None:
+            if mtime == state["mtime"]:
+                # لم تتم اضافة او حذف اي عنصر منذ اخر مرة
+                if descend is not None and (
+                    entry_filter is None or entry_filter.descends(depth + 1)
+                ):
+                    descend.extend(
+                        os.path.join(directory_path, name) for name in state["subdirs"]
+                    )
+                if stats is not None:
+                    stats.directory(directory_path, stats.clock() - directory_start, 0)
+                return
+    _, dirs, files = _timed(stats, "listing", get_dir_content, directory_path, snapshot)
+    # فهرس واحد لكل مجلد بدلاً من جلب محتواه مع كل ملف او مجلد
+    if random:
+        # الملفات والمجلدات تشترك في نفس الاسماء العشوائية
+        index = dir_index = _timed(
+            stats, "naming", RandomNameIndex, dirs + files, length=length
+        )
+    else:
+        index = _timed(stats, "naming", NameIndex, directory.name, files)
+        dir_index = _timed(stats, "naming", DirNameIndex, dirs)
+        if state is not None and state["next"] is not None:
+            # يتم البدء من الرقم التالي بدلاً من البحث عن اول اسم متاح
+            index.cursor = max(index.cursor, state["next"])
+            dir_index.cursor = max(dir_index.cursor, state["dirs"])
+    # العناصر التي تمت اعادة تسميتها قبل توقف العملية السابقة
+    prior = resumed.pop(directory_path, None) if resumed is not None else None
+    # المجلدات الفرعية التي تمت اعادة تسميتها في مرة سابقة
+    handled_dirs: List[str] = []
+    if prior is not None or incremental:
+        skip = {record["n"] for record in prior or ()}
+        skip.update((data_filename, data_filename + ".part"))
+        if rename_data is not None:
+            skip.update(
+                new_name
+                for _, new_name in map(
+                    name_pair, _timed(stats, "data", list, rename_data.names())
+                )
+            )
+            handled_dirs = [
+                sub_directory for sub_directory in dirs if sub_directory in skip
+            ]
+        files = [file for file in files if file not in skip]
+        dirs = [sub_directory for sub_directory in dirs if sub_directory not in skip]
+    if entry_filter is not None:
+        files = [file for file in files if entry_filter.accepts(file, False, depth + 1)]
+        accepted = {
+            sub_directory
+            for sub_directory in dirs
+            if entry_filter.accepts(sub_directory, True, depth + 1)
+        }
+        # المجلدات التي يتم المرور عليها بدون اعادة تسميتها
+        kept_dirs = [
+            sub_directory
+            for sub_directory in dirs
+            if sub_directory not in accepted
+            and not entry_filter.prunes(sub_directory, depth + 1)
+        ]
+        dirs = [sub_directory for sub_directory in dirs if sub_directory in accepted]
+        handled_dirs.extend(kept_dirs)
+        if journal is not None:
+            for sub_directory in kept_dirs:
+                _timed(
+                    stats,
+                    "journal",
+                    journal.walk,
+                    os.path.join(directory_path, sub_directory),
+                )
+    # المجلدات الفرعية التي يتم المرور عليها بعد هذا المجلد
+    descends = entry_filter is None or entry_filter.descends(depth + 1)
+    if descend is not None and descends:
+        descend.extend(os.path.join(directory_path, name) for name in handled_dirs)
+    if not save_data or data_format is not DataFormat.jsonl:
+        writer = None
+    elif rename_data is not None and rename_data.format is DataFormat.jsonl:
+        writer = RenameDataWriter(data_path, append=True)
+    else:
+        writer = RenameDataWriter(data_path)
+        if rename_data is not None:
+            # تحويل ملف البيانات بالصيغة القديمة الى JSON Lines
+            for name in rename_data.names():
+                writer.write(name)
+    # الصيغة القديمة تحتاج جميع الاسماء قبل كتابة الملف
+    names: List[dict] = []
+    count = 0
+    # يتم حفظ الجهاز ورقم inode مع كل اسم من قراءة المجلد، لكي يمكن التعرف على
+    # العنصر اذ تم نقله او تغيير اسمه بعد ذلك
+    save_inodes = save_data and snapshot.inodes(directory_path) is not None
+    dev = None
+
+    def renamed(name: dict, kind: str) -> RenameEvent:
+        nonlocal count, dev
+        old_name, new_name = name_pair(name)
+        if save_inodes:
+            inode = snapshot.inode(os.path.join(directory_path, new_name))
+            if inode is not None:
+                if dev is None:
+                    if stats is not None:
+                        stats.count("stats")
+                    dev = os.stat(directory_path).st_dev
+                name["dev"] = dev
+                name["ino"] = inode
+        if writer is not None:
+            _timed(stats, "data", writer.write, name)
+        elif save_data:
+            names.append(name)
+        if store is not None:
+            # بنفس ترتيب اعادة التسمية لكي يتم التراجع بعكسه
+            _timed(stats, "store", store.add, run, directory_path, [name], start=count)
+        count += 1
+        return RenameEvent(
+            os.path.join(directory_path, old_name),
+            os.path.join(directory_path, new_name),
+            kind,
+        )
+
+    try:
+        for record in prior or ():
+            # المجلدات الفرعية الخاصة بها يتم اكمالها بشكل مستقل
+            if record["d"]:
+                yield renamed(
+                    {"old_name": record["o"], "new_name": record["n"]}, DIRECTORY
+                )
+            else:
+                yield renamed({"old": record["o"], "new": record["n"]}, FILE)
+
+        for file in files:
+            file = Path(os.path.join(directory_path, file))
+            yield renamed(
+                file_renamer(
+                    file,
+                    index=index,
+                    snapshot=snapshot,
+                    journal=journal,
+                    stats=stats,
+                ),
+                FILE,
+            )
+
+        for sub_directory in dirs:
+            sub_directory = Path(os.path.join(directory_path, sub_directory))
+            new_dir_name = _rename_free(
+                directory_path,
+                sub_directory.name,
+                dir_index,
+                snapshot,
+                is_dir=True,
+                journal=journal,
+                stats=stats,
+            )
+            new_sub_directory = sub_directory.with_name(new_dir_name)
+            handled_dirs.append(new_sub_directory.name)
+            if descend is not None and descends:
+                descend.append(new_sub_directory.as_posix())
+            yield renamed(
+                {"old_name": sub_directory.name, "new_name": new_sub_directory.name},
+                DIRECTORY,
+            )
+    finally:
+        if writer is not None:
+            _timed(stats, "data", writer.close)
+            if writer.count:
+                snapshot.add(data_path)
+            if stats is not None:
+                stats.count("data_bytes", writer.size)
+
+    if names:
+        with open(data_path, mode="w", encoding="utf-8") as f:
+            obj = {
+                "frenamerVersion": version,
+                "names": names,
+            }
+            _timed(stats, "data", dump, obj, f, indent=4)
+            if stats is not None:
+                stats.count("data_bytes", f.tell())
+        snapshot.add(data_path)
+    if incremental:
+        _timed(
+            stats,
+            "data",
+            _save_state,
+            directory_path,
+            data_path,
+            {
+                "next": None if random else index.cursor,
+                "dirs": None if random else dir_index.cursor,
+                "subdirs": handled_dirs,
+            },
+            state,
+            mtime,
+            listed_at,
+            depth,
+        )
+    if journal is not None:
+        _timed(stats, "journal", journal.done, directory_path)
+    if stats is not None:
+        stats.directory(directory_path, stats.clock() - directory_start, count)
+
+
+def _save_state(
+    directory_path: str,
+    data_path: str,
+    state: dict,
+    old_state: Optional[dict],
+    mtime: int,
+    listed_at: int,
+    depth: int,
+) -> None:
+    """حفظ حالة المجلد بعد الانتهاء من جميع التغييرات عليه
+
+    يتم حفظ وقت التعديل بعد اعادة التسمية، الا اذ كان وقت التعديل قبلها قريب
+    من وقت قراءة المجلد. المجلد الذي ليس له ملف بيانات يتم حفظ حالته في ملف
+    بيانات اقرب مجلد اعلى منه داخل المجلد الاساسي (حتى depth مستوى).
+    """
+    if listed_at - mtime < _RACY_MTIME_NS:
+        # يتم قراءة المجلد في المرة القادمة
+        state = {"mtime": None, **state}
+    else:
+        state = {"mtime": os.stat(directory_path).st_mtime_ns, **state}
+    if state == old_state:
+        return
+    if os.path.isfile(data_path):
+        write_state(data_path, state)
+        return
+    data_filename = os.path.basename(data_path)
+    parent = directory_path
+    for _ in range(depth):
+        parent = os.path.dirname(parent)
+        parent_data_path = os.path.join(parent, data_filename)
+        if os.path.isfile(parent_data_path):
+            child = Path(os.path.relpath(directory_path, parent)).as_posix()
+            write_state(parent_data_path, state, child)
+            return
+
+
+def get_json_files(
+    directory: Path,
+    json_filename: str,
+    snapshot: Optional[TreeSnapshot] = None,
+    entry_filter: Optional[EntryFilter] = None,
+) -> List[Optional[str]]:
+    """ارجاع جميع ملفات المطابقة لاسم ملف الجيسون في محتوى المجلد
+
+    المعطيات:
+        directory (Path): المجلد المراد استخراج منه جميع الملفات المتطايقة مع اسم ملفات الجيسون
+        json_filename (str): اسم ملف الجيسون
+        snapshot (Optional[TreeSnapshot], optional): صورة المجلدات التي سوف يتم حفظ المجلدات فيها اثناء المرور عليها. Defaults to None.
+        entry_filter (Optional[EntryFilter], optional): لا يتم المرور على المجلدات التي يستبعدها. Defaults to None.
+
+    المخرجات:
+        List[Optional[str]]: ملفات الجيسون الموجودة في المجلد
+    """
+    if entry_filter is not None:
+        if snapshot is None:
+            snapshot = TreeSnapshot()
+        walk = partial(snapshot.walk, prune=entry_filter.prunes)
+    else:
+        walk = os.walk if snapshot is None else snapshot.walk
+    return [
+        os.path.join(root, json_filename)
+        for root, _, files in walk(directory.as_posix(), topdown=False)
+        if json_filename in files
+    ]
+
+
+def unrename_data_file(
+    json_file: Path,
+    delete: bool,
+    snapshot: Optional[TreeSnapshot] = None,
+    index: Optional[Union[RenameDataIndex, RenameArchive]] = None,
+    journal: Optional[Journal] = None,
+    skip_done: Optional[bool] = False,
+    stats: Optional[Stats] = None,
+    on_message: Optional[Callable[[str, str], None]] = None,
+) -> Iterator[RenameEvent]:
+    """التراجع عن اعادة تسمية الملفات الموجودة في ملف البيانات
+
+    المعطيات:
+        json_file (Path): ملف البيانات
+        delete (bool): حذف ملف البيانات بعد التراجع ام لا
+        snapshot (Optional[TreeSnapshot], optional): صورة المجلدات التي يتم تحديثها. Defaults to None.
+        index (Optional[Union[RenameDataIndex, RenameArchive]], optional): فهرس ملفات البيانات او الارشيف، يتم جلب البيانات منه بدلاً من قراءة الملف. Defaults to None.
+        journal (Optional[Journal], optional): يتم تسجيل كل اعادة تسمية فيه قبل تنفيذها. Defaults to None.
+        skip_done (Optional[bool], optional): تجاهل العناصر التي تم التراجع عنها مسبقاً، عند اكمال عملية متوقفة. Defaults to False.
+        stats (Optional[Stats], optional): يتم قياس مدة كل مرحلة وعدد العمليات فيه. Defaults to None.
+        on_message (Optional[Callable[[str, str], None]], optional): يتم استدعائها بالتحذيرات والاخطاء ('warning' او 'error')، والا يتم استخدام warnings. Defaults to None.
+
+    المخرجات:
+        Iterator[RenameEvent]: العمليات بنفس ترتيب تنفيذها
+    """
+    if on_message is None:
+        on_message = _warn
+    entries = 0
+    path = json_file.parent
+    directory_start = stats.clock() if stats is not None else 0.0
+    rename_data = _timed(
+        stats,
+        "data",
+        index.get if index is not None else RenameDataFile,
+        json_file,
+    )
+    if rename_data.valid:
+        if rename_data.version != version:
+            on_message(
+                f"Warning The current frenamer version ({version}) does not match the frenamer version ({rename_data.version}) in which the files were renamed: {json_file.as_posix()}",
+                "warning",
+            )
+        # ارقام inode الخاصة بعناصر المجلد من قراءته، ان تم حفظها في الصورة
+        inodes = snapshot.inodes(path) if snapshot is not None else None
+        dev = None
+        # رقم inode -> الاسم الحالي، يتم انشائه عند اول عنصر تم نقله فقط
+        by_inode: Optional[Dict[int, str]] = None
+        # بعكس ترتيب اعادة التسمية لكي لا يتم استبدال عنصر اخذ اسمه القديم
+        for names in rename_data.unrename_order():
+            old_name, new_name = [
+                Path(os.path.join(path.as_posix(), name)) for name in name_pair(names)
+            ]
+            # نوع العنصر محفوظ في ملف البيانات، لذلك لا يتم قرائته بعد التراجع
+            is_dir = "old_name" in names
+            inode = names.get("ino") if inodes is not None else None
+            if inode is not None and dev is None:
+                if stats is not None:
+                    stats.count("stats")
+                dev = os.stat(path).st_dev
+            if inode is not None and names.get("dev") == dev:
+                if inodes.get(new_name.name) != inode:
+                    # تم نقل العنصر او استبداله بعد اعادة تسميته، لذلك يتم البحث
+                    # عنه برقم inode في نفس المجلد
+                    if by_inode is None:
+                        by_inode = {value: name for name, value in inodes.items()}
+                    current = by_inode.get(inode)
+                    if current is None:
+                        on_message(f"Missing: {new_name.as_posix()}", "warning")
+                        continue
+                    if current == old_name.name:
+                        # تم التراجع عنه مسبقاً
+                        continue
+                    on_message(
+                        f"Recovered by inode: {new_name.as_posix()} is now {current}",
+                        "warning",
+                    )
+                    new_name = new_name.with_name(current)
+            elif skip_done:
+                if stats is not None:
+                    stats.count("stats")
+                if not os.path.lexists(new_name):
+                    continue
+            if journal is not None:
+                _timed(
+                    stats,
+                    "journal",
+                    journal.rename,
+                    path.as_posix(),
+                    new_name.name,
+                    old_name.name,
+                    is_dir,
+                )
+            if snapshot is not None:
+                _timed(
+                    stats,
+                    "rename",
+                    snapshot.rename_entry,
+                    path,
+                    new_name.name,
+                    old_name.name,
+                )
+            else:
+                _timed(stats, "rename", new_name.rename, old_name)
+            if by_inode is not None and inodes.get(old_name.name) is not None:
+                by_inode[inodes[old_name.name]] = old_name.name
+            if stats is not None:
+                stats.count("renames")
+            entries += 1
+            yield RenameEvent(
+                new_name.as_posix(), old_name.as_posix(), DIRECTORY if is_dir else FILE
+            )
+    else:
+        on_message(f"Invalid frenamer format: {json_file.as_posix()}", "error")
+    if index is not None:
+        index.discard(json_file)
+    if delete:
+        if journal is not None:
+            journal.delete(json_file.as_posix())
+        if snapshot is not None:
+            snapshot.remove_entry(path, json_file.name)
+        else:
+            os.remove(json_file.as_posix())
+    if stats is not None:
+        stats.directory(path.as_posix(), stats.clock() - directory_start, entries)
+
+
+def verify_data_file(
+    json_file: Path,
+    snapshot: Optional[TreeSnapshot] = None,
+    on_message: Optional[Callable[[str, str], None]] = None,
+) -> Iterator[Mismatch]:
+    """مقارنة ملف البيانات بمحتوى المجلد الذي يحتويه
+
+    يتم قراءة المجلد مرة واحدة، ثم يتم البحث عن كل عنصر برقم inode المحفوظ
+    معه في قاموس (رقم inode -> الاسم الحالي)، لذلك لا يتم استدعاء stat لكل
+    عنصر. العناصر المحفوظة بدون رقم inode، او التي تم نسخها الى جهاز اخر،
+    تتم مقارنتها بالاسم فقط.
+
+    المعطيات:
+        json_file (Path): ملف البيانات
+        snapshot (Optional[TreeSnapshot], optional): صورة المجلدات التي تحفظ ارقام inode. Defaults to None.
+        on_message (Optional[Callable[[str, str], None]], optional): يتم استدعائها بالتحذيرات والاخطاء، والا يتم استخدام warnings. Defaults to None.
+
+    المخرجات:
+        Iterator[Mismatch]: العناصر التي لا تطابق المجلد
+    """
+    if on_message is None:
+        on_message = _warn
+    if snapshot is None:
+        snapshot = TreeSnapshot(inodes=True)
+    rename_data = RenameDataFile(json_file)
+    if not rename_data.valid:
+        on_message(f"Invalid frenamer format: {json_file.as_posix()}", "error")
+        return
+    path = json_file.parent.as_posix()
+    entries = snapshot.entries(path)
+    inodes = snapshot.inodes(path)
+    dev = None
+    by_inode: Optional[Dict[int, str]] = None
+    for names in rename_data.names():
+        _, new_name = name_pair(names)
+        inode = names.get("ino") if inodes is not None else None
+        if inode is not None and dev is None:
+            dev = os.stat(path).st_dev
+        if inode is None or names.get("dev") != dev:
+            if new_name not in entries:
+                yield Mismatch(MISSING, os.path.join(path, new_name))
+            continue
+        if inodes.get(new_name) == inode:
+            continue
+        if by_inode is None:
+            by_inode = {value: name for name, value in inodes.items()}
+        current = by_inode.get(inode)
+        if current is not None:
+            yield Mismatch(
+                DRIFTED, os.path.join(path, new_name), os.path.join(path, current)
+            )
+        elif new_name in entries:
+            yield Mismatch(FOREIGN, os.path.join(path, new_name))
+        else:
+            yield Mismatch(MISSING, os.path.join(path, new_name))
+
+
+def unrename_run(
+    store: SQLiteStore,
+    run: int,
+    delete: bool,
+    journal: Optional[Journal] = None,
+    skip_done: Optional[bool] = False,
+    stats: Optional[Stats] = None,
+) -> Iterator[RenameEvent]:
+    """التراجع عن عملية واحدة في قاعدة البيانات، الاعمق اولاً
+
+    المعطيات:
+        store (SQLiteStore): قاعدة البيانات
+        run (int): رقم العملية
+        delete (bool): حذف الاسماء من قاعدة البيانات بعد التراجع ام لا
+        journal (Optional[Journal], optional): يتم تسجيل كل اعادة تسمية فيه قبل تنفيذها. Defaults to None.
+        skip_done (Optional[bool], optional): تجاهل العناصر التي تم التراجع عنها مسبقاً، عند اكمال عملية متوقفة. Defaults to False.
+        stats (Optional[Stats], optional): يتم قياس مدة كل مرحلة وعدد العمليات فيه. Defaults to None.
+
+    المخرجات:
+        Iterator[RenameEvent]: العمليات بنفس ترتيب تنفيذها
+    """
+    current_parent = None
+    parent_start = 0.0
+    parent_entries = 0
+    for parent, new_name, old_name, is_dir in store.names(run):
+        if parent != current_parent:
+            if current_parent is not None and stats is not None:
+                stats.directory(
+                    current_parent, stats.clock() - parent_start, parent_entries
+                )
+            current_parent = parent
+            parent_start = stats.clock() if stats is not None else 0.0
+            parent_entries = 0
+        new_path = os.path.join(parent, new_name)
+        old_path = os.path.join(parent, old_name)
+        # المجلدات الاعمق يتم التراجع عنها اولاً، لذلك عند الاكمال مسارات
+        # العناصر التي تم التراجع عنها قد تكون تغيرت
+        if skip_done:
+            if stats is not None:
+                stats.count("stats")
+            if not os.path.lexists(new_path):
+                continue
+        if journal is not None:
+            _timed(stats, "journal", journal.rename, parent, new_name, old_name, is_dir)
+        _timed(stats, "rename", os.rename, new_path, old_path)
+        if stats is not None:
+            stats.count("renames")
+        parent_entries += 1
+        yield RenameEvent(new_path, old_path, DIRECTORY if is_dir else FILE)
+    if current_parent is not None and stats is not None:
+        stats.directory(current_parent, stats.clock() - parent_start, parent_entries)
+    if journal is not None:
+        journal.finished(run, delete)
+    store.finish_run(run, delete=delete)
+
+
+class Renamer:
+    """اعادة تسمية محتوى المجلدات وارجاع العمليات اثناء تنفيذها
+
+    لا يتم طباعة اي شيء، ويتم اعادة التسمية فقط عند المرور على النتائج، لذلك
+    يمكن تصفيتها او جمعها على دفعات او التوقف في المنتصف.
+
+    مثال:
+        for event in Renamer(random=True).rename("photos"):
+            print(event.old_path, event.new_path, event.kind)
+    """
+
+    __slots__ = (
+        "random",
+        "length",
+        "save_data",
+        "data_filename",
+        "data_format",
+        "store",
+        "journal",
+        "stats",
+        "incremental",
+        "entry_filter",
+    )
+
+    def __init__(
+        self,
+        random: Optional[bool] = False,
+        length: Optional[int] = 10,
+        save_data: Optional[bool] = False,
+        data_filename: Optional[str] = "rename_data.json",
+        data_format: Optional[DataFormat] = None,
+        store: Optional[SQLiteStore] = None,
+        journal: Optional[Journal] = None,
+        stats: Optional[Stats] = None,
+        incremental: Optional[bool] = False,
+        entry_filter: Optional[EntryFilter] = None,
+    ) -> None:
+        """
+        المعطيات:
+            random (Optional[bool], optional): اعادة التسمية باسماء عشوائية، او ابجدية. Defaults to False.
+            length (Optional[int], optional): طول الاسم العشوائي. Defaults to 10.
+            save_data (Optional[bool], optional): حفظ الاسماء القديمة في ملف داخل كل مجلد. Defaults to False.
+            data_filename (Optional[str], optional): اسم ملف البيانات. Defaults to "rename_data.json".
+            data_format (Optional[DataFormat], optional): صيغة ملف البيانات. Defaults to None.
+            store (Optional[SQLiteStore], optional): قاعدة بيانات يتم حفظ الاسماء فيها بدلاً من ملفات البيانات. Defaults to None.
+            journal (Optional[Journal], optional): سجل العمليات. Defaults to None.
+            stats (Optional[Stats], optional): يتم قياس مدة كل مرحلة وعدد العمليات فيه. Defaults to None.
+            incremental (Optional[bool], optional): اعادة تسمية العناصر الجديدة منذ اخر مرة فقط، باستخدام ملفات البيانات. Defaults to False.
+            entry_filter (Optional[EntryFilter], optional): تحديد العناصر التي يتم اعادة تسميتها والمجلدات التي يتم المرور عليها. Defaults to None.
+        """
+        if incremental and store is not None:
+            raise ValueError("incremental renaming uses the data files, not a store")
+        self.random = random
+        self.length = length
+        self.save_data = save_data
+        self.data_filename = data_filename
+        self.data_format = data_format
+        self.store = store
+        self.journal = journal
+        self.stats = stats
+        self.incremental = incremental
+        self.entry_filter = entry_filter
+
+    def rename(
+        self, directory: Union[str, Path], is_root: Optional[bool] = True
+    ) -> Iterator[RenameEvent]:
+        """اعادة تسمية محتوى المجلد ومجلداته الفرعية
+
+        يتم اعادة تسمية المجلد ثم مجلداته الفرعية بالترتيب، مثل rename في
+        سطر الاوامر.
+
+        المعطيات:
+            directory (Union[str, Path]): المجلد
+            is_root (Optional[bool], optional): اعادة تسمية المحتوى فقط، والا يتم اعادة تسمية المجلد نفسه ايضاً. Defaults to True.
+
+        المخرجات:
+            Iterator[RenameEvent]: العمليات بنفس ترتيب تنفيذها
+        """
+        # الواصفات تبقى مفتوحة حتى انتهاء العمليات او ايقافها
+        snapshot = TreeSnapshot(
+            dir_fds=True, inodes=self.save_data and self.store is None
+        )
+        try:
+            yield from self._rename(Path(os.path.abspath(directory)), is_root, snapshot)
+        finally:
+            snapshot.close()
+
+    def _rename(
+        self, directory: Path, is_root: bool, snapshot: TreeSnapshot
+    ) -> Iterator[RenameEvent]:
+        if not is_root:
+            new_dir_name = _rename_free(
+                directory.parent.as_posix(),
+                directory.name,
+                _top_index(self.random, self.length),
+                snapshot,
+                is_dir=True,
+                journal=self.journal,
+            )
+            new_directory = directory.with_name(new_dir_name)
+            yield RenameEvent(directory.as_posix(), new_directory.as_posix(), DIRECTORY)
+            directory = new_directory
+        run = None
+        if self.store is not None:
+            run = self.store.start_run(directory)
+            if self.journal is not None:
+                self.journal.run(run, directory.as_posix())
+        # حالات المجلدات التي ليس لها ملف بيانات، مع incremental
+        states: Dict[str, dict] = {}
+        # بدون استدعاء ذاتي لكي لا يتم الوصول الى حد العمق مع المجلدات العميقة
+        pending = [(directory, 0)]
+        while pending:
+            current, depth = pending.pop()
+            sub_directories: List[str] = []
+            yield from rename_directory(
+                current,
+                random=self.random,
+                length=self.length,
+                save_data=self.save_data and self.store is None,
+                data_filename=self.data_filename,
+                data_format=self.data_format,
+                snapshot=snapshot,
+                store=self.store,
+                run=run,
+                journal=self.journal,
+                stats=self.stats,
+                incremental=self.incremental,
+                descend=sub_directories,
+                entry_filter=self.entry_filter,
+                depth=depth,
+                states=states,
+            )
+            pending.extend(
+                (sub_directory, depth + 1)
+                for sub_directory in reversed(sub_directories)
+            )
+        if self.stats is not None:
+            self.stats.finish(snapshot=snapshot)
+
+
+class Unrenamer:
+    """التراجع عن اعادة تسمية محتوى المجلدات وارجاع العمليات اثناء تنفيذها
+
+    مثال:
+        for event in Unrenamer(delete=True).unrename("photos"):
+            print(event.old_path, event.new_path)
+    """
+
+    __slots__ = (
+        "data_filename",
+        "delete",
+        "store",
+        "journal",
+        "stats",
+        "on_message",
+        "entry_filter",
+        "archive",
+    )
+
+    def __init__(
+        self,
+        data_filename: Optional[str] = "rename_data.json",
+        delete: Optional[bool] = False,
+        store: Optional[SQLiteStore] = None,
+        journal: Optional[Journal] = None,
+        stats: Optional[Stats] = None,
+        on_message: Optional[Callable[[str, str], None]] = None,
+        entry_filter: Optional[EntryFilter] = None,
+        archive: Optional[RenameArchive] = None,
+    ) -> None:
+        """
+        المعطيات:
+            data_filename (Optional[str], optional): اسم ملفات البيانات. Defaults to "rename_data.json".
+            delete (Optional[bool], optional): حذف ملفات البيانات، او الاسماء من قاعدة البيانات بعد التراجع. Defaults to False.
+            store (Optional[SQLiteStore], optional): قاعدة البيانات التي يتم جلب الاسماء منها بدلاً من ملفات البيانات. Defaults to None.
+            journal (Optional[Journal], optional): سجل العمليات. Defaults to None.
+            stats (Optional[Stats], optional): يتم قياس مدة كل مرحلة وعدد العمليات فيه. Defaults to None.
+            on_message (Optional[Callable[[str, str], None]], optional): يتم استدعائها بالتحذيرات والاخطاء، والا يتم استخدام warnings. Defaults to None.
+            entry_filter (Optional[EntryFilter], optional): لا يتم البحث عن ملفات البيانات في المجلدات التي يستبعدها. Defaults to None.
+            archive (Optional[RenameArchive], optional): الارشيف الذي يتم جلب الاسماء منه بدلاً من ملفات البيانات، لا يتم حذفه مع delete. Defaults to None.
+        """
+        self.data_filename = data_filename
+        self.delete = delete
+        self.store = store
+        self.journal = journal
+        self.stats = stats
+        self.on_message = on_message
+        self.entry_filter = entry_filter
+        self.archive = archive
+
+    def unrename(self, directory: Union[str, Path]) -> Iterator[RenameEvent]:
+        """التراجع عن اعادة تسمية محتوى المجلد
+
+        المعطيات:
+            directory (Union[str, Path]): المجلد
+
+        المخرجات:
+            Iterator[RenameEvent]: العمليات بنفس ترتيب تنفيذها، old_path هو المسار قبل التراجع
+        """
+        directory = Path(os.path.abspath(directory))
+        if self.store is not None:
+            for run in self.store.runs(directory):
+                yield from unrename_run(
+                    self.store,
+                    run,
+                    delete=self.delete,
+                    journal=self.journal,
+                    stats=self.stats,
+                )
+            if self.stats is not None:
+                self.stats.finish()
+            return
+        snapshot = TreeSnapshot(dir_fds=True, inodes=True)
+        try:
+            yield from self._unrename(directory, snapshot)
+        finally:
+            snapshot.close()
+
+    def verify(self, directory: Union[str, Path]) -> Iterator[Mismatch]:
+        """مقارنة ملفات البيانات في المجلد بمحتوى المجلدات، بدون اي تغيير
+
+        يتم قراءة كل مجلد مرة واحدة فقط.
+
+        المعطيات:
+            directory (Union[str, Path]): المجلد
+
+        المخرجات:
+            Iterator[Mismatch]: العناصر التي لا تطابق المجلدات
+        """
+        if self.store is not None:
+            raise ValueError("verify uses the data files, not a store")
+        with TreeSnapshot(dir_fds=True, inodes=True) as snapshot:
+            for json_file in get_json_files(
+                Path(os.path.abspath(directory)),
+                self.data_filename,
+                snapshot,
+                self.entry_filter,
+            ):
+                yield from verify_data_file(
+                    Path(json_file), snapshot=snapshot, on_message=self.on_message
+                )
+
+    def _unrename(
+        self, directory: Path, snapshot: TreeSnapshot
+    ) -> Iterator[RenameEvent]:
+        if self.archive is not None:
+            # مسارات ملفات البيانات التي يمثلها الارشيف داخل المجلد فقط
+            json_files = [
+                json_file
+                for json_file in map(Path, self.archive.data_files(self.data_filename))
+                if json_file.parent == directory or directory in json_file.parents
+            ]
+            index = self.archive
+        else:
+            json_files = list(
+                map(
+                    Path,
+                    _timed(
+                        self.stats,
+                        "listing",
+                        get_json_files,
+                        directory,
+                        self.data_filename,
+                        snapshot,
+                        self.entry_filter,
+                    ),
+                )
+            )
+            index = RenameDataIndex(json_files)
+        for json_file in json_files:
+            yield from unrename_data_file(
+                json_file,
+                # ملفات البيانات غير موجودة في المجلدات عند استخدام الارشيف
+                delete=self.delete and self.archive is None,
+                snapshot=snapshot,
+                index=index,
+                journal=self.journal,
+                stats=self.stats,
+                on_message=self.on_message,
+            )
+        if self.stats is not None:
+            self.stats.finish(snapshot=snapshot)
@@ -0,0 +1,445 @@
+import os
+import struct
+from enum import Enum
+from json import dump, dumps, loads
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .data import (
+    DataFormat,
+    RenameDataFile,
+    RenameDataWriter,
+    _is_dir_name,
+    write_state,
+)
+from .snapshot import TreeSnapshot
+from .version import version
+
+__all__ = ("ArchiveCodec", "ArchiveData", "RenameArchive")
+
+
+class ArchiveCodec(str, Enum):
+    """طريقة ضغط بيانات المجلدات في الارشيف، من مكتبة بايثون القياسية"""
+
+    # اسرع في الضغط وفك الضغط
+    zlib = "zlib"
+    # حجم اصغر، وابطأ
+    lzma = "lzma"
+
+
+# بداية الملف: MAGIC، رقم صيغة الارشيف، حجم الفهرس المضغوط
+_MAGIC = b"FRNA"
+_FORMAT = 1
+_HEADER = struct.Struct(">4sBI")
+
+
+# مكتبات الضغط يتم استيرادها عند اول استخدام، لكي لا يتم تحميلها مع بدء الاداة
+def _compress(codec: ArchiveCodec, data: bytes) -> bytes:
+    if codec == "lzma":
+        import lzma
+
+        return lzma.compress(data)
+    import zlib
+
+    return zlib.compress(data, 9)
+
+
+def _decompress(codec: ArchiveCodec, data: bytes) -> bytes:
+    """فك الضغط، يتم رفع ValueError اذ كانت البيانات تالفة"""
+    if codec == "lzma":
+        import lzma
+
+        try:
+            return lzma.decompress(data)
+        except lzma.LZMAError as error:
+            raise ValueError(str(error))
+    import zlib
+
+    try:
+        return zlib.decompress(data)
+    except zlib.error as error:
+        raise ValueError(str(error))
+
+
+class ArchiveData:
+    """بيانات مجلد واحد من الارشيف، بنفس واجهة RenameDataFile"""
+
+    __slots__ = ("path", "version", "_names", "_state", "_children")
+
+    def __init__(
+        self,
+        path: str,
+        version: Optional[str],
+        names: Optional[List[dict]],
+        state: Optional[dict] = None,
+        children: Optional[Dict[str, dict]] = None,
+    ) -> None:
+        """
+        المعطيات:
+            path (str): مسار ملف البيانات الذي تمثله البيانات
+            version (Optional[str]): اصدار frenamer الذي تمت اعادة التسمية به
+            names (Optional[List[dict]]): الاسماء بنفس ترتيب اعادة التسمية، او None اذ لم يكن المجلد في الارشيف
+            state (Optional[dict], optional): حالة --incremental الخاصة بالمجلد. Defaults to None.
+            children (Optional[Dict[str, dict]], optional): حالات المجلدات الفرعية التي ليس لها ملف بيانات. Defaults to None.
+        """
+        self.path = path
+        self.version = version
+        self._names = names
+        self._state = state
+        self._children = children or {}
+
+    @property
+    def valid(self) -> bool:
+        """هل المجلد موجود في الارشيف"""
+        return self._names is not None
+
+    @property
+    def state(self) -> Optional[dict]:
+        """حالة --incremental التي تم حفظها في الارشيف، او None"""
+        return self._state
+
+    def states(self) -> Tuple[Optional[dict], Dict[str, dict]]:
+        """ارجاع حالات --incremental مثل RenameDataFile.states"""
+        return self._state, dict(self._children)
+
+    def names(self) -> Iterator[dict]:
+        """ارجاع الاسماء بترتيب اعادة التسمية"""
+        yield from self._names or ()
+
+    def unrename_order(self) -> Iterator[dict]:
+        """ارجاع الاسماء بعكس ترتيب اعادة التسمية"""
+        yield from reversed(self._names or ())
+
+    def dir_names(self) -> Dict[str, str]:
+        """ارجاع اسماء المجلدات الفرعية (الاسم الجديد -> الاسم القديم)"""
+        return {
+            name["new_name"]: name["old_name"]
+            for name in self._names or ()
+            if _is_dir_name(name)
+        }
+
+
+class RenameArchive:
+    """ارشيف واحد مضغوط يحتوي على بيانات اعادة التسمية لجميع المجلدات
+
+    في بداية الملف يوجد فهرس (مسار المجلد بالنسبة للمجلد الاساسي -> موقع
+    وحجم بياناته)، ثم بيانات كل مجلد مضغوطة بشكل مستقل بـ zlib او lzma. عند
+    الفتح يتم قراءة الفهرس فقط، ويتم قراءة وفك ضغط بيانات المجلد عند طلبها،
+    لذلك يمكن استخدامه بدلاً من RenameDataIndex في unrename.
+
+    مثال:
+        RenameArchive.pack("rename_data.fra", "photos", delete=True)
+        with RenameArchive("rename_data.fra", "photos") as archive:
+            archive.extract()
+    """
+
+    __slots__ = (
+        "path",
+        "root",
+        "version",
+        "codec",
+        "_file",
+        "_base",
+        "_sections",
+        "data",
+        "dir_names",
+        "_lock",
+    )
+
+    def __init__(self, path: Union[str, Path], root: Union[str, Path]) -> None:
+        """
+        المعطيات:
+            path (Union[str, Path]): مسار الارشيف
+            root (Union[str, Path]): المجلد الاساسي الذي تمت اعادة تسمية محتواه، قد يختلف عن مساره عند انشاء الارشيف
+        """
+        self.path = os.fspath(path)
+        self.root = os.path.normpath(os.path.abspath(root))
+        self._file = open(self.path, "rb")
+        try:
+            magic, format_, size = _HEADER.unpack(self._file.read(_HEADER.size))
+            if magic != _MAGIC or format_ != _FORMAT:
+                raise ValueError
+            index = loads(_decompress(ArchiveCodec.zlib, self._file.read(size)))
+            directories = index["directories"]
+            codec = ArchiveCodec(index.get("codec", "zlib"))
+        except (ValueError, KeyError, TypeError, struct.error):
+            self._file.close()
+            raise ValueError(f"Invalid frenamer archive: {self.path}")
+        self._base = _HEADER.size + size
+        self.version: Optional[str] = index.get("frenamerVersion")
+        self.codec = codec
+        # مسار المجلد -> (موقع بياناته بعد الفهرس، حجمها)، بترتيب get_json_files
+        self._sections: Dict[str, Tuple[int, int]] = {
+            self._key(os.path.join(self.root, directory)): (offset, length)
+            for directory, offset, length in directories
+        }
+        # مثل RenameDataIndex، يتم حفظ ما تمت قرائته فقط
+        self.data: Dict[str, ArchiveData] = {}
+        self.dir_names: Dict[str, Dict[str, str]] = {}
+        self._lock = Lock()
+
+    def __enter__(self) -> "RenameArchive":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        return os.path.normpath(os.fspath(path))
+
+    @property
+    def directories(self) -> List[str]:
+        """المجلدات الموجودة في الارشيف، الاعمق اولاً مثل get_json_files"""
+        return list(self._sections)
+
+    def data_files(
+        self, data_filename: Optional[str] = "rename_data.json"
+    ) -> List[str]:
+        """ارجاع مسارات ملفات البيانات التي يمثلها الارشيف، لاستخدامها مثل ملفات الجيسون
+
+        المعطيات:
+            data_filename (Optional[str], optional): اسم ملفات البيانات. Defaults to "rename_data.json".
+
+        المخرجات:
+            List[str]: المسارات، الاعمق اولاً
+        """
+        return [os.path.join(directory, data_filename) for directory in self._sections]
+
+    def section(self, directory: Union[str, Path]) -> Optional[dict]:
+        """قراءة وفك ضغط بيانات مجلد واحد فقط
+
+        المعطيات:
+            directory (Union[str, Path]): مسار المجلد
+
+        المخرجات:
+            Optional[dict]: اصدار frenamer (frenamerVersion) والاسماء بنفس ترتيب اعادة التسمية (names) وحالات --incremental ان وجدت (state و children)، او None اذ لم يكن المجلد في الارشيف
+        """
+        position = self._sections.get(self._key(directory))
+        if position is None:
+            return None
+        offset, length = position
+        with self._lock:
+            self._file.seek(self._base + offset)
+            data = self._file.read(length)
+        return loads(_decompress(self.codec, data))
+
+    def get(self, data_file: Union[str, Path]) -> ArchiveData:
+        """ارجاع بيانات المجلد الذي يحتوي على ملف البيانات، مثل RenameDataIndex.get
+
+        المعطيات:
+            data_file (Union[str, Path]): مسار ملف البيانات
+
+        المخرجات:
+            ArchiveData: بيانات المجلد، غير صالحة اذ لم يكن في الارشيف
+        """
+        directory = os.path.dirname(self._key(data_file))
+        rename_data = self.data.get(directory)
+        if rename_data is None:
+            section = self.section(directory)
+            if section is None:
+                section = {"frenamerVersion": None, "names": None}
+            rename_data = self.data[directory] = ArchiveData(
+                os.fspath(data_file),
+                section["frenamerVersion"],
+                section["names"],
+                section.get("state"),
+                section.get("children"),
+            )
+        return rename_data
+
+    def discard(self, data_file: Union[str, Path]) -> None:
+        """حذف بيانات المجلد من الذاكرة بعد الانتهاء منه
+
+        المعطيات:
+            data_file (Union[str, Path]): مسار ملف البيانات
+        """
+        directory = os.path.dirname(self._key(data_file))
+        self.data.pop(directory, None)
+        self.dir_names.pop(directory, None)
+
+    def old_name(self, directory: Union[str, Path], new_name: str) -> Optional[str]:
+        """ارجاع الاسم القديم لمجلد فرعي، يتم قراءة بيانات المجلد فقط
+
+        المعطيات:
+            directory (Union[str, Path]): المجلد الذي يحتوي على المجلد الفرعي
+            new_name (str): الاسم الجديد للمجلد الفرعي
+
+        المخرجات:
+            Optional[str]: الاسم القديم، او None اذ لم يكن موجود في الارشيف
+        """
+        key = self._key(directory)
+        dir_names = self.dir_names.get(key)
+        if dir_names is None:
+            if key not in self._sections:
+                return None
+            rename_data = self.data.get(key)
+            if rename_data is None:
+                section = self.section(key)
+                rename_data = ArchiveData(key, None, section["names"])
+            dir_names = self.dir_names[key] = rename_data.dir_names()
+        return dir_names.get(new_name)
+
+    def unrename_path(self, path: Union[str, Path]) -> str:
+        """جلب المسار القديم الخاص بالمسار الجديد، مثل RenameDataIndex.unrename_path
+
+        المعطيات:
+            path (Union[str, Path]): المسار الجديد
+
+        المخرجات:
+            str: المسار القديم
+        """
+        current_path = ""
+        unrename_path = ""
+        for part in Path(self._key(path)).parts:
+            old_part = self.old_name(current_path, part) if current_path else None
+            unrename_path = os.path.join(unrename_path, old_part or part)
+            current_path = os.path.join(current_path, part)
+        return unrename_path
+
+    def extract(
+        self,
+        data_filename: Optional[str] = "rename_data.json",
+        data_format: Optional[DataFormat] = None,
+    ) -> int:
+        """كتابة بيانات كل مجلد في ملف بيانات داخله، بنفس شكل rename
+
+        حالات --incremental يتم كتابتها في نهاية الملفات بصيغة JSON Lines فقط.
+        وقت تعديل المجلد يتغير عند كتابة ملف البيانات، لذلك يتم حفظ وقت التعديل
+        الجديد اذ لم يتغير المجلد منذ حفظ الحالة، والا يتم قراءة المجلد في
+        المرة القادمة مع الاحتفاظ بالرقم التالي للاسماء.
+
+        المعطيات:
+            data_filename (Optional[str], optional): اسم ملفات البيانات. Defaults to "rename_data.json".
+            data_format (Optional[DataFormat], optional): صيغة ملفات البيانات، json اذ لم تعطى. Defaults to None.
+
+        المخرجات:
+            int: عدد الملفات التي تمت كتابتها
+        """
+        from time import time_ns
+
+        # api تستورد الارشيف
+        from .api import _RACY_MTIME_NS
+
+        if data_format is None:
+            data_format = DataFormat.json
+        for directory in self._sections:
+            section = self.section(directory)
+            data_path = os.path.join(directory, data_filename)
+            if data_format is DataFormat.jsonl:
+                mtime = os.stat(directory).st_mtime_ns
+                listed_at = time_ns()
+                with RenameDataWriter(data_path) as writer:
+                    for name in section["names"]:
+                        writer.write(name)
+                for child, child_state in section.get("children", {}).items():
+                    # المجلدات الفرعية لا يتغير وقت تعديلها
+                    write_state(data_path, child_state, child)
+                state = section.get("state")
+                if state is not None:
+                    if state["mtime"] == mtime and listed_at - mtime >= _RACY_MTIME_NS:
+                        state = {**state, "mtime": os.stat(directory).st_mtime_ns}
+                    else:
+                        state = {**state, "mtime": None}
+                    write_state(data_path, state)
+            else:
+                with open(data_path, mode="w", encoding="utf-8") as f:
+                    dump(section, f, indent=4)
+        return len(self._sections)
+
+    @classmethod
+    def pack(
+        cls,
+        path: Union[str, Path],
+        root: Union[str, Path],
+        data_filename: Optional[str] = "rename_data.json",
+        codec: Optional[ArchiveCodec] = None,
+        delete: Optional[bool] = False,
+        snapshot: Optional[TreeSnapshot] = None,
+    ) -> int:
+        """انشاء ارشيف من ملفات البيانات الموجودة في المجلد
+
+        يتم كتابة بيانات المجلدات في ملف مؤقت، ثم يتم كتابة الفهرس قبلها في
+        الارشيف لانه يحتاج مواقعها. حالات --incremental يتم حفظها مع الاسماء.
+
+        المعطيات:
+            path (Union[str, Path]): مسار الارشيف
+            root (Union[str, Path]): المجلد الاساسي
+            data_filename (Optional[str], optional): اسم ملفات البيانات. Defaults to "rename_data.json".
+            codec (Optional[ArchiveCodec], optional): طريقة الضغط، zlib اذ لم تعطى. Defaults to None.
+            delete (Optional[bool], optional): حذف ملفات البيانات بعد انشاء الارشيف. Defaults to False.
+            snapshot (Optional[TreeSnapshot], optional): صورة المجلدات التي يتم البحث فيها عن ملفات البيانات. Defaults to None.
+
+        المخرجات:
+            int: عدد ملفات البيانات في الارشيف
+        """
+        # لا يتم استيرادها مع بدء الاداة
+        from shutil import copyfileobj
+        from tempfile import TemporaryFile
+
+        # api تستورد الارشيف
+        from .api import get_json_files
+
+        codec = ArchiveCodec(codec or ArchiveCodec.zlib)
+        root = os.path.normpath(os.path.abspath(root))
+        path = os.fspath(path)
+        json_files = get_json_files(Path(root), data_filename, snapshot)
+        directories: List[list] = []
+        with TemporaryFile(dir=os.path.dirname(os.path.abspath(path))) as f:
+            offset = 0
+            for json_file in json_files:
+                rename_data = RenameDataFile(json_file)
+                if not rename_data.valid:
+                    raise ValueError(f"Invalid frenamer format: {json_file}")
+                # الاسماء بترتيب اعادة التسمية الفعلي، صيغة الجيسون القديمة
+                # تكتب المجلدات قبل الملفات رغم ان الملفات يتم اعادة تسميتها اولاً
+                names = list(rename_data.unrename_order())
+                names.reverse()
+                section = {"frenamerVersion": rename_data.version, "names": names}
+                state, children = rename_data.states()
+                if state is not None:
+                    section["state"] = state
+                if children:
+                    section["children"] = children
+                data = _compress(
+                    codec,
+                    dumps(
+                        section,
+                        ensure_ascii=False,
+                        separators=(",", ":"),
+                    ).encode("utf-8"),
+                )
+                f.write(data)
+                directory = os.path.relpath(os.path.dirname(json_file), root)
+                directories.append([Path(directory).as_posix(), offset, len(data)])
+                offset += len(data)
+            index = _compress(
+                ArchiveCodec.zlib,
+                dumps(
+                    {
+                        "frenamerVersion": version,
+                        "codec": codec.value,
+                        "directories": directories,
+                    },
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                ).encode("utf-8"),
+            )
+            f.seek(0)
+            with open(path + ".part", "wb") as archive:
+                archive.write(_HEADER.pack(_MAGIC, _FORMAT, len(index)))
+                archive.write(index)
+                copyfileobj(f, archive)
+        os.replace(path + ".part", path)
+        if delete:
+            for json_file in json_files:
+                os.remove(json_file)
+        return len(json_files)
+
+    def close(self) -> None:
+        """اغلاق الارشيف"""
+        self._file.close()
@@ -0,0 +1,288 @@
+import os
+from enum import Enum
+from json import dumps, load, loads
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .version import version
+
+__all__ = (
+    "DataFormat",
+    "RenameDataFile",
+    "RenameDataWriter",
+    "name_pair",
+    "write_state",
+)
+
+# حجم الجزء الذي يتم قرائته من نهاية الملف عند القراءة بالعكس
+_BLOCK_SIZE = 64 * 1024
+
+
+class DataFormat(str, Enum):
+    """صيغة ملف بيانات اعادة التسمية"""
+
+    # ملف جيسون واحد يتم كتابته بعد الانتهاء من المجلد
+    json = "json"
+    # سطر لكل عنصر يتم اضافته مع كل اعادة تسمية، بعد سطر يحتوي على الاصدار
+    jsonl = "jsonl"
+
+
+def _is_dir_name(name: dict) -> bool:
+    return "old_name" in name
+
+
+def name_pair(name: dict) -> Tuple[str, str]:
+    """ارجاع الاسم القديم والجديد من عنصر في ملف البيانات
+
+    العنصر قد يحتوي على مفاتيح اخرى مثل dev و ino، لذلك يتم جلب الاسماء
+    بمفاتيحها وليس بترتيبها.
+
+    المعطيات:
+        name (dict): العنصر بنفس شكل ملف الجيسون، ملف او مجلد
+
+    المخرجات:
+        Tuple[str, str]: الاسم القديم، الاسم الجديد
+    """
+    if "old_name" in name:
+        return name["old_name"], name["new_name"]
+    return name["old"], name["new"]
+
+
+def write_state(
+    path: Union[str, Path], state: dict, child: Optional[str] = None
+) -> None:
+    """اضافة حالة المجلد في نهاية ملف البيانات، تستخدم في --incremental
+
+    يتم الاضافة في نفس الملف بدون انشاء ملف جديد، لذلك لا يتغير وقت تعديل
+    المجلد (mtime) بعد حفظه في الحالة.
+
+    المعطيات:
+        path (Union[str, Path]): مسار ملف البيانات بصيغة JSON Lines
+        state (dict): الحالة
+        child (Optional[str], optional): مسار مجلد فرعي ليس له ملف بيانات بالنسبة لمجلد الملف، يتم حفظ حالته بدلاً من حالة مجلد الملف. Defaults to None.
+    """
+    record = {"state": state} if child is None else {"state": state, "child": child}
+    with open(path, mode="a", encoding="utf-8") as f:
+        f.write(dumps(record, ensure_ascii=False, separators=(",", ":")))
+        f.write("\n")
+
+
+class RenameDataWriter:
+    """كتابة بيانات اعادة التسمية بصيغة JSON Lines مع كل اعادة تسمية
+
+    يتم الكتابة في ملف مؤقت بجانب الملف النهائي، ثم يتم نقله عند الاغلاق،
+    لكي لا يتم اعادة تسمية الملف اذ كان المجلد يحتوي على ملف بنفس الاسم.
+    عند الاضافة على ملف موجود يتم الكتابة في نهايته مباشرة.
+    """
+
+    __slots__ = ("path", "count", "size", "append", "_part_path", "_file", "_start")
+
+    def __init__(self, path: Union[str, Path], append: Optional[bool] = False) -> None:
+        """
+        المعطيات:
+            path (Union[str, Path]): مسار ملف البيانات
+            append (Optional[bool], optional): الاضافة على ملف البيانات الموجود بصيغة JSON Lines. Defaults to False.
+        """
+        self.path = os.fspath(path)
+        self.count: int = 0
+        # عدد البايتات التي تمت كتابتها، بعد اغلاق الملف
+        self.size: int = 0
+        self.append = append
+        self._part_path = self.path if append else self.path + ".part"
+        self._file = None
+        # حجم الملف قبل الاضافة عليه
+        self._start: int = 0
+
+    def __enter__(self) -> "RenameDataWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def write(self, name: dict) -> None:
+        """اضافة عنصر تمت اعادة تسميته، يتم انشاء الملف مع اول عنصر
+
+        المعطيات:
+            name (dict): الاسم القديم والجديد بنفس شكل ملف الجيسون
+        """
+        if self._file is None and self.append:
+            self._file = open(self._part_path, mode="a", encoding="utf-8")
+            self._start = self._file.tell()
+        elif self._file is None:
+            self._file = open(self._part_path, mode="w", encoding="utf-8")
+            self._file.write(
+                dumps({"frenamerVersion": version, "format": DataFormat.jsonl.value})
+                + "\n"
+            )
+        self._file.write(dumps(name, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        """اغلاق الملف ونقله الى مساره النهائي"""
+        if self._file is not None:
+            self.size = self._file.tell() - self._start
+            self._file.close()
+            self._file = None
+            if not self.append:
+                os.replace(self._part_path, self.path)
+
+
+def _reversed_lines(path: str) -> Iterator[bytes]:
+    """قراءة اسطر الملف من النهاية بدون قراءة الملف كاملاً في الذاكرة"""
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        rest = b""
+        while position > 0:
+            size = min(_BLOCK_SIZE, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + rest).split(b"\n")
+            rest = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line
+        if rest:
+            yield rest
+
+
+class RenameDataFile:
+    """قراءة ملف بيانات اعادة التسمية بالصيغتين
+
+    صيغة JSON Lines يتم قرائتها سطر بسطر بدون تحميلها كاملة في الذاكرة، اما
+    الصيغة القديمة (frenamerVersion و names) فيتم تحميلها مرة واحدة.
+    """
+
+    __slots__ = ("path", "version", "format", "_names")
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        المعطيات:
+            path (Union[str, Path]): مسار ملف البيانات
+        """
+        self.path = os.fspath(path)
+        self.version: Optional[str] = None
+        self.format: Optional[DataFormat] = None
+        self._names: Optional[List[dict]] = None
+        with open(self.path, "r", encoding="utf-8") as f:
+            try:
+                header = loads(f.readline())
+            except ValueError:
+                header = None
+            if (
+                isinstance(header, dict)
+                and header.get("format") == DataFormat.jsonl.value
+            ):
+                self.format = DataFormat.jsonl
+                self.version = header.get("frenamerVersion")
+                return
+            if not (isinstance(header, dict) and "names" in header):
+                f.seek(0)
+                header = load(f)
+        if (
+            isinstance(header, dict)
+            and "frenamerVersion" in header
+            and isinstance(header.get("names"), list)
+        ):
+            self.format = DataFormat.json
+            self.version = header.get("frenamerVersion")
+            self._names = header.get("names")
+
+    @property
+    def valid(self) -> bool:
+        """هل الملف بصيغة صحيحة"""
+        return self.format is not None
+
+    @property
+    def state(self) -> Optional[dict]:
+        """اخر حالة تم حفظها في نهاية الملف بـ --incremental، او None"""
+        return self.states()[0]
+
+    def states(self) -> Tuple[Optional[dict], Dict[str, dict]]:
+        """قراءة الحالات المحفوظة في نهاية الملف بعد اخر اسم
+
+        المخرجات:
+            Tuple[Optional[dict], Dict[str, dict]]: حالة مجلد الملف او None، وحالات المجلدات الفرعية التي ليس لها ملف بيانات (المسار بالنسبة لمجلد الملف -> الحالة)
+        """
+        state = None
+        children: Dict[str, dict] = {}
+        if self.format is not DataFormat.jsonl:
+            return state, children
+        for line in _reversed_lines(self.path):
+            record = loads(line)
+            if "state" not in record:
+                break
+            child = record.get("child")
+            if child is None:
+                if state is None:
+                    state = record["state"]
+            else:
+                # الحالة الاحدث اولاً
+                children.setdefault(child, record["state"])
+        return state, children
+
+    def names(self) -> Iterator[dict]:
+        """ارجاع الاسماء بنفس ترتيب كتابتها
+
+        المخرجات:
+            Iterator[dict]: الاسم القديم والجديد لكل عنصر
+        """
+        if self.format is DataFormat.json:
+            yield from self._names
+        elif self.format is DataFormat.jsonl:
+            with open(self.path, "r", encoding="utf-8") as f:
+                f.readline()
+                for line in f:
+                    if line.strip():
+                        name = loads(line)
+                        if "state" not in name:
+                            yield name
+
+    def unrename_order(self) -> Iterator[dict]:
+        """ارجاع الاسماء بعكس ترتيب اعادة التسمية، لكي لا يتم استبدال عنصر
+        باخر اخذ اسمه القديم
+
+        المخرجات:
+            Iterator[dict]: الاسم القديم والجديد لكل عنصر
+        """
+        if self.format is DataFormat.json:
+            # في الصيغة القديمة لا يوجد ترتيب اعادة التسمية، لكن الملفات يتم
+            # اعادة تسميتها قبل المجلدات
+            yield from reversed([name for name in self._names if _is_dir_name(name)])
+            yield from reversed(
+                [name for name in self._names if not _is_dir_name(name)]
+            )
+        elif self.format is DataFormat.jsonl:
+            lines = _reversed_lines(self.path)
+            for line in lines:
+                name = loads(line)
+                if "format" in name:
+                    break
+                if "state" not in name:
+                    yield name
+
+    def dir_names(self) -> Dict[str, str]:
+        """ارجاع اسماء المجلدات الفرعية (الاسم الجديد -> الاسم القديم)
+
+        في صيغة JSON Lines يتم كتابة المجلدات بعد الملفات، لذلك يتم القراءة من
+        نهاية الملف والتوقف عند اول ملف، الا اذ كان في نهايته حالات --incremental
+        فيتم قراءة الملف كاملاً.
+
+        المخرجات:
+            Dict[str, str]: الاسم الجديد والقديم لكل مجلد
+        """
+        if self.format is DataFormat.json:
+            names = self._names
+        elif self.format is DataFormat.jsonl and any(self.states()):
+            # الاضافة بـ --incremental تجعل المجلدات بين الملفات
+            names = self.names()
+        elif self.format is DataFormat.jsonl:
+            names = []
+            for name in self.unrename_order():
+                if not _is_dir_name(name):
+                    break
+                names.append(name)
+        else:
+            return {}
+        return {
+            name["new_name"]: name["old_name"] for name in names if _is_dir_name(name)
+        }
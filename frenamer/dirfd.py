@@ -0,0 +1,268 @@
+import errno
+import os
+import sys
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Iterator, List, Optional
+
+__all__ = ("DirFdCache", "rename_noreplace")
+
+# os.scandir(fd) و os.rename(..., src_dir_fd=, dst_dir_fd=) غير مدعومة في ويندوز
+SUPPORTED = (
+    hasattr(os, "O_DIRECTORY")
+    and os.scandir in os.supports_fd
+    and os.rename in os.supports_dir_fd
+    and os.open in os.supports_dir_fd
+    and os.unlink in os.supports_dir_fd
+    and os.stat in os.supports_dir_fd
+)
+
+_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_CLOEXEC", 0)
+
+# من linux/fcntl.h و linux/fs.h
+_AT_FDCWD = -100
+_RENAME_NOREPLACE = 1
+# renameat2 من مكتبة C، False اذ لم تكن موجودة (ليس لينكس او glibc اقدم من 2.28)
+_renameat2: Any = None
+
+
+def _load_renameat2() -> Any:
+    """تحميل renameat2 عند اول استخدام، لكي لا يتم استيراد ctypes مع بدء الاداة"""
+    global _renameat2
+    if _renameat2 is None:
+        _renameat2 = False
+        if sys.platform.startswith("linux"):
+            import ctypes
+
+            try:
+                function = ctypes.CDLL(None, use_errno=True).renameat2
+            except (OSError, AttributeError):
+                pass
+            else:
+                function.argtypes = (
+                    ctypes.c_int,
+                    ctypes.c_char_p,
+                    ctypes.c_int,
+                    ctypes.c_char_p,
+                    ctypes.c_uint,
+                )
+                function.restype = ctypes.c_int
+                _renameat2 = function
+    return _renameat2
+
+
+def rename_noreplace(
+    src: str,
+    dst: str,
+    src_dir_fd: Optional[int] = None,
+    dst_dir_fd: Optional[int] = None,
+) -> None:
+    """اعادة تسمية عنصر بدون استبدال الهدف اذ كان موجوداً
+
+    في لينكس يتم استخدام renameat2 مع RENAME_NOREPLACE، لذلك التأكد من عدم
+    وجود الهدف واعادة التسمية عملية واحدة. في غيره، او اذ لم يدعمها نظام
+    الملفات، يتم التأكد من عدم وجود الهدف ثم اعادة التسمية كما كان سابقاً.
+
+    المعطيات:
+        src (str): المسار الحالي، بالنسبة لـ src_dir_fd ان وجد
+        dst (str): المسار الجديد، بالنسبة لـ dst_dir_fd ان وجد
+        src_dir_fd (Optional[int], optional): واصف مجلد المسار الحالي. Defaults to None.
+        dst_dir_fd (Optional[int], optional): واصف مجلد المسار الجديد. Defaults to None.
+
+    المخرجات:
+        None: يتم رفع FileExistsError اذ كان الهدف موجوداً
+    """
+    global _renameat2
+    renameat2 = _load_renameat2()
+    if renameat2:
+        from ctypes import get_errno
+
+        if not renameat2(
+            _AT_FDCWD if src_dir_fd is None else src_dir_fd,
+            os.fsencode(src),
+            _AT_FDCWD if dst_dir_fd is None else dst_dir_fd,
+            os.fsencode(dst),
+            _RENAME_NOREPLACE,
+        ):
+            return
+        error = get_errno()
+        if error == errno.ENOSYS:
+            # النواة اقدم من 3.15
+            _renameat2 = False
+        elif error not in (errno.EINVAL, errno.EOPNOTSUPP):
+            # EEXIST يصبح FileExistsError
+            raise OSError(error, os.strerror(error), src, None, dst)
+    try:
+        os.lstat(dst, dir_fd=dst_dir_fd)
+    except FileNotFoundError:
+        os.rename(src, dst, src_dir_fd=src_dir_fd, dst_dir_fd=dst_dir_fd)
+    else:
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), src, None, dst)
+
+
+class _Entry:
+    __slots__ = ("fd", "users", "pinned")
+
+    def __init__(self, fd: int, pinned: bool) -> None:
+        self.fd = fd
+        self.users = 0
+        self.pinned = pinned
+
+
+class DirFdCache:
+    """واصفات ملفات (file descriptors) مفتوحة للمجلدات التي يتم العمل عليها
+
+    كل مجلد يتم فتحه بالنسبة لواصف المجلد الذي يحتويه، لذلك لا يحتاج النظام
+    الى المرور على جميع اجزاء المسار مع كل قراءة او اعادة تسمية. عدد الواصفات
+    المفتوحة محدود بـ max_fds ويتم اغلاق الاقل استخداماً، ما عدا المجلدات
+    الاساسية (التي لا يوجد واصف للمجلد الذي يحتويها) فتبقى مفتوحة، لذلك يستمر
+    العمل اذ تم نقل الشجرة اثناء ذلك.
+    """
+
+    __slots__ = ("max_fds", "_entries", "_lock")
+
+    supported = SUPPORTED
+
+    def __init__(self, max_fds: Optional[int] = 64) -> None:
+        """
+        المعطيات:
+            max_fds (Optional[int], optional): اقصى عدد من الواصفات المفتوحة بالاضافة الى المجلدات الاساسية. Defaults to 64.
+        """
+        self.max_fds = max_fds
+        # المسار -> الواصف، بترتيب اخر استخدام
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self) -> "DirFdCache":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(os.fspath(path))
+
+    def _open(self, key: str) -> _Entry:
+        """فتح المجلد بالنسبة لاقرب مجلد اب مفتوح، بدون استدعاء ذاتي"""
+        missing: List[str] = []
+        parent = key
+        while parent not in self._entries:
+            head = os.path.dirname(parent)
+            if head == parent:
+                break
+            missing.append(parent)
+            parent = head
+        if parent not in self._entries:
+            # لا يوجد اي اب مفتوح، لذلك هذا مجلد اساسي يتم فتحه بمساره الكامل
+            entry = self._entries[key] = _Entry(os.open(key, _FLAGS), True)
+            return entry
+        entry = self._entries[parent]
+        # يجب ان تبقى المجلدات الاب مفتوحة اثناء فتح المجلدات التي بداخلها
+        entry.users += 1
+        try:
+            for path in reversed(missing):
+                fd = os.open(os.path.basename(path), _FLAGS, dir_fd=entry.fd)
+                entry.users -= 1
+                entry = self._entries[path] = _Entry(fd, False)
+                entry.users += 1
+        finally:
+            entry.users -= 1
+        return entry
+
+    def _evict(self) -> None:
+        extra = sum(not entry.pinned for entry in self._entries.values())
+        extra -= self.max_fds
+        if extra <= 0:
+            return
+        for key in list(self._entries):
+            entry = self._entries[key]
+            if entry.pinned or entry.users:
+                continue
+            os.close(entry.fd)
+            del self._entries[key]
+            extra -= 1
+            if not extra:
+                break
+
+    @contextmanager
+    def lease(self, path: str) -> Iterator[int]:
+        """ارجاع واصف المجلد، ولا يتم اغلاقه حتى الانتهاء من استخدامه
+
+        المعطيات:
+            path (str): مسار المجلد
+
+        المخرجات:
+            Iterator[int]: الواصف
+        """
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._open(key)
+            else:
+                self._entries.move_to_end(key)
+            entry.users += 1
+            self._evict()
+        try:
+            yield entry.fd
+        finally:
+            with self._lock:
+                entry.users -= 1
+
+    def rename(
+        self,
+        directory: str,
+        old_name: str,
+        new_name: str,
+        noreplace: Optional[bool] = False,
+    ) -> None:
+        """اعادة تسمية عنصر داخل المجلد بالنسبة لواصفه
+
+        المعطيات:
+            directory (str): المجلد الذي يحتوي على العنصر
+            old_name (str): الاسم الحالي
+            new_name (str): الاسم الجديد
+            noreplace (Optional[bool], optional): رفع FileExistsError بدلاً من استبدال العنصر الموجود بالاسم الجديد. Defaults to False.
+        """
+        with self.lease(directory) as fd:
+            if noreplace:
+                rename_noreplace(old_name, new_name, src_dir_fd=fd, dst_dir_fd=fd)
+            else:
+                os.rename(old_name, new_name, src_dir_fd=fd, dst_dir_fd=fd)
+
+    def remove(self, directory: str, name: str) -> None:
+        """حذف ملف داخل المجلد بالنسبة لواصفه
+
+        المعطيات:
+            directory (str): المجلد الذي يحتوي على الملف
+            name (str): اسم الملف
+        """
+        with self.lease(directory) as fd:
+            os.unlink(name, dir_fd=fd)
+
+    def moved(self, src: str, dst: str) -> None:
+        """تحديث مسارات الواصفات بعد اعادة تسمية مجلد، الواصفات نفسها لا تتغير
+
+        المعطيات:
+            src (str): المسار القديم
+            dst (str): المسار الجديد
+        """
+        src, dst = self._key(src), self._key(dst)
+        prefix = src + os.sep
+        with self._lock:
+            for key in [
+                key for key in self._entries if key == src or key.startswith(prefix)
+            ]:
+                self._entries[dst + key[len(src) :]] = self._entries.pop(key)
+
+    def close(self) -> None:
+        """اغلاق جميع الواصفات"""
+        with self._lock:
+            for entry in self._entries.values():
+                os.close(entry.fd)
+            self._entries.clear()
@@ -0,0 +1,123 @@
+import re
+from fnmatch import translate
+from typing import Iterable, Optional
+
+__all__ = ("EntryFilter",)
+
+
+def _compile(patterns: Iterable[str]) -> Optional[re.Pattern]:
+    """تحويل الانماط الى تعبير نمطي واحد، او None اذ لم توجد انماط"""
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{translate(pattern)})" for pattern in patterns))
+
+
+class EntryFilter:
+    """تحديد العناصر التي يتم اعادة تسميتها والمجلدات التي يتم المرور عليها
+
+    الانماط (مثل '*.jpg' و '.git') تتم مقارنتها باسم العنصر فقط، ويتم تحويل
+    جميع انماط include الى تعبير نمطي واحد وكذلك انماط exclude، لذلك تتم
+    مقارنة كل اسم مرة واحدة مهما كان عدد الانماط. المجلد المستبعد لا تتم
+    قراءته ابداً، اما المجلد الذي لا يطابق include فيتم المرور عليه بدون
+    اعادة تسميته. العمق يبدأ من 1 لمحتوى المجلد الاساسي.
+    """
+
+    __slots__ = (
+        "include",
+        "exclude",
+        "max_depth",
+        "files",
+        "dirs",
+        "_include",
+        "_exclude",
+    )
+
+    def __init__(
+        self,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        max_depth: Optional[int] = None,
+        files: Optional[bool] = True,
+        dirs: Optional[bool] = True,
+    ) -> None:
+        """
+        المعطيات:
+            include (Optional[Iterable[str]], optional): يتم اعادة تسمية العناصر التي تطابق احدها فقط. Defaults to None.
+            exclude (Optional[Iterable[str]], optional): العناصر التي لا يتم اعادة تسميتها، ولا يتم المرور على المجلدات منها. Defaults to None.
+            max_depth (Optional[int], optional): اقصى عمق يتم اعادة تسمية عناصره. Defaults to None.
+            files (Optional[bool], optional): اعادة تسمية الملفات. Defaults to True.
+            dirs (Optional[bool], optional): اعادة تسمية المجلدات. Defaults to True.
+        """
+        self.include = list(include or ())
+        self.exclude = list(exclude or ())
+        self.max_depth = max_depth
+        self.files = files
+        self.dirs = dirs
+        self._include = _compile(self.include)
+        self._exclude = _compile(self.exclude)
+
+    @property
+    def active(self) -> bool:
+        """هل يوجد اي قيد على العناصر"""
+        return bool(
+            self.include
+            or self.exclude
+            or self.max_depth is not None
+            or not self.files
+            or not self.dirs
+        )
+
+    def descends(self, depth: int) -> bool:
+        """هل يتم المرور على المجلدات التي في هذا العمق حسب max_depth فقط
+
+        المعطيات:
+            depth (int): عمق المجلد
+
+        المخرجات:
+            bool: هل يتم قراءة محتوى المجلدات التي في هذا العمق
+        """
+        return self.max_depth is None or depth < self.max_depth
+
+    def prunes(self, name: str, depth: int) -> bool:
+        """هل لا يتم المرور على المجلد (لا يتم قراءة محتواه)
+
+        المعطيات:
+            name (str): اسم المجلد
+            depth (int): عمق المجلد
+
+        المخرجات:
+            bool: هل يتم تجاهل المجلد ومحتواه
+        """
+        if not self.descends(depth):
+            return True
+        return self._exclude is not None and self._exclude.match(name) is not None
+
+    def accepts(self, name: str, is_dir: bool, depth: int) -> bool:
+        """هل يتم اعادة تسمية العنصر
+
+        المعطيات:
+            name (str): اسم العنصر
+            is_dir (bool): هل العنصر مجلد
+            depth (int): عمق العنصر
+
+        المخرجات:
+            bool: هل يتم اعادة تسمية العنصر
+        """
+        if not (self.dirs if is_dir else self.files):
+            return False
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+        if self._exclude is not None and self._exclude.match(name) is not None:
+            return False
+        return self._include is None or self._include.match(name) is not None
+
+    def options(self) -> dict:
+        """الخيارات التي يمكن بناء نفس الفلتر منها، تحفظ في سجل العمليات"""
+        return {
+            "include": self.include,
+            "exclude": self.exclude,
+            "max_depth": self.max_depth,
+            "files": self.files,
+            "dirs": self.dirs,
+        }
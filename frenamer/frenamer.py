@@ -1,14 +1,50 @@
 import os
+import signal
+import sqlite3
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 from time import time
 import typer
-from json import dump, load, loads
 from pathlib import Path
-from typing import List, Tuple, Optional
-from random import choice
-from string import ascii_letters
+from typing import Callable, Dict, List, Tuple, Optional, Union
 
 if __name__ != "__main__":
+    from .api import (
+        DIRECTORY,
+        DRIFTED,
+        FOREIGN,
+        MISSING,
+        _rename_free,
+        _timed,
+        _top_index,
+        file_renamer,
+        get_dir_content,
+        get_dir_name,
+        get_json_files,
+        rename_directory,
+        unrename_data_file,
+        unrename_run,
+        verify_data_file,
+    )
+    from .archive import ArchiveCodec, RenameArchive
+    from .data import DataFormat, RenameDataFile, RenameDataWriter
+    from .filters import EntryFilter
+    from .index import RenameDataIndex
+    from .journal import (
+        Journal,
+        JournalState,
+        read_journal,
+        read_journal_header,
+        read_journal_reversed,
+    )
+    from .plan import RenamePlan, apply_plan, build_plan
+    from .reporter import Reporter
+    from .snapshot import TreeSnapshot
+    from .stats import Stats
+    from .store import SQLiteStore, open_store, parse_store
     from .version import version
+    from .watch import Watcher
 
 
 app = typer.Typer(
@@ -30,17 +66,29 @@ __all__ = (
     "get_unrename_dir",
     "get_name_from_json",
     "get_unrename_dir",
+    "unrename_from_store",
+    "rollback_from_journal",
     "rename",
     "unrename",
+    "watch",
+    "verify",
+    "archive",
+    "extract",
+    "resume",
+    "rollback",
 )
 
 
-def print_dir_path(dir_path: str) -> None:
+def print_dir_path(dir_path: str, reporter: Optional["Reporter"] = None) -> None:
     """طباعة المسار الخاص بالمجلد
 
     المعطيات:
         dir_path (str): المسار المراد طباعته
+        reporter (Optional[Reporter], optional): يتم ارسال المسار اليه بدلاً من طباعته مباشرة. Defaults to None.
     """
+    if reporter is not None:
+        reporter.directory(dir_path)
+        return
     typer.echo(
         typer.style(
             "Directory: " + dir_path,
@@ -49,88 +97,38 @@ def print_dir_path(dir_path: str) -> None:
     )
 
 
-def print_old_new_name(old_name: str, new_name: str) -> None:
+def print_old_new_name(
+    old_name: str, new_name: str, reporter: Optional["Reporter"] = None
+) -> None:
     """طباعة الاسم القديم والجديد
 
     Args:
         old_name (str): الاسم القديم والجديد
         new_name (str): الاسم الجديد
+        reporter (Optional[Reporter], optional): يتم ارسال الاسماء اليه بدلاً من طباعتها مباشرة. Defaults to None.
     """
+    if reporter is not None:
+        reporter.renamed(old_name, new_name)
+        return
     rename_word = typer.style(" Rename ", fg="yellow")
     to_word = typer.style(" to ", fg="yellow")
     typer.echo(rename_word + old_name + to_word + new_name)
 
 
-def get_dir_content(path: str) -> Tuple[str, List[Optional[str]], List[Optional[str]]]:
-    """ارجاع محتوى المجلد
+def _print_message(
+    text: str, fg: Optional[str] = None, reporter: Optional["Reporter"] = None
+) -> None:
+    """طباعة رسالة مثل التحذيرات والاخطاء
 
     المعطيات:
-        path (str): المجلد المراد جلب محتوياته
-
-    المخرجات:
-        Tuple[str, List[Optional[str]], List[Optional[str]]]: مسار المجلد، المجلدات التي يحتويها، الملفات التي يحتويها
+        text (str): الرسالة
+        fg (Optional[str], optional): لون الرسالة. Defaults to None.
+        reporter (Optional[Reporter], optional): يتم ارسال الرسالة اليه بدلاً من طباعتها مباشرة. Defaults to None.
     """
-    for root, dirs, files in os.walk(path, topdown=True):
-        return (root, dirs, files)
-
-
-def get_dir_name(
-    start_with: str,
-    root: str,
-    random: Optional[bool] = False,
-    length: Optional[int] = 10,
-) -> str:
-    """ارجاع اسم مجلد الجديد (يمكن استخدامه في المسار)
-
-    المعطيات:
-        start_with (str): بداية اسم للمجلد المراد جلبه
-        root (str): المسار الذي سوف يتم وضع المجلد فيه
-        random (Optional[bool], optional): تحديد ما إذا كنت تريد الاسم عشوائي ام لا. Defaults to False.
-        length (Optional[int], optional): طول الاسم العشوائي اذ كنت تريد. Defaults to 10.
-
-    المخرجات:
-        str: اسم مجلد يمكن وضعه في المسار المعطى
-    """
-    _, dirs, _ = get_dir_content(root)
-    if random:
-        dir_name = "".join(choice(ascii_letters) for _ in range(length))
-        while dir_name in dirs:
-            dir_name = "".join(choice(ascii_letters) for _ in range(length))
-        return dir_name
+    if reporter is not None:
+        reporter.message(text, fg=fg)
     else:
-        for char in ascii_letters:
-            dir_name = (f"{start_with}-{char}") if start_with else (char)
-            if dir_name in dirs:
-                continue
-            else:
-                return dir_name
-    # يتم تشغيل هذا السطر اذ لم يجد اسم ابجدي للمجلد
-    # فيتم اعاطه الاسم الاخير ولذي يكون
-    # 'Z', 'Z-Z', 'Z-Z-Z' ...
-    # حيث يتم تمريره كبداية للاسم
-    return get_dir_name(dir_name, root, random=random, length=length)
-
-
-def file_renamer(file: Path) -> dict:
-    """اعادة تسمية الملف المعطى
-
-    المعطيات:
-        file (Path): الملف المراد اعادة تسميته
-
-    المخرجات:
-        dict: الاسم القديم والجديد الخاص بالملف
-    """
-    directory = file.parent
-    _, _, files = get_dir_content(directory.as_posix())
-    files = list(map(lambda file: file.split(".")[0], files))
-    num = 1
-    new_file_name = f"{directory.name}-{num}"
-    while new_file_name in files:
-        num += 1
-        new_file_name = f"{directory.name}-{num}"
-    new_file_name = f"{directory.name}-{num}{''.join(file.suffixes)}"
-    new_path = file.rename(file.with_name(new_file_name))
-    return {"old": file.name, "new": new_path.name}
+        typer.echo(typer.style(text, fg=fg) if fg else text)
 
 
 def dir_renamer(
@@ -140,6 +138,18 @@ def dir_renamer(
     is_root: Optional[bool] = False,
     save_data: Optional[bool] = False,
     data_filename: Optional[str] = "rename_data.json",
+    snapshot: Optional["TreeSnapshot"] = None,
+    executor: Optional[Executor] = None,
+    reporter: Optional["Reporter"] = None,
+    store: Optional["SQLiteStore"] = None,
+    data_format: Optional["DataFormat"] = None,
+    journal: Optional["Journal"] = None,
+    resumed: Optional[Dict[str, List[dict]]] = None,
+    run: Optional[int] = None,
+    stats: Optional["Stats"] = None,
+    incremental: Optional[bool] = False,
+    entry_filter: Optional["EntryFilter"] = None,
+    states: Optional[Dict[str, dict]] = None,
 ) -> Tuple[Path, int, int]:
     """اعادة تمسية محتوى المجلد
 
@@ -150,182 +160,526 @@ def dir_renamer(
         is_root (Optional[bool], optional): هل هذا المجلد الاساسي المراد تسمية محتوياته. Defaults to False.
         save_data (Optional[bool], optional): تحديد ما إذا كنت تريد حفظ الاسماء القديمة في ملف. Defaults to False.
         data_filename (Optional[str], optional): اسم الملف المراد حفظ الاسماء فيه ان وجد. Defaults to "rename_data.json".
+        snapshot (Optional[TreeSnapshot], optional): صورة المجلدات المشتركة بين جميع المجلدات الفرعية، يتم انشائها اذ لم تعطى. Defaults to None.
+        executor (Optional[Executor], optional): يتم اعادة تسمية المجلدات الفرعية بالتوازي باستخدامه ان وجد. Defaults to None.
+        reporter (Optional[Reporter], optional): يتم ارسال النتائج اليه بدلاً من طباعتها مباشرة. Defaults to None.
+        store (Optional[SQLiteStore], optional): يتم حفظ الاسماء فيه ان وجد. Defaults to None.
+        data_format (Optional[DataFormat], optional): صيغة ملف الاسماء، يتم استخدام json اذ لم تعطى. Defaults to None.
+        journal (Optional[Journal], optional): يتم تسجيل كل اعادة تسمية فيه قبل تنفيذها. Defaults to None.
+        resumed (Optional[Dict[str, List[dict]]], optional): عمليات السجل الخاصة بالمجلدات التي توقفت قبل الانتهاء منها، يتم اكمالها بدلاً من البدء من جديد. Defaults to None.
+        run (Optional[int], optional): رقم العملية في قاعدة البيانات عند الاكمال، يتم بدء عملية جديدة اذ لم يعطى. Defaults to None.
+        stats (Optional[Stats], optional): يتم قياس مدة كل مرحلة وعدد العمليات فيه ان وجد. Defaults to None.
+        incremental (Optional[bool], optional): اعادة تسمية العناصر الجديدة منذ اخر مرة فقط، باستخدام ملفات البيانات. Defaults to False.
+        entry_filter (Optional[EntryFilter], optional): تحديد العناصر التي يتم اعادة تسميتها والمجلدات التي يتم المرور عليها. Defaults to None.
+        states (Optional[Dict[str, dict]], optional): حالات المجلدات التي ليس لها ملف بيانات مع incremental، يتم انشائها اذ لم تعطى. Defaults to None.
 
     المخرجات:
         Tuple[Path, int, int]: المسار الجديد الخاص بالمجلد، عدد المجلدات التي تم اعادة تسميتها، عدد الملفات التي تم اعادة تسميتها
     """
-    dirs_name: List[dict] = []
-    files_name: List[dict] = []
+    return _start_dir_renamer(
+        directory,
+        random=random,
+        length=length,
+        is_root=is_root,
+        save_data=save_data,
+        data_filename=data_filename,
+        snapshot=snapshot,
+        executor=executor,
+        reporter=reporter,
+        store=store,
+        data_format=data_format,
+        journal=journal,
+        resumed=resumed,
+        run=run,
+        stats=stats,
+        incremental=incremental,
+        entry_filter=entry_filter,
+        states=states,
+    )()
+
+
+def _start_dir_renamer(
+    directory: Path,
+    random: bool,
+    length: int,
+    is_root: bool,
+    save_data: bool,
+    data_filename: str,
+    snapshot: Optional["TreeSnapshot"],
+    executor: Optional[Executor],
+    reporter: Optional["Reporter"] = None,
+    store: Optional["SQLiteStore"] = None,
+    data_format: Optional["DataFormat"] = None,
+    journal: Optional["Journal"] = None,
+    resumed: Optional[Dict[str, List[dict]]] = None,
+    run: Optional[int] = None,
+    stats: Optional["Stats"] = None,
+    incremental: Optional[bool] = False,
+    entry_filter: Optional["EntryFilter"] = None,
+    depth: Optional[int] = 0,
+    states: Optional[Dict[str, dict]] = None,
+) -> Callable[[], Tuple[Path, int, int]]:
+    """بدء اعادة تسمية محتوى المجلد، وارجاع دالة تكمل العمل وتطبع النتائج
+
+    كل مجلد يتم اعادة تسمية محتوياته (الملفات والمجلدات الفرعية) في مهمة واحدة،
+    لذلك لا تتنافس المهام على الاسماء. عند وجود executor يتم ارسال مهام
+    المجلدات الفرعية اليه مباشرة، اما الطباعة فتتم في الخيط الذي يستدعي
+    الدالة المرجعة وبنفس ترتيب التنفيذ المتسلسل (المجلد ثم مجلداته الفرعية).
+
+    المعطيات:
+        مثل dir_renamer
+        depth (Optional[int], optional): عمق المجلد بالنسبة للمجلد الاساسي عند الاكمال. Defaults to 0.
+
+    المخرجات:
+        Callable[[], Tuple[Path, int, int]]: دالة ترجع المسار الجديد الخاص بالمجلد، عدد المجلدات، عدد الملفات
+    """
     total_dirs: int = 0
-    total_files: int = 0
+    if snapshot is None:
+        snapshot = TreeSnapshot()
+    if data_format is None:
+        data_format = DataFormat.json
+    if states is None:
+        states = {}
 
-    new_dir_name = get_dir_name(
-        start_with="", root=directory.parent.as_posix(), random=random, length=length
-    )
-    if is_root:
-        new_directory = directory
-    else:
-        new_directory = directory.rename(directory.with_name(new_dir_name))
-        total_dirs += 1
-    new_directory_path = new_directory.as_posix()
-    _, dirs, files = get_dir_content(new_directory_path)
-
-    for file in files:
-        file = Path(os.path.join(new_directory_path, file))
-        file_data = file_renamer(file)
-        files_name.append(file_data)
-        total_files += 1
-
-    for sub_directory in dirs:
-        sub_directory = Path(os.path.join(new_directory_path, sub_directory))
-        new_sub_directory, total_dirs_, total_files_ = dir_renamer(
-            sub_directory,
+    def rename_content(directory: Path, depth: int) -> tuple:
+        directory_path = directory.as_posix()
+        # يتم حفظ الاسماء في الذاكرة فقط اذ كانت مطلوبة بعد الانتهاء من المجلد،
+        # والا يتم طباعتها مباشرة
+        keep_names = executor is not None
+        names: List[dict] = []
+        # المجلدات الفرعية التي تمت قبل التوقف يتم اكمالها بشكل مستقل، لذلك
+        # لا يتم اضافتها هنا
+        descend: List[str] = []
+        count = 0
+        dirs_count = 0
+        for event in rename_directory(
+            directory,
             random=random,
             length=length,
             save_data=save_data,
             data_filename=data_filename,
+            data_format=data_format,
+            snapshot=snapshot,
+            store=store,
+            run=run,
+            journal=journal,
+            resumed=resumed,
+            stats=stats,
+            incremental=incremental,
+            descend=descend,
+            entry_filter=entry_filter,
+            depth=depth,
+            states=states,
+        ):
+            if keep_names:
+                names.append({"old": event.old_name, "new": event.new_name})
+            else:
+                if not count:
+                    _timed(stats, "output", print_dir_path, directory_path, reporter)
+                _timed(
+                    stats,
+                    "output",
+                    print_old_new_name,
+                    event.old_name,
+                    event.new_name,
+                    reporter,
+                )
+            count += 1
+            if event.kind == DIRECTORY:
+                dirs_count += 1
+        sub_directories = [
+            (
+                executor.submit(rename_content, Path(sub_directory), depth + 1)
+                if executor is not None
+                else (Path(sub_directory), depth + 1)
+            )
+            for sub_directory in descend
+        ]
+        return directory, names, count, dirs_count, sub_directories
+
+    def finish(content: tuple) -> Tuple[int, int]:
+        directory, names, count, dirs_count, sub_directories = content
+        if names:
+            _timed(stats, "output", print_dir_path, directory.as_posix(), reporter)
+        for file in names:
+            old_name, new_name = file["old"], file["new"]
+            _timed(stats, "output", print_old_new_name, old_name, new_name, reporter)
+        if reporter is not None:
+            reporter.step()
+
+        total_dirs: int = dirs_count
+        total_files: int = count - dirs_count
+        for sub_directory in sub_directories:
+            total_dirs_, total_files_ = finish(
+                sub_directory.result()
+                if executor is not None
+                else rename_content(*sub_directory)
+            )
+            total_dirs += total_dirs_
+            total_files += total_files_
+        return total_dirs, total_files
+
+    if is_root:
+        new_directory = directory
+    else:
+        new_dir_name = _rename_free(
+            directory.parent.as_posix(),
+            directory.name,
+            _top_index(random, length),
+            snapshot,
+            is_dir=True,
+            journal=journal,
         )
-        total_dirs += total_dirs_
-        total_files += total_files_
-        dirs_name.append(
-            {"old_name": sub_directory.name, "new_name": new_sub_directory.name}
+        new_directory = directory.with_name(new_dir_name)
+        total_dirs += 1
+    if store is not None and run is None:
+        run = store.start_run(new_directory)
+        if journal is not None:
+            journal.run(run, new_directory.as_posix())
+    content = (
+        executor.submit(rename_content, new_directory, depth)
+        if executor is not None
+        else None
+    )
+
+    def wait() -> Tuple[Path, int, int]:
+        total_dirs_, total_files = finish(
+            content.result()
+            if content is not None
+            else rename_content(new_directory, depth)
         )
+        return new_directory, total_dirs + total_dirs_, total_files
 
-    names = dirs_name + files_name
-    if any(get_dir_content(new_directory.as_posix())[1:]):
-        print_dir_path(new_directory.as_posix())
+    return wait
 
-        if save_data:
-            with open(
-                os.path.join(new_directory.as_posix(), data_filename),
-                mode="w",
-                encoding="utf-8",
-            ) as f:
-                obj = {
-                    "frenamerVersion": version,
-                    "names": names,
-                }
-                dump(obj, f, indent=4)
 
-    for file in names:
-        old_name, new_name = file.values()
-        print_old_new_name(old_name, new_name)
+def unrename_from_json(
+    json_file: Path,
+    delete: bool,
+    snapshot: Optional["TreeSnapshot"] = None,
+    reporter: Optional["Reporter"] = None,
+    index: Optional[Union["RenameDataIndex", "RenameArchive"]] = None,
+    journal: Optional["Journal"] = None,
+    skip_done: Optional[bool] = False,
+    stats: Optional["Stats"] = None,
+) -> Tuple[int, int]:
+    """اعادة تمسية الملفات الموجودة في ملف الجيسون
 
-    return new_directory, total_dirs, total_files
+    المعطيات:
+        json_file (Path): ملف الجيسون
+        delete (bool): حذف ملف الجيسون بعد اعادة التسمية ام لا
+        snapshot (Optional[TreeSnapshot], optional): صورة المجلدات التي يتم تحديثها. Defaults to None.
+        reporter (Optional[Reporter], optional): يتم ارسال النتائج اليه بدلاً من طباعتها مباشرة. Defaults to None.
+        index (Optional[Union[RenameDataIndex, RenameArchive]], optional): فهرس ملفات الجيسون او الارشيف، يتم جلب البيانات منه بدلاً من قراءة الملف. Defaults to None.
+        journal (Optional[Journal], optional): يتم تسجيل كل اعادة تسمية فيه قبل تنفيذها. Defaults to None.
+        skip_done (Optional[bool], optional): تجاهل العناصر التي تم التراجع عنها مسبقاً، عند اكمال عملية متوقفة. Defaults to False.
+        stats (Optional[Stats], optional): يتم قياس مدة كل مرحلة وعدد العمليات فيه. Defaults to None.
 
+    المخرجات:
+        Tuple[int, int]: اجمالي المجلدات التي تم اعادة تسميتها اجمالي الملفات التي تم اعادة تسميتها
+    """
+    total_dirs = 0
+    total_files = 0
+
+    def on_message(text: str, level: str) -> None:
+        _print_message(
+            text,
+            fg=typer.colors.YELLOW if level == "warning" else typer.colors.RED,
+            reporter=reporter,
+        )
 
-def get_json_files(directory: Path, json_filename: str) -> List[Optional[str]]:
-    """ارجاع جميع ملفات المطابقة لاسم ملف الجيسون في محتوى المجلد
+    for event in unrename_data_file(
+        json_file,
+        delete=delete,
+        snapshot=snapshot,
+        index=index,
+        journal=journal,
+        skip_done=skip_done,
+        stats=stats,
+        on_message=on_message,
+    ):
+        if event.kind == DIRECTORY:
+            total_dirs += 1
+        else:
+            total_files += 1
+        _timed(
+            stats,
+            "output",
+            print_old_new_name,
+            event.old_name,
+            event.new_name,
+            reporter,
+        )
+    return total_dirs, total_files
+
+
+def unrename_from_store(
+    store: "SQLiteStore",
+    directory: Path,
+    delete: bool,
+    reporter: Optional["Reporter"] = None,
+    journal: Optional["Journal"] = None,
+    skip_done: Optional[bool] = False,
+    stats: Optional["Stats"] = None,
+) -> Tuple[int, int]:
+    """اعادة تسمية محتوى المجلد باستخدام الاسماء المحفوظة في قاعدة البيانات
+
+    لا يتم المرور على المجلد للبحث عن ملفات الجيسون، ولا يتم قراءة نوع العنصر
+    بعد اعادة تسميته لانه محفوظ مع الاسماء.
 
     المعطيات:
-        directory (Path): المجلد المراد استخراج منه جميع الملفات المتطايقة مع اسم ملفات الجيسون
-        json_filename (str): اسم ملف الجيسون
+        store (SQLiteStore): قاعدة البيانات
+        directory (Path): المجلد المراد التراجع عن اعادة تسمية محتوياته
+        delete (bool): حذف الاسماء من قاعدة البيانات بعد التراجع ام لا
+        reporter (Optional[Reporter], optional): يتم ارسال النتائج اليه بدلاً من طباعتها مباشرة. Defaults to None.
+        journal (Optional[Journal], optional): يتم تسجيل كل اعادة تسمية فيه قبل تنفيذها. Defaults to None.
+        skip_done (Optional[bool], optional): تجاهل العناصر التي تم التراجع عنها مسبقاً، عند اكمال عملية متوقفة. Defaults to False.
+        stats (Optional[Stats], optional): يتم قياس مدة كل مرحلة وعدد العمليات فيه. Defaults to None.
 
     المخرجات:
-        List[Optional[str]]: ملفات الجيسون الموجودة في المجلد
+        Tuple[int, int]: اجمالي المجلدات التي تم اعادة تسميتها اجمالي الملفات التي تم اعادة تسميتها
     """
-    return [
-        os.path.join(root, json_filename)
-        for root, _, files in os.walk(directory.as_posix(), topdown=False)
-        if json_filename in files
-    ]
+    total_dirs = 0
+    total_files = 0
+    for run in store.runs(directory):
+        current_parent = None
+        for event in unrename_run(
+            store,
+            run,
+            delete=delete,
+            journal=journal,
+            skip_done=skip_done,
+            stats=stats,
+        ):
+            if event.parent != current_parent:
+                if current_parent is not None and reporter is not None:
+                    reporter.step()
+                current_parent = event.parent
+                _timed(
+                    stats,
+                    "output",
+                    print_dir_path,
+                    store.unrename_path(current_parent, run),
+                    reporter,
+                )
+            if event.kind == DIRECTORY:
+                total_dirs += 1
+            else:
+                total_files += 1
+            _timed(
+                stats,
+                "output",
+                print_old_new_name,
+                event.old_name,
+                event.new_name,
+                reporter,
+            )
+        if current_parent is not None and reporter is not None:
+            reporter.step()
+    return total_dirs, total_files
 
 
-def unrename_from_json(json_file: Path, delete: bool) -> Tuple[int, int]:
-    """اعادة تمسية الملفات الموجودة في ملف الجيسون
+def rollback_from_journal(
+    journal_file: Path,
+    store: Optional["SQLiteStore"] = None,
+    reporter: Optional["Reporter"] = None,
+) -> Tuple[int, int]:
+    """التراجع عن عملية متوقفة باستخدام سجل العمليات
+
+    يتم قراءة السجل من النهاية والتراجع عن كل عملية تم تنفيذها، لذلك يتم
+    التراجع بعكس ترتيب التنفيذ. عند التراجع عن اعادة التسمية يتم حذف ملفات
+    البيانات التي تم كتابتها، وعند التراجع عن unrename يتم اعادة كتابة ملفات
+    البيانات التي تم حذفها من السجل نفسه.
 
     المعطيات:
-        json_file (Path): ملف الجيسون
-        delete (bool): حذف ملف الجيسون بعد اعادة التسمية ام لا
+        journal_file (Path): سجل العمليات
+        store (Optional[SQLiteStore], optional): قاعدة البيانات المستخدمة في العملية ان وجدت. Defaults to None.
+        reporter (Optional[Reporter], optional): يتم ارسال النتائج اليه بدلاً من طباعتها مباشرة. Defaults to None.
 
     المخرجات:
         Tuple[int, int]: اجمالي المجلدات التي تم اعادة تسميتها اجمالي الملفات التي تم اعادة تسميتها
     """
     total_dirs = 0
     total_files = 0
-    path = json_file.parent
-    with open(json_file, "r") as f:
-        rename_data = load(f)
-        if "frenamerVersion" in rename_data and "names" in rename_data:
-            if rename_data.get("frenamerVersion") != version:
-                typer.echo(
-                    typer.style(
-                        f"Warning The current frenamer version ({version}) does not match the frenamer version ({rename_data.get('frenamerVersion')}) in which the files were renamed: {json_file.as_posix()}",
+    header = read_journal_header(journal_file)
+    options = header["options"]
+    # ملفات البيانات التي تمت كتابتها اثناء اعادة التسمية
+    data_filenames = (
+        (options["data_filename"], options["data_filename"] + ".part")
+        if header["command"] == "rename" and options["save_data"]
+        else ()
+    )
+    seen = set()
+    current_parent = None
+    # المجلد -> ملف البيانات الذي تتم اعادة كتابته فيه، مع --jobs تكون عمليات
+    # المجلدات المختلفة متداخلة في السجل، لذلك يبقى ملف كل مجلد مفتوحاً حتى النهاية
+    writers: Dict[str, "RenameDataWriter"] = {}
+    # عمليات اعادة التسمية التي لم تنفذ لان الاسم الجديد كان موجوداً
+    failed = set()
+    try:
+        for record in read_journal_reversed(journal_file):
+            if "failed" in record:
+                failed.add((record["failed"], record["o"], record["n"]))
+            elif "p" in record:
+                if failed:
+                    key = (record["p"], record["o"], record["n"])
+                    if key in failed:
+                        failed.discard(key)
+                        continue
+                parent = record["p"]
+                if parent != current_parent:
+                    current_parent = parent
+                    print_dir_path(parent, reporter)
+                    if parent not in seen:
+                        seen.add(parent)
+                        for data_filename in data_filenames:
+                            data_path = os.path.join(parent, data_filename)
+                            if os.path.lexists(data_path):
+                                os.remove(data_path)
+                new_path = os.path.join(parent, record["n"])
+                old_path = os.path.join(parent, record["o"])
+                if os.path.lexists(new_path) and not os.path.lexists(old_path):
+                    os.rename(new_path, old_path)
+                    if record["d"]:
+                        total_dirs += 1
+                    else:
+                        total_files += 1
+                    print_old_new_name(record["n"], record["o"], reporter)
+                writer = writers.get(parent)
+                if writer is not None:
+                    writer.write(
+                        {"old_name": record["n"], "new_name": record["o"]}
+                        if record["d"]
+                        else {"old": record["n"], "new": record["o"]}
+                    )
+            elif "delete" in record:
+                parent = os.path.dirname(record["delete"])
+                if parent in writers:
+                    writers.pop(parent).close()
+                # الاسماء بعكس ترتيب التراجع، اي بنفس ترتيب اعادة التسمية
+                writers[parent] = RenameDataWriter(record["delete"])
+                current_parent = None
+            elif "run" in record and store is not None:
+                store.finish_run(record["run"], delete=True)
+            elif "finished" in record and store is not None:
+                if record["deleted"]:
+                    _print_message(
+                        f"Warning The rename data of the run {record['finished']} was deleted from {store.path}",
                         fg=typer.colors.YELLOW,
+                        reporter=reporter,
                     )
-                )
-            for names in rename_data.get("names"):
-                old_name, new_name = [
-                    Path(os.path.join(path.as_posix(), name)) for name in names.values()
-                ]
-                new_name.rename(old_name)
-                if old_name.is_dir():
-                    total_dirs += 1
                 else:
-                    total_files += 1
-                print_old_new_name(new_name.name, old_name.name)
-        else:
-            typer.echo(
-                typer.style(
-                    f"Invalid frenamer format: {json_file.as_posix()}",
-                    fg=typer.colors.RED,
-                )
-            )
-    if delete:
-        os.remove(json_file.as_posix())
+                    store.reopen_run(record["finished"])
+    finally:
+        for writer in writers.values():
+            writer.close()
     return total_dirs, total_files
 
 
-def get_name_from_json(dir_name: str, json_file: Path) -> str:
+def get_name_from_json(
+    dir_name: str,
+    json_file: Path,
+    index: Optional[Union["RenameDataIndex", "RenameArchive"]] = None,
+) -> str:
     """جلب اسم المجلد القديم
 
     المعطيات:
         dir_name (str): اسم المجلد الجديد
         json_file (Path): ملف الجيسون المراد استخراج اسم المجلد القديم منه
+        index (Optional[Union[RenameDataIndex, RenameArchive]], optional): فهرس ملفات الجيسون او الارشيف، يتم البحث فيه بدلاً من قراءة الملف، الارشيف يفك ضغط بيانات المجلد فقط. Defaults to None.
 
     المخرجات:
         str: اسم المجلد القديم
     """
-    names: List[dict] = loads(json_file.read_bytes()).get("names")
-    return list(filter(lambda name_dct: name_dct.get("new_name") == dir_name, names))[
-        0
-    ].get("old_name")
+    if index is not None:
+        index.get(json_file)
+        return index.old_name(json_file.parent, dir_name)
+    return RenameDataFile(json_file).dir_names().get(dir_name)
 
 
-def get_unrename_dir(rename_dir: Path, json_files: List[Path], root_name: str) -> str:
+def get_unrename_dir(
+    rename_dir: Path,
+    json_files: List[Path],
+    root_name: str,
+    index: Optional[Union["RenameDataIndex", "RenameArchive"]] = None,
+) -> str:
     """جلب المسار القديم الخاص بالمسار الجديد
 
     Args:
         rename_dir (Path): المسار الجديد المراد جلب مساره القديم
         json_files (List[Path]): ملفات الجيسون التي سوف يتم استخراج الاسماء القديمة منها
         root_name (str): اسم المجلد الذي يتم اعادة تسمية محتوياته
+        index (Optional[Union[RenameDataIndex, RenameArchive]], optional): فهرس ملفات الجيسون او الارشيف، يتم بناءه من json_files اذ لم يعطى. Defaults to None.
 
     Returns:
         str: المسار القديم
     """
-    paths: List[Path] = list(
-        map(
-            lambda json_file: (
-                json_file.parent,
-                json_file.parent.with_name(json_file.name),
-            ),
-            json_files,
+    if index is None:
+        index = RenameDataIndex(json_files)
+    return index.unrename_path(rename_dir)
+
+
+def _open_store(
+    spec: Optional[str], directories: Optional[List[Path]] = None
+) -> Optional["SQLiteStore"]:
+    """فتح قاعدة البيانات المعطاة في خيار --store
+
+    المعطيات:
+        spec (Optional[str]): نوع قاعدة البيانات ومسارها، مثل 'sqlite:rename_data.db'
+        directories (Optional[List[Path]], optional): المجلدات التي سوف يتم اعادة تسمية محتوياتها، لا يمكن ان تكون قاعدة البيانات داخلها. Defaults to None.
+
+    المخرجات:
+        Optional[SQLiteStore]: قاعدة البيانات، او None اذ لم يتم اعطائها
+    """
+    if spec is None:
+        return None
+    try:
+        store_path = Path(parse_store(spec)).resolve()
+        if any(directory in store_path.parents for directory in directories or ()):
+            raise ValueError("The store can not be inside the renamed directories.")
+        return open_store(spec)
+    except (ValueError, OSError, sqlite3.Error) as err:
+        raise typer.BadParameter(str(err), param_hint="'--store'")
+
+
+def _open_archive(
+    archive_file: Optional[Path],
+    directories: List[Path],
+    store_spec: Optional[str] = None,
+    journal_file: Optional[Path] = None,
+    exclude: Optional[List[str]] = None,
+    max_depth: Optional[int] = None,
+) -> Optional["RenameArchive"]:
+    """فتح الارشيف المعطى في خيار --archive
+
+    المعطيات:
+        archive_file (Optional[Path]): مسار الارشيف
+        directories (List[Path]): المجلدات التي سوف يتم التراجع عن اعادة تسمية محتوياتها، يجب ان يكون مجلد واحد
+        مثل خيارات unrename التي لا يمكن استخدامها مع الارشيف
+
+    المخرجات:
+        Optional[RenameArchive]: الارشيف، او None اذ لم يتم اعطائه
+    """
+    if archive_file is None:
+        return None
+    if store_spec is not None or journal_file is not None:
+        raise typer.BadParameter(
+            "--archive can not be used with --store or --journal.",
+            param_hint="'--archive'",
         )
-    )
-    unrename_dir = ""
-    current_path = ""
-    for part in rename_dir.parts:
-        part_ = part
-        if part != root_name:
-            path = os.path.join(current_path, part)
-            if path in list(map(lambda tup: tup[0].as_posix(), paths)):
-                part_ = get_name_from_json(
-                    part,
-                    list(filter(lambda tup: tup[0].as_posix() == path, paths))[0][1],
-                )
-        unrename_dir = os.path.join(unrename_dir, part_)
-        current_path = os.path.join(current_path, part)
-    return unrename_dir
+    if exclude or max_depth is not None:
+        raise typer.BadParameter(
+            "The archive has the JSON files of all the directories, it can not be used with --exclude or --max-depth.",
+            param_hint="'--archive'",
+        )
+    if len(directories) != 1:
+        raise typer.BadParameter(
+            "The archive belongs to a single directory.", param_hint="'--archive'"
+        )
+    try:
+        return RenameArchive(archive_file, directories[0])
+    except (ValueError, OSError) as err:
+        raise typer.BadParameter(str(err), param_hint="'--archive'")
 
 
 def version_callback(value: bool) -> None:
@@ -354,8 +708,8 @@ def callback(
 @app.command()
 def rename(
     directories: List[Path] = typer.Argument(
-        ...,
-        help="Directories whose contents you want to rename.",
+        None,
+        help="Directories whose contents you want to rename, not needed with --plan-in.",
         exists=True,
         dir_okay=True,
         file_okay=False,
@@ -365,7 +719,10 @@ def rename(
         False, "--random", "-r", help="Rename with random names, or alphabetically."
     ),
     length: Optional[int] = typer.Option(
-        10, "--length", "-l", help="Random name length."
+        10,
+        "--length",
+        "-l",
+        help="Random name length, raised when it is too short for the number of entries in a directory.",
     ),
     save_rename_data: Optional[bool] = typer.Option(
         False,
@@ -379,36 +736,476 @@ def rename(
         "-f",
         help="The name of the json file in which the directory names are to be saved.",
     ),
+    data_format: DataFormat = typer.Option(
+        DataFormat.json.value,
+        "--data-format",
+        help="Format of the rename data files, jsonl is written while renaming and read back line by line.",
+    ),
+    store_spec: Optional[str] = typer.Option(
+        None,
+        "--store",
+        help="Keep the rename data in a single database instead of a JSON file in every directory, e.g. sqlite:rename_data.db",
+    ),
+    incremental: Optional[bool] = typer.Option(
+        False,
+        "--incremental",
+        help="Only rename the entries added since the last --incremental run, and append them to the rename data. Implies --save-data and --data-format jsonl.",
+    ),
+    include: Optional[List[str]] = typer.Option(
+        None,
+        "--include",
+        metavar="PATTERN",
+        help="Only rename the entries whose name matches this glob, can be repeated. Other directories are still walked.",
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None,
+        "--exclude",
+        metavar="PATTERN",
+        help="Do not rename the entries whose name matches this glob, and do not walk such directories, can be repeated. e.g. --exclude .git --exclude node_modules",
+    ),
+    max_depth: Optional[int] = typer.Option(
+        None,
+        "--max-depth",
+        min=1,
+        help="Do not rename entries deeper than this, 1 is the content of the directory itself.",
+    ),
+    files_only: Optional[bool] = typer.Option(
+        False, "--files-only", help="Rename the files only, the directories are walked."
+    ),
+    dirs_only: Optional[bool] = typer.Option(
+        False, "--dirs-only", help="Rename the directories only."
+    ),
+    dry_run: Optional[bool] = typer.Option(
+        False,
+        "--dry-run",
+        help="Print the new names without renaming anything.",
+    ),
+    plan_out: Optional[Path] = typer.Option(
+        None,
+        "--plan-out",
+        help="With --dry-run, save the plan to this file so it can be run later with --plan-in.",
+        dir_okay=False,
+        resolve_path=True,
+    ),
+    plan_in: Optional[Path] = typer.Option(
+        None,
+        "--plan-in",
+        help="Run a plan saved with --plan-out, the directories and the rename data options are taken from it.",
+        exists=True,
+        dir_okay=False,
+        resolve_path=True,
+    ),
+    jobs: Optional[int] = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of threads renaming independent directories at the same time.",
+    ),
+    quiet: Optional[bool] = typer.Option(
+        False, "--quiet", "-q", help="Do not print the renamed entries."
+    ),
+    progress: Optional[bool] = typer.Option(
+        False,
+        "--progress",
+        "-p",
+        help="Show a single progress line instead of the renamed entries.",
+    ),
+    log_file: Optional[Path] = typer.Option(
+        None,
+        "--log",
+        help="File in which all the renamed entries are written.",
+        dir_okay=False,
+        resolve_path=True,
+    ),
+    journal_file: Optional[Path] = typer.Option(
+        None,
+        "--journal",
+        help="Write every operation to this journal before doing it, so an interrupted run can be resumed or rolled back.",
+        dir_okay=False,
+        resolve_path=True,
+    ),
+    print_stats: Optional[bool] = typer.Option(
+        False,
+        "--stats",
+        help="Print the time of every phase, the syscall counters and the slowest directories as JSON to stderr.",
+    ),
+    stats_file: Optional[Path] = typer.Option(
+        None,
+        "--stats-file",
+        help="Write the --stats JSON to this file instead of stderr.",
+        dir_okay=False,
+        resolve_path=True,
+    ),
 ) -> None:
     """
     Rename directories with random names or alphabetical order.
     """
     start_time = time()
+    rename_data_filename = f"{rename_data_filename.split('.')[0]}.json"
+    if dry_run or plan_in is not None:
+        option = "'--dry-run'" if dry_run else "'--plan-in'"
+        if dry_run and plan_in is not None:
+            raise typer.BadParameter(
+                "--dry-run and --plan-in can not be used together.",
+                param_hint=option,
+            )
+        if store_spec is not None or journal_file is not None or incremental:
+            raise typer.BadParameter(
+                "plans use the rename data files, they can not be used with --store, --journal or --incremental.",
+                param_hint=option,
+            )
+    if plan_out is not None and not dry_run:
+        raise typer.BadParameter(
+            "--plan-out needs --dry-run.", param_hint="'--plan-out'"
+        )
+    if plan_in is not None:
+        if directories:
+            raise typer.BadParameter(
+                "the directories are taken from the plan.",
+                param_hint="'DIRECTORIES'",
+            )
+        _run_plan(
+            plan_in,
+            reporter=Reporter(quiet=quiet, progress=progress, log_file=log_file),
+            start_time=start_time,
+            stats=Stats() if print_stats or stats_file is not None else None,
+            stats_file=stats_file,
+        )
+        return
+    if not directories:
+        raise typer.BadParameter("Missing argument.", param_hint="'DIRECTORIES...'")
+    if incremental:
+        if store_spec is not None or journal_file is not None:
+            raise typer.BadParameter(
+                "--incremental uses the rename data files, it can not be used with --store or --journal.",
+                param_hint="'--incremental'",
+            )
+        save_rename_data = True
+        data_format = DataFormat.jsonl
+    if files_only and dirs_only:
+        raise typer.BadParameter(
+            "--files-only and --dirs-only can not be used together.",
+            param_hint="'--files-only'",
+        )
+    entry_filter = _entry_filter(
+        include=include,
+        exclude=exclude,
+        max_depth=max_depth,
+        files=not dirs_only,
+        dirs=not files_only,
+    )
+    if dry_run:
+        plan = build_plan(
+            directories,
+            random=random,
+            length=length,
+            entry_filter=entry_filter,
+            options={
+                "save_data": save_rename_data,
+                "data_filename": rename_data_filename,
+                "data_format": data_format.value,
+            },
+        )
+        if plan_out is not None:
+            plan.save(plan_out)
+        with Reporter(quiet=quiet, progress=progress, log_file=log_file) as reporter:
+            _print_plan(plan, reporter)
+        typer.echo(
+            f"\nPlanning {sum(plan.kinds)} directories, {len(plan) - sum(plan.kinds)} files, in {round(time() - start_time, 4)}"
+        )
+        if plan_out is not None:
+            typer.echo(
+                f"The plan is saved in {typer.style(plan_out.as_posix(), fg=typer.colors.BLUE)}"
+            )
+        return
+    store = _open_store(store_spec, directories)
+    journal = _open_journal(
+        journal_file,
+        directories,
+        command="rename",
+        options={
+            "random": random,
+            "length": length,
+            "save_data": save_rename_data,
+            "data_filename": rename_data_filename,
+            "data_format": data_format.value,
+            "store": store_spec,
+            "jobs": jobs,
+            "filter": entry_filter.options() if entry_filter is not None else None,
+        },
+    )
+    stats = Stats() if print_stats or stats_file is not None else None
+    with journal or nullcontext():
+        total_dirs, total_files = _rename(
+            directories,
+            random=random,
+            length=length,
+            save_rename_data=save_rename_data,
+            rename_data_filename=rename_data_filename,
+            data_format=data_format,
+            store=store,
+            jobs=jobs,
+            reporter=Reporter(quiet=quiet, progress=progress, log_file=log_file),
+            journal=journal,
+            stats=stats,
+            incremental=incremental,
+            entry_filter=entry_filter,
+        )
+    _print_rename_summary(
+        start_time,
+        total_dirs,
+        total_files,
+        store=store,
+        rename_data_filename=rename_data_filename if save_rename_data else None,
+    )
+    if stats is not None:
+        stats.write(stats_file or "-")
+
+
+def _entry_filter(
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    max_depth: Optional[int] = None,
+    files: Optional[bool] = True,
+    dirs: Optional[bool] = True,
+) -> Optional["EntryFilter"]:
+    """بناء الفلتر من خيارات --include و --exclude و --max-depth وغيرها
+
+    المخرجات:
+        Optional[EntryFilter]: الفلتر، او None اذ لم يتم اعطاء اي خيار منها
+    """
+    entry_filter = EntryFilter(
+        include=include, exclude=exclude, max_depth=max_depth, files=files, dirs=dirs
+    )
+    return entry_filter if entry_filter.active else None
+
+
+def _open_journal(
+    journal_file: Optional[Path],
+    directories: List[Path],
+    command: str,
+    options: dict,
+) -> Optional["Journal"]:
+    """انشاء سجل العمليات المعطى في خيار --journal
+
+    المعطيات:
+        journal_file (Optional[Path]): مسار السجل
+        directories (List[Path]): المجلدات التي سوف يتم العمل عليها، لا يمكن ان يكون السجل داخلها
+        command (str): اسم الامر، rename او unrename
+        options (dict): خيارات الامر التي سوف يتم استخدامها عند الاكمال او التراجع
+
+    المخرجات:
+        Optional[Journal]: السجل، او None اذ لم يتم اعطائه
+    """
+    if journal_file is None:
+        return None
+    if any(directory in journal_file.parents for directory in directories):
+        raise typer.BadParameter(
+            "The journal can not be inside the renamed directories.",
+            param_hint="'--journal'",
+        )
+    try:
+        return Journal(
+            journal_file,
+            header={
+                "command": command,
+                "directories": [directory.as_posix() for directory in directories],
+                "options": options,
+            },
+        )
+    except OSError as err:
+        raise typer.BadParameter(str(err), param_hint="'--journal'")
+
+
+def _rename(
+    directories: List[Path],
+    random: bool,
+    length: int,
+    save_rename_data: bool,
+    rename_data_filename: str,
+    data_format: "DataFormat",
+    store: Optional["SQLiteStore"],
+    jobs: int,
+    reporter: "Reporter",
+    journal: Optional["Journal"] = None,
+    state: Optional["JournalState"] = None,
+    stats: Optional["Stats"] = None,
+    incremental: Optional[bool] = False,
+    entry_filter: Optional["EntryFilter"] = None,
+) -> Tuple[int, int]:
+    """اعادة تسمية محتوى المجلدات، مشتركة بين rename و resume
+
+    المعطيات:
+        مثل خيارات rename
+        journal (Optional[Journal], optional): سجل العمليات. Defaults to None.
+        state (Optional[JournalState], optional): حالة العملية المتوقفة عند الاكمال. Defaults to None.
+        stats (Optional[Stats], optional): يتم قياس مدة كل مرحلة وعدد العمليات فيه. Defaults to None.
+        incremental (Optional[bool], optional): اعادة تسمية العناصر الجديدة فقط. Defaults to False.
+        entry_filter (Optional[EntryFilter], optional): تحديد العناصر التي يتم اعادة تسميتها والمجلدات التي يتم المرور عليها. Defaults to None.
+
+    المخرجات:
+        Tuple[int, int]: اجمالي المجلدات التي تم اعادة تسميتها اجمالي الملفات التي تم اعادة تسميتها
+    """
     total_dirs: int = 0
     total_files: int = 0
-    rename_data_filename = f"{rename_data_filename.split('.')[0]}.json"
-    for directory in directories:
-        _, total_dirs_, total_files_ = dir_renamer(
-            directory,
+    # يتم اغلاق واصفات المجلدات بعد الانتهاء من جميع المهام، وحفظ ارقام inode
+    # مع الاسماء في ملفات البيانات
+    snapshot = TreeSnapshot(dir_fds=True, inodes=save_rename_data and store is None)
+    # مع --incremental لا يتم قراءة المجلدات التي لم تتغير، لذلك لا يتم حساب عددها
+    if reporter.progress and state is None and not incremental:
+        # يتم حفظ المجلدات في الصورة لذلك لا يتم قرائتها مرة اخرى
+        reporter.total = sum(
+            1
+            for directory in directories
+            for _ in snapshot.walk(
+                directory,
+                prune=entry_filter.prunes if entry_filter is not None else None,
+            )
+        )
+    with store or nullcontext(), reporter, snapshot, (
+        ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else nullcontext()
+    ) as executor:
+        start = partial(
+            _start_dir_renamer,
             random=random,
             length=length,
             is_root=True,
-            save_data=save_rename_data,
+            # قاعدة البيانات بدلاً من ملفات الجيسون
+            save_data=save_rename_data and store is None,
             data_filename=rename_data_filename,
+            snapshot=snapshot,
+            executor=executor,
+            reporter=reporter,
+            store=store,
+            data_format=data_format,
+            journal=journal,
+            resumed=state.pending if state is not None else None,
+            stats=stats,
+            incremental=incremental,
+            entry_filter=entry_filter,
         )
-        total_dirs += total_dirs_
-        total_files += total_files_
+        waits = map(
+            lambda directory: (
+                start(directory)
+                if state is None
+                else start(
+                    directory,
+                    run=state.run_of(directory),
+                    depth=state.depth_of(directory),
+                )
+            ),
+            directories,
+        )
+        # المجلدات المتداخلة لا يمكن اعادة تسميتها في نفس الوقت
+        if executor is not None and not any(
+            other in directory.parents
+            or (other is not directory and other == directory)
+            for directory in directories
+            for other in directories
+        ):
+            # بدء جميع المجلدات قبل انتظار اي منها
+            waits = list(waits)
+        for wait in waits:
+            _, total_dirs_, total_files_ = wait()
+            total_dirs += total_dirs_
+            total_files += total_files_
+    if stats is not None:
+        stats.finish(snapshot=snapshot, reporter=reporter)
+    return total_dirs, total_files
 
-    typer.echo(
-        f"\nRenaming {total_dirs} directories, {total_files} files, in {round(time() - start_time, 4)}"
+
+def _print_plan(plan: "RenamePlan", reporter: "Reporter") -> None:
+    """طباعة عناصر الخطة بنفس شكل rename، بمسارات المجلدات بعد اعادة التسمية"""
+    paths = plan.paths()
+    reporter.total = plan.directories
+    current = -1
+    for parent, old_name, new_name in zip(plan.parents, plan.old_names, plan.new_names):
+        if parent != current:
+            if current != -1:
+                reporter.step()
+            current = parent
+            print_dir_path(paths[parent], reporter)
+        print_old_new_name(old_name, new_name, reporter)
+
+
+def _run_plan(
+    plan_file: Path,
+    reporter: "Reporter",
+    start_time: float,
+    stats: Optional["Stats"] = None,
+    stats_file: Optional[Path] = None,
+) -> None:
+    """تنفيذ خطة تم حفظها بـ --plan-out وطباعة النتائج"""
+    try:
+        plan = RenamePlan.load(plan_file)
+    except ValueError as error:
+        raise typer.BadParameter(str(error), param_hint="'--plan-in'")
+    total_dirs = 0
+    total_files = 0
+    error = None
+    with reporter:
+        reporter.total = plan.directories
+        current_parent = None
+        try:
+            for event in apply_plan(plan, stats=stats):
+                if event.parent != current_parent:
+                    if current_parent is not None:
+                        reporter.step()
+                    current_parent = event.parent
+                    print_dir_path(current_parent, reporter)
+                print_old_new_name(event.old_name, event.new_name, reporter)
+                if event.kind == DIRECTORY:
+                    total_dirs += 1
+                else:
+                    total_files += 1
+        except OSError as err:
+            # تغير المجلد بعد بناء الخطة
+            error = err
+            _print_message(
+                f"The plan is out of date, stopped at: {err}",
+                fg=typer.colors.RED,
+                reporter=reporter,
+            )
+    if stats is not None:
+        stats.finish(reporter=reporter)
+    _print_rename_summary(
+        start_time,
+        total_dirs,
+        total_files,
+        rename_data_filename=(
+            plan.options.get("data_filename") if plan.options.get("save_data") else None
+        ),
     )
+    if stats is not None:
+        stats.write(stats_file or "-")
+    if error is not None:
+        raise typer.Exit(1)
+
 
+def _print_rename_summary(
+    start_time: float,
+    total_dirs: int,
+    total_files: int,
+    store: Optional["SQLiteStore"] = None,
+    rename_data_filename: Optional[str] = None,
+) -> None:
+    """طباعة اجمالي العناصر ومكان حفظ الاسماء بعد اعادة التسمية"""
     typer.echo(
-        f"The name of the file containing the rename data is {typer.style(rename_data_filename, fg=typer.colors.BLUE)}"
-        if save_rename_data
-        else ""
+        f"\nRenaming {total_dirs} directories, {total_files} files, in {round(time() - start_time, 4)}"
     )
 
+    if store is not None:
+        typer.echo(
+            f"The rename data is saved in {typer.style(store.path, fg=typer.colors.BLUE)}"
+        )
+    else:
+        typer.echo(
+            f"The name of the file containing the rename data is {typer.style(rename_data_filename, fg=typer.colors.BLUE)}"
+            if rename_data_filename
+            else ""
+        )
+
 
 @app.command(name="unrename")
 def unrename(
@@ -432,39 +1229,841 @@ def unrename(
         "-f",
         help="The name of the json file from which the directory names will be extracted.",
     ),
+    store_spec: Optional[str] = typer.Option(
+        None,
+        "--store",
+        help="Read the rename data from a database instead of the JSON files, e.g. sqlite:rename_data.db",
+    ),
+    archive_file: Optional[Path] = typer.Option(
+        None,
+        "--archive",
+        help="Read the rename data from an archive made by the archive command instead of the JSON files.",
+        exists=True,
+        dir_okay=False,
+        resolve_path=True,
+    ),
+    jobs: Optional[int] = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of threads unrenaming the JSON files of the same depth at the same time.",
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None,
+        "--exclude",
+        metavar="PATTERN",
+        help="Do not look for JSON files in the directories whose name matches this glob, can be repeated.",
+    ),
+    max_depth: Optional[int] = typer.Option(
+        None,
+        "--max-depth",
+        min=1,
+        help="Do not look for JSON files deeper than the --max-depth of the rename.",
+    ),
+    quiet: Optional[bool] = typer.Option(
+        False, "--quiet", "-q", help="Do not print the renamed entries."
+    ),
+    progress: Optional[bool] = typer.Option(
+        False,
+        "--progress",
+        "-p",
+        help="Show a single progress line instead of the renamed entries.",
+    ),
+    log_file: Optional[Path] = typer.Option(
+        None,
+        "--log",
+        help="File in which all the renamed entries are written.",
+        dir_okay=False,
+        resolve_path=True,
+    ),
+    journal_file: Optional[Path] = typer.Option(
+        None,
+        "--journal",
+        help="Write every operation to this journal before doing it, so an interrupted run can be resumed or rolled back.",
+        dir_okay=False,
+        resolve_path=True,
+    ),
+    print_stats: Optional[bool] = typer.Option(
+        False,
+        "--stats",
+        help="Print the time of every phase, the syscall counters and the slowest directories as JSON to stderr.",
+    ),
+    stats_file: Optional[Path] = typer.Option(
+        None,
+        "--stats-file",
+        help="Write the --stats JSON to this file instead of stderr.",
+        dir_okay=False,
+        resolve_path=True,
+    ),
 ) -> None:
     """
     unrename directories, fetching old names from json files.
     """
     start_time = time()
+    json_filename = f"{json_filename.split('.')[0]}.json"
+    archive = _open_archive(
+        archive_file,
+        directories,
+        store_spec=store_spec,
+        journal_file=journal_file,
+        exclude=exclude,
+        max_depth=max_depth,
+    )
+    entry_filter = _entry_filter(exclude=exclude, max_depth=max_depth)
+    store = _open_store(store_spec)
+    journal = _open_journal(
+        journal_file,
+        directories,
+        command="unrename",
+        options={
+            "delete": delete_json_files,
+            "data_filename": json_filename,
+            "store": store_spec,
+            "jobs": jobs,
+            "filter": entry_filter.options() if entry_filter is not None else None,
+        },
+    )
+    stats = Stats() if print_stats or stats_file is not None else None
+    with journal or nullcontext(), archive or nullcontext():
+        total_dirs, total_files = _unrename(
+            directories,
+            delete_json_files=delete_json_files,
+            json_filename=json_filename,
+            store=store,
+            quiet=quiet,
+            progress=progress,
+            log_file=log_file,
+            journal=journal,
+            stats=stats,
+            jobs=jobs,
+            entry_filter=entry_filter,
+            archive=archive,
+        )
+    if archive is not None and delete_json_files:
+        os.remove(archive_file)
+    typer.echo(
+        f"\nRenaming {total_dirs} directories, {total_files} files, in {round(time() - start_time, 4)}"
+    )
+    if stats is not None:
+        stats.write(stats_file or "-")
+
+
+def _unrename(
+    directories: List[Path],
+    delete_json_files: bool,
+    json_filename: str,
+    store: Optional["SQLiteStore"],
+    quiet: bool,
+    progress: bool,
+    log_file: Optional[Path],
+    journal: Optional["Journal"] = None,
+    skip_done: Optional[bool] = False,
+    stats: Optional["Stats"] = None,
+    jobs: Optional[int] = 1,
+    entry_filter: Optional["EntryFilter"] = None,
+    archive: Optional["RenameArchive"] = None,
+) -> Tuple[int, int]:
+    """التراجع عن اعادة تسمية محتوى المجلدات، مشتركة بين unrename و resume
+
+    المعطيات:
+        مثل خيارات unrename
+        journal (Optional[Journal], optional): سجل العمليات. Defaults to None.
+        skip_done (Optional[bool], optional): تجاهل العناصر التي تم التراجع عنها مسبقاً. Defaults to False.
+        stats (Optional[Stats], optional): يتم قياس مدة كل مرحلة وعدد العمليات فيه. Defaults to None.
+        jobs (Optional[int], optional): عدد الخيوط التي تتراجع عن ملفات الجيسون في نفس العمق معاً. Defaults to 1.
+        entry_filter (Optional[EntryFilter], optional): لا يتم البحث عن ملفات الجيسون في المجلدات التي يستبعدها. Defaults to None.
+        archive (Optional[RenameArchive], optional): الارشيف الذي يتم جلب الاسماء منه بدلاً من ملفات الجيسون، لا يتم حذفه هنا. Defaults to None.
+
+    المخرجات:
+        Tuple[int, int]: اجمالي المجلدات التي تم اعادة تسميتها اجمالي الملفات التي تم اعادة تسميتها
+    """
     total_dirs: int = 0
     total_files: int = 0
-    json_filename = f"{json_filename.split('.')[0]}.json"
-    for directory in directories:
-        json_files: List[Path] = list(
-            map(Path, get_json_files(directory=directory, json_filename=json_filename))
-        )
-        if len(json_files) >= 1:
-            for json_file in json_files:
-                unrename_path = get_unrename_dir(
-                    json_file.parent, json_files, root_name=directory.name
-                )
-                # json_file.parent because unrename_path is json_file.parent but with old name
-                if any(get_dir_content(json_file.parent)[1:]):
-                    print_dir_path(unrename_path)
-                total_dirs_, total_files_ = unrename_from_json(
-                    json_file=json_file, delete=delete_json_files
+    if store is not None:
+        with store, Reporter(
+            quiet=quiet,
+            progress=progress,
+            log_file=log_file,
+            total=sum(
+                store.directories_count(run)
+                for directory in directories
+                for run in store.runs(directory)
+            ),
+        ) as reporter:
+            for directory in directories:
+                if not store.runs(directory):
+                    _print_message(
+                        f"There is no rename data for this directory {directory.as_posix()} in {store.path}",
+                        fg=typer.colors.RED,
+                        reporter=reporter,
+                    )
+                    continue
+                total_dirs_, total_files_ = unrename_from_store(
+                    store,
+                    directory,
+                    delete=delete_json_files,
+                    reporter=reporter,
+                    journal=journal,
+                    skip_done=skip_done,
+                    stats=stats,
                 )
                 total_dirs += total_dirs_
                 total_files += total_files_
-
+        if stats is not None:
+            stats.finish(reporter=reporter)
+    else:
+        # ارقام inode لمعرفة العناصر التي تم نقلها بعد اعادة تسميتها
+        snapshot = TreeSnapshot(dir_fds=True, inodes=True)
+        listing_start = stats.clock() if stats is not None else 0.0
+        if archive is not None:
+            # ملفات الجيسون التي يمثلها الارشيف، بدون قراءة المجلدات
+            roots = [
+                (
+                    directory,
+                    [
+                        json_file
+                        for json_file in map(Path, archive.data_files(json_filename))
+                        if directory in json_file.parents
+                    ],
+                )
+                for directory in directories
+            ]
         else:
-            typer.echo(
-                typer.style(
-                    f"There is no JSON file named {json_filename} in this directory {directory.as_posix()}",
-                    fg=typer.colors.RED,
+            roots = [
+                (
+                    directory,
+                    list(
+                        map(
+                            Path,
+                            get_json_files(
+                                directory=directory,
+                                json_filename=json_filename,
+                                snapshot=snapshot,
+                                entry_filter=entry_filter,
+                            ),
+                        )
+                    ),
+                )
+                for directory in directories
+            ]
+        if stats is not None:
+            stats.lap("listing", listing_start)
+        with Reporter(
+            quiet=quiet,
+            progress=progress,
+            log_file=log_file,
+            total=sum(len(json_files) for _, json_files in roots),
+        ) as reporter, snapshot, (
+            ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else nullcontext()
+        ) as executor:
+            for directory, json_files in roots:
+                if len(json_files) >= 1:
+                    total_dirs_, total_files_ = _unrename_json_files(
+                        json_files,
+                        root_name=directory.name,
+                        # ملفات الجيسون غير موجودة عند استخدام الارشيف
+                        delete=delete_json_files and archive is None,
+                        snapshot=snapshot,
+                        reporter=reporter,
+                        journal=journal,
+                        skip_done=skip_done,
+                        stats=stats,
+                        executor=executor,
+                        index=archive,
+                    )
+                    total_dirs += total_dirs_
+                    total_files += total_files_
+                else:
+                    _print_message(
+                        f"There is no JSON file named {json_filename} in this directory {directory.as_posix()}",
+                        fg=typer.colors.RED,
+                        reporter=reporter,
+                    )
+        if stats is not None:
+            stats.finish(snapshot=snapshot, reporter=reporter)
+    return total_dirs, total_files
+
+
+def _unrename_json_files(
+    json_files: List[Path],
+    root_name: str,
+    delete: bool,
+    snapshot: "TreeSnapshot",
+    reporter: "Reporter",
+    journal: Optional["Journal"] = None,
+    skip_done: Optional[bool] = False,
+    stats: Optional["Stats"] = None,
+    executor: Optional[Executor] = None,
+    index: Optional[Union["RenameDataIndex", "RenameArchive"]] = None,
+) -> Tuple[int, int]:
+    """التراجع عن ملفات الجيسون الخاصة بمجلد واحد، الاعمق اولاً
+
+    عند وجود executor يتم التراجع عن ملفات الجيسون التي في نفس العمق بالتوازي،
+    لانها في مجلدات مختلفة لا يحتوي اي منها على الاخر، ولا يتم البدء في العمق
+    الاعلى الا بعد الانتهاء من العمق الحالي لكي لا تتغير مسارات المجلدات
+    الفرعية اثناء العمل عليها. الطباعة تتم بعد الانتهاء من كل عمق بترتيب
+    ملفات الجيسون.
+
+    المعطيات:
+        json_files (List[Path]): ملفات الجيسون بترتيب get_json_files
+        root_name (str): اسم المجلد الاساسي
+        delete (bool): حذف ملفات الجيسون بعد التراجع ام لا
+        snapshot (TreeSnapshot): صورة المجلدات
+        reporter (Reporter): يتم ارسال النتائج اليه
+        journal (Optional[Journal], optional): يتم تسجيل كل اعادة تسمية فيه قبل تنفيذها. Defaults to None.
+        skip_done (Optional[bool], optional): تجاهل العناصر التي تم التراجع عنها مسبقاً. Defaults to False.
+        stats (Optional[Stats], optional): يتم قياس مدة كل مرحلة وعدد العمليات فيه. Defaults to None.
+        executor (Optional[Executor], optional): يتم التراجع عن ملفات العمق الواحد بالتوازي باستخدامه ان وجد. Defaults to None.
+        index (Optional[Union[RenameDataIndex, RenameArchive]], optional): فهرس ملفات الجيسون او الارشيف، يتم بناءه من json_files اذ لم يعطى. Defaults to None.
+
+    المخرجات:
+        Tuple[int, int]: اجمالي المجلدات التي تم اعادة تسميتها اجمالي الملفات التي تم اعادة تسميتها
+    """
+    total_dirs: int = 0
+    total_files: int = 0
+    if index is None:
+        # يتم قراءة كل ملف جيسون مرة واحدة فقط
+        index = RenameDataIndex(json_files)
+
+    def header(json_file: Path) -> Optional[str]:
+        # json_file.parent because unrename_path is json_file.parent but with old name
+        if any(get_dir_content(json_file.parent, snapshot)[1:]):
+            return get_unrename_dir(
+                json_file.parent, json_files, root_name=root_name, index=index
+            )
+        return None
+
+    if executor is None:
+        for json_file in json_files:
+            unrename_path = header(json_file)
+            if unrename_path is not None:
+                print_dir_path(unrename_path, reporter)
+            total_dirs_, total_files_ = unrename_from_json(
+                json_file=json_file,
+                delete=delete,
+                snapshot=snapshot,
+                reporter=reporter,
+                index=index,
+                journal=journal,
+                skip_done=skip_done,
+                stats=stats,
+            )
+            total_dirs += total_dirs_
+            total_files += total_files_
+            reporter.step()
+        return total_dirs, total_files
+
+    def unrename_file(json_file: Path) -> Tuple[list, list]:
+        messages: list = []
+        events = list(
+            unrename_data_file(
+                json_file,
+                delete=delete,
+                snapshot=snapshot,
+                index=index,
+                journal=journal,
+                skip_done=skip_done,
+                stats=stats,
+                on_message=lambda text, level: messages.append((text, level)),
+            )
+        )
+        return messages, events
+
+    levels: Dict[int, List[Path]] = {}
+    for json_file in json_files:
+        levels.setdefault(len(json_file.parts), []).append(json_file)
+    for depth in sorted(levels, reverse=True):
+        level = levels[depth]
+        headers = [header(json_file) for json_file in level]
+        futures = [executor.submit(unrename_file, json_file) for json_file in level]
+        for unrename_path, future in zip(headers, futures):
+            messages, events = future.result()
+            if unrename_path is not None:
+                _timed(stats, "output", print_dir_path, unrename_path, reporter)
+            for text, level_ in messages:
+                _print_message(
+                    text,
+                    fg=typer.colors.YELLOW if level_ == "warning" else typer.colors.RED,
+                    reporter=reporter,
                 )
+            for event in events:
+                if event.kind == DIRECTORY:
+                    total_dirs += 1
+                else:
+                    total_files += 1
+                _timed(
+                    stats,
+                    "output",
+                    print_old_new_name,
+                    event.old_name,
+                    event.new_name,
+                    reporter,
+                )
+            reporter.step()
+    return total_dirs, total_files
+
+
+@app.command()
+def watch(
+    directories: List[Path] = typer.Argument(
+        ...,
+        help="Directories to watch, the entries that arrive in them or in their subdirectories are renamed.",
+        exists=True,
+        dir_okay=True,
+        file_okay=False,
+        resolve_path=True,
+    ),
+    random: Optional[bool] = typer.Option(
+        False, "--random", "-r", help="Rename with random names, or alphabetically."
+    ),
+    length: Optional[int] = typer.Option(
+        10,
+        "--length",
+        "-l",
+        help="Random name length, raised when it is too short for the number of entries in a directory.",
+    ),
+    rename_data_filename: Optional[str] = typer.Option(
+        "rename_data.json",
+        "--filename",
+        "-f",
+        help="The name of the json file in which the directory names are to be saved.",
+    ),
+    delay: Optional[float] = typer.Option(
+        1.0,
+        "--delay",
+        min=0.0,
+        help="Seconds without new entries before renaming a batch.",
+    ),
+    initial: Optional[bool] = typer.Option(
+        False,
+        "--initial",
+        help="Also rename the entries already in the directories when starting, that are not in their JSON files.",
+    ),
+    quiet: Optional[bool] = typer.Option(
+        False, "--quiet", "-q", help="Do not print the renamed entries."
+    ),
+    log_file: Optional[Path] = typer.Option(
+        None,
+        "--log",
+        help="File in which all the renamed entries are written.",
+        dir_okay=False,
+        resolve_path=True,
+    ),
+) -> None:
+    """
+    Watch directories and rename new entries as they arrive (Linux).
+    """
+    if not Watcher.supported():
+        raise typer.BadParameter(
+            "inotify is not available, watch only works on Linux.",
+            param_hint="'DIRECTORIES'",
+        )
+    start_time = time()
+    rename_data_filename = f"{rename_data_filename.split('.')[0]}.json"
+    total_dirs = 0
+    total_files = 0
+    error = None
+    with Reporter(quiet=quiet, log_file=log_file) as reporter:
+        watcher = Watcher(
+            random=random,
+            length=length,
+            data_filename=rename_data_filename,
+            delay=delay,
+            on_message=lambda text, level: _print_message(
+                text,
+                fg=typer.colors.YELLOW if level == "warning" else typer.colors.RED,
+                reporter=reporter,
+            ),
+            initial=initial,
+        )
+        current_parent = None
+        events = watcher.watch(directories)
+        # عند ايقاف الخدمة يتم اعادة تسمية الدفعة الحالية واغلاق ملفات البيانات
+        # مثل الايقاف بـ Ctrl+C
+        previous_handler = signal.signal(
+            signal.SIGTERM, lambda signum, frame: watcher.stop()
+        )
+        try:
+            for event in events:
+                parent, old_name = os.path.split(event.old_path)
+                if parent != current_parent:
+                    current_parent = parent
+                    print_dir_path(parent, reporter)
+                print_old_new_name(old_name, os.path.basename(event.new_path), reporter)
+                if event.kind == DIRECTORY:
+                    total_dirs += 1
+                else:
+                    total_files += 1
+        except KeyboardInterrupt:
+            pass
+        except OSError as err:
+            # مثل الوصول الى اقصى عدد من المجلدات المراقبة (max_user_watches)
+            error = err
+            _print_message(str(err), fg=typer.colors.RED, reporter=reporter)
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+            events.close()
+    _print_rename_summary(
+        start_time, total_dirs, total_files, rename_data_filename=rename_data_filename
+    )
+    if error is not None:
+        raise typer.Exit(1)
+
+
+@app.command()
+def verify(
+    directories: List[Path] = typer.Argument(
+        ...,
+        help="Directories whose JSON files you want to check against their contents.",
+        exists=True,
+        dir_okay=True,
+        file_okay=False,
+        resolve_path=True,
+    ),
+    json_filename: Optional[str] = typer.Option(
+        "rename_data.json",
+        "--filename",
+        "-f",
+        help="The name of the json files to check.",
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None,
+        "--exclude",
+        metavar="PATTERN",
+        help="Do not look for JSON files in the directories whose name matches this glob, can be repeated.",
+    ),
+    max_depth: Optional[int] = typer.Option(
+        None,
+        "--max-depth",
+        min=1,
+        help="Do not look for JSON files deeper than the --max-depth of the rename.",
+    ),
+    quiet: Optional[bool] = typer.Option(
+        False, "--quiet", "-q", help="Only print the summary."
+    ),
+) -> None:
+    """
+    Check the renamed entries against the json files.
+    """
+    start_time = time()
+    json_filename = f"{json_filename.split('.')[0]}.json"
+    entry_filter = _entry_filter(exclude=exclude, max_depth=max_depth)
+    counts = {DRIFTED: 0, MISSING: 0, FOREIGN: 0}
+    total_json_files = 0
+
+    def on_message(text: str, level: str) -> None:
+        _print_message(
+            text, fg=typer.colors.YELLOW if level == "warning" else typer.colors.RED
+        )
+
+    # كل مجلد تتم قرائته مرة واحدة عند البحث عن ملفات الجيسون، ثم تتم مقارنة
+    # الاسماء بنفس القراءة
+    with TreeSnapshot(dir_fds=True, inodes=True) as snapshot:
+        for directory in directories:
+            for json_file in get_json_files(
+                directory, json_filename, snapshot, entry_filter
+            ):
+                total_json_files += 1
+                for mismatch in verify_data_file(
+                    Path(json_file), snapshot=snapshot, on_message=on_message
+                ):
+                    counts[mismatch.kind] += 1
+                    if quiet:
+                        continue
+                    if mismatch.kind == DRIFTED:
+                        _print_message(
+                            f"Drifted: {mismatch.path} is now {os.path.basename(mismatch.actual)}",
+                            fg=typer.colors.YELLOW,
+                        )
+                    else:
+                        _print_message(
+                            f"{mismatch.kind.capitalize()}: {mismatch.path}",
+                            fg=typer.colors.RED,
+                        )
+    typer.echo(
+        f"\nChecking {total_json_files} JSON files, {counts[DRIFTED]} drifted, {counts[MISSING]} missing, {counts[FOREIGN]} foreign entries, in {round(time() - start_time, 4)}"
+    )
+    if any(counts.values()):
+        raise typer.Exit(1)
+
+
+@app.command()
+def archive(
+    directory: Path = typer.Argument(
+        ...,
+        help="The directory whose JSON files are packed into the archive.",
+        exists=True,
+        dir_okay=True,
+        file_okay=False,
+        resolve_path=True,
+    ),
+    archive_file: Path = typer.Argument(
+        ...,
+        help="The archive to write, it must be outside the directory.",
+        dir_okay=False,
+        resolve_path=True,
+    ),
+    json_filename: Optional[str] = typer.Option(
+        "rename_data.json",
+        "--filename",
+        "-f",
+        help="The name of the json files to pack.",
+    ),
+    codec: ArchiveCodec = typer.Option(
+        ArchiveCodec.zlib.value,
+        "--codec",
+        help="Compression of the archive, lzma is smaller and slower.",
+    ),
+    delete_json_files: Optional[bool] = typer.Option(
+        False,
+        "--delete",
+        "-d",
+        help="Delete the JSON files after the archive is written.",
+    ),
+) -> None:
+    """
+    Pack the json files of a directory into a single compressed archive.
+    """
+    start_time = time()
+    json_filename = f"{json_filename.split('.')[0]}.json"
+    if directory in archive_file.parents:
+        raise typer.BadParameter(
+            "The archive can not be inside the directory.",
+            param_hint="'ARCHIVE_FILE'",
+        )
+    try:
+        with TreeSnapshot() as snapshot:
+            total_json_files = RenameArchive.pack(
+                archive_file,
+                directory,
+                data_filename=json_filename,
+                codec=codec,
+                delete=delete_json_files,
+                snapshot=snapshot,
             )
+    except ValueError as err:
+        _print_message(str(err), fg=typer.colors.RED)
+        raise typer.Exit(1)
+    typer.echo(
+        f"\nPacking {total_json_files} JSON files, {archive_file.stat().st_size} bytes, in {round(time() - start_time, 4)}"
+    )
+
+
+@app.command()
+def extract(
+    archive_file: Path = typer.Argument(
+        ...,
+        help="The archive made by the archive command.",
+        exists=True,
+        dir_okay=False,
+        resolve_path=True,
+    ),
+    directory: Path = typer.Argument(
+        ...,
+        help="The directory that was packed, it may have been moved since.",
+        exists=True,
+        dir_okay=True,
+        file_okay=False,
+        resolve_path=True,
+    ),
+    json_filename: Optional[str] = typer.Option(
+        "rename_data.json",
+        "--filename",
+        "-f",
+        help="The name of the json files to write.",
+    ),
+    data_format: DataFormat = typer.Option(
+        DataFormat.json.value,
+        "--data-format",
+        help="Format of the written rename data files.",
+    ),
+    delete_archive: Optional[bool] = typer.Option(
+        False,
+        "--delete",
+        "-d",
+        help="Delete the archive after the JSON files are written.",
+    ),
+) -> None:
+    """
+    Write the json files of an archive back into the directory.
+    """
+    start_time = time()
+    json_filename = f"{json_filename.split('.')[0]}.json"
+    try:
+        with RenameArchive(archive_file, directory) as archive:
+            total_json_files = archive.extract(json_filename, data_format)
+    except (ValueError, OSError) as err:
+        _print_message(str(err), fg=typer.colors.RED)
+        raise typer.Exit(1)
+    if delete_archive:
+        os.remove(archive_file)
+    typer.echo(
+        f"\nExtracting {total_json_files} JSON files, in {round(time() - start_time, 4)}"
+    )
+
+
+@app.command()
+def resume(
+    journal_file: Path = typer.Argument(
+        ...,
+        help="The journal of the interrupted rename or unrename.",
+        exists=True,
+        dir_okay=False,
+        resolve_path=True,
+    ),
+    quiet: Optional[bool] = typer.Option(
+        False, "--quiet", "-q", help="Do not print the renamed entries."
+    ),
+    progress: Optional[bool] = typer.Option(
+        False,
+        "--progress",
+        "-p",
+        help="Show a single progress line instead of the renamed entries.",
+    ),
+    log_file: Optional[Path] = typer.Option(
+        None,
+        "--log",
+        help="File in which all the renamed entries are written.",
+        dir_okay=False,
+        resolve_path=True,
+    ),
+) -> None:
+    """
+    Resume an interrupted rename or unrename from its journal.
+    """
+    start_time = time()
+    try:
+        state = JournalState(journal_file)
+    except (ValueError, OSError) as err:
+        raise typer.BadParameter(str(err), param_hint="'JOURNAL_FILE'")
+    options = state.header["options"]
+    store = _open_store(options["store"])
+    with Journal(journal_file) as journal:
+        if state.header["command"] == "rename":
+            state.discard_unapplied()
+            if store is not None:
+                # الاسماء المحفوظة في قاعدة البيانات قد تكون غير مكتملة، لذلك
+                # يتم اعادة بنائها من السجل
+                _rebuild_store(store, state)
+            total_dirs, total_files = _rename(
+                [Path(directory) for directory in state.todo],
+                random=options["random"],
+                length=options["length"],
+                save_rename_data=options["save_data"],
+                rename_data_filename=options["data_filename"],
+                data_format=DataFormat(options["data_format"]),
+                store=store,
+                jobs=options["jobs"],
+                reporter=Reporter(quiet=quiet, progress=progress, log_file=log_file),
+                journal=journal,
+                state=state,
+                entry_filter=(
+                    EntryFilter(**options["filter"]) if options.get("filter") else None
+                ),
+            )
+        else:
+            total_dirs, total_files = _unrename(
+                [Path(directory) for directory in state.header["directories"]],
+                delete_json_files=options["delete"],
+                json_filename=options["data_filename"],
+                store=store,
+                quiet=quiet,
+                progress=progress,
+                log_file=log_file,
+                journal=journal,
+                skip_done=True,
+                # السجلات القديمة لا تحتوي على عدد الخيوط
+                jobs=options.get("jobs", 1),
+                entry_filter=(
+                    EntryFilter(**options["filter"]) if options.get("filter") else None
+                ),
+            )
+    if state.header["command"] == "rename":
+        _print_rename_summary(
+            start_time,
+            total_dirs,
+            total_files,
+            store=store,
+            rename_data_filename=(
+                options["data_filename"] if options["save_data"] else None
+            ),
+        )
+    else:
+        typer.echo(
+            f"\nRenaming {total_dirs} directories, {total_files} files, in {round(time() - start_time, 4)}"
+        )
+
+
+def _rebuild_store(store: "SQLiteStore", state: "JournalState") -> None:
+    """اعادة اضافة اسماء المجلدات التي تم الانتهاء منها في السجل الى قاعدة البيانات
+
+    اسماء المجلدات التي لم يتم الانتهاء منها يتم اضافتها عند اكمالها.
+
+    المعطيات:
+        store (SQLiteStore): قاعدة البيانات
+        state (JournalState): حالة العملية المتوقفة
+    """
+    for run in state.runs.values():
+        store.clear_run(run)
+    # المجلد -> عدد الاسماء التي تمت اضافتها
+    counts: Dict[str, int] = {}
+    for record in read_journal(state.path):
+        if "p" not in record or record["p"] in state.pending:
+            continue
+        run = state.run_of(record["p"])
+        if run is None:
+            continue
+        seq = counts.get(record["p"], 0)
+        counts[record["p"]] = seq + 1
+        store.add(
+            run,
+            record["p"],
+            [
+                (
+                    {"old_name": record["o"], "new_name": record["n"]}
+                    if record["d"]
+                    else {"old": record["o"], "new": record["n"]}
+                )
+            ],
+            start=seq,
+        )
+
+
+@app.command()
+def rollback(
+    journal_file: Path = typer.Argument(
+        ...,
+        help="The journal of the interrupted rename or unrename.",
+        exists=True,
+        dir_okay=False,
+        resolve_path=True,
+    ),
+    quiet: Optional[bool] = typer.Option(
+        False, "--quiet", "-q", help="Do not print the renamed entries."
+    ),
+    log_file: Optional[Path] = typer.Option(
+        None,
+        "--log",
+        help="File in which all the renamed entries are written.",
+        dir_okay=False,
+        resolve_path=True,
+    ),
+) -> None:
+    """
+    Roll back an interrupted rename or unrename from its journal.
+    """
+    start_time = time()
+    try:
+        header = read_journal_header(journal_file)
+    except (ValueError, OSError) as err:
+        raise typer.BadParameter(str(err), param_hint="'JOURNAL_FILE'")
+    store = _open_store(header["options"]["store"])
+    with store or nullcontext(), Reporter(quiet=quiet, log_file=log_file) as reporter:
+        total_dirs, total_files = rollback_from_journal(
+            journal_file, store=store, reporter=reporter
+        )
+    os.remove(journal_file)
     typer.echo(
         f"\nRenaming {total_dirs} directories, {total_files} files, in {round(time() - start_time, 4)}"
     )
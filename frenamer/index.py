@@ -0,0 +1,426 @@
+import os
+from heapq import heappop, heappush
+from pathlib import Path
+from string import ascii_letters
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from .data import RenameDataFile
+
+__all__ = (
+    "DirNameIndex",
+    "NameIndex",
+    "RandomNameIndex",
+    "RenameDataIndex",
+    "alphabetical_name",
+    "random_letters",
+)
+
+# رقم كل حرف في اسماء المجلدات الابجدية
+_LETTER_VALUES = {char: value for value, char in enumerate(ascii_letters, 1)}
+# تحويل كل بايت عشوائي الى حرف، البايتات من 208 (52 * 4) وما فوق يتم حذفها
+# لكي يكون احتمال جميع الحروف متساوي
+_LETTERS_TABLE = bytes(
+    ascii_letters.encode("ascii")[byte % len(ascii_letters)] for byte in range(256)
+)
+_REJECTED_BYTES = bytes(range(len(ascii_letters) * (256 // len(ascii_letters)), 256))
+
+
+def alphabetical_name(number: int) -> str:
+    """ارجاع الاسم الابجدي الخاص بالرقم (bijective base-52)
+
+    الاسماء بالترتيب 'a' ... 'Z' ثم 'aa' ... 'aZ' ثم 'ba' ... 'ZZ' ثم 'aaa'،
+    لذلك طول الاسم يزيد بشكل لوغاريتمي مع عدد المجلدات.
+
+    المعطيات:
+        number (int): رقم الاسم، يبدأ من 1
+
+    المخرجات:
+        str: الاسم
+    """
+    chars = []
+    while number:
+        number, value = divmod(number - 1, len(ascii_letters))
+        chars.append(ascii_letters[value])
+    return "".join(reversed(chars))
+
+
+def random_letters(count: int) -> str:
+    """ارجاع حروف عشوائية من os.urandom، يتم تحويلها كلها مرة واحدة
+
+    المعطيات:
+        count (int): عدد الحروف
+
+    المخرجات:
+        str: الحروف
+    """
+    letters = ""
+    while len(letters) < count:
+        # حوالي 19% من البايتات يتم حذفها
+        needed = count - len(letters)
+        letters += (
+            os.urandom(needed + needed // 4 + 16)
+            .translate(_LETTERS_TABLE, _REJECTED_BYTES)
+            .decode("ascii")
+        )
+    return letters[:count]
+
+
+def _alphabetical_number(name: str) -> Optional[int]:
+    """ارجاع رقم الاسم الابجدي، او None اذ لم يكن اسم ابجدي"""
+    number = 0
+    for char in name:
+        value = _LETTER_VALUES.get(char)
+        if value is None:
+            return None
+        number = number * len(ascii_letters) + value
+    return number or None
+
+
+class NameIndex:
+    """فهرس الاسماء المحجوزة في مجلد واحد
+
+    يتم بناءه مرة واحدة لكل مجلد ثم يتم تحديثه مع كل اعادة تسمية، بدلاً من
+    جلب محتوى المجلد والبحث فيه خطياً مع كل ملف.
+    """
+
+    __slots__ = ("prefix", "taken", "cursor", "_freed")
+
+    def __init__(self, prefix: str, names: Optional[Iterable[str]] = None) -> None:
+        """
+        المعطيات:
+            prefix (str): بداية الاسماء التي سوف يتم حجزها (اسم المجلد)
+            names (Optional[Iterable[str]], optional): الاسماء الموجودة في المجلد. Defaults to None.
+        """
+        self.prefix = prefix
+        # عدد الملفات لكل بداية اسم، لان اكثر من ملف قد يشترك في نفس البداية
+        # مثل 'a.txt' و 'a.png'
+        self.taken: Dict[str, int] = {}
+        # جميع الارقام الاصغر من المؤشر محجوزة ما عدا الموجودة في _freed
+        self.cursor: int = 1
+        self._freed: List[int] = []
+        for name in names or ():
+            self.add(name)
+
+    @staticmethod
+    def stem(name: str) -> str:
+        """ارجاع بداية الاسم بدون الامتداد
+
+        المعطيات:
+            name (str): اسم الملف
+
+        المخرجات:
+            str: بداية الاسم
+        """
+        return name.split(".")[0]
+
+    def _number(self, stem: str) -> Optional[int]:
+        """ارجاع رقم الاسم ان كان من الاسماء التي يحجزها الفهرس"""
+        head, sep, num = stem.rpartition("-")
+        if sep and head == self.prefix and num.isdigit() and num[0] != "0":
+            return int(num)
+        return None
+
+    def add(self, name: str) -> None:
+        """اضافة اسم الى الاسماء المحجوزة
+
+        المعطيات:
+            name (str): الاسم المراد حجزه
+        """
+        stem = self.stem(name)
+        self.taken[stem] = self.taken.get(stem, 0) + 1
+
+    def release(self, name: str) -> None:
+        """ازالة اسم من الاسماء المحجوزة
+
+        المعطيات:
+            name (str): الاسم المراد ازالته
+        """
+        stem = self.stem(name)
+        count = self.taken.get(stem, 0)
+        if count > 1:
+            self.taken[stem] = count - 1
+            return
+        self.taken.pop(stem, None)
+        num = self._number(stem)
+        if num is not None and num < self.cursor:
+            heappush(self._freed, num)
+
+    def allocate(self) -> str:
+        """حجز اول اسم متاح وارجاعه (بدون امتداد)
+
+        المخرجات:
+            str: الاسم المتاح، مثل 'dir-3'
+        """
+        while self._freed:
+            stem = f"{self.prefix}-{heappop(self._freed)}"
+            if stem not in self.taken:
+                self.taken[stem] = 1
+                return stem
+        stem = f"{self.prefix}-{self.cursor}"
+        while stem in self.taken:
+            self.cursor += 1
+            stem = f"{self.prefix}-{self.cursor}"
+        self.cursor += 1
+        self.taken[stem] = 1
+        return stem
+
+
+class RandomNameIndex:
+    """فهرس الاسماء العشوائية في مجلد واحد، للملفات والمجلدات
+
+    الاسماء يتم توليدها على دفعات من os.urandom، ويتم التأكد من عدم تكرارها
+    من الاسماء المحجوزة في المجلد. اذ كان الطول المطلوب قصير بالنسبة لعدد
+    العناصر في المجلد يتم زيادته، لكي يكون احتمال تكرار الاسم اقل من 1/1000.
+    """
+
+    __slots__ = ("length", "taken", "batch_size", "_batch", "_names")
+
+    def __init__(
+        self,
+        names: Optional[Iterable[str]] = None,
+        length: Optional[int] = 10,
+        batch_size: Optional[int] = 4096,
+    ) -> None:
+        """
+        المعطيات:
+            names (Optional[Iterable[str]], optional): الاسماء الموجودة في المجلد. Defaults to None.
+            length (Optional[int], optional): طول الاسم المطلوب. Defaults to 10.
+            batch_size (Optional[int], optional): اقصى عدد للاسماء التي يتم توليدها في كل دفعة. Defaults to 4096.
+        """
+        # عدد العناصر لكل بداية اسم، مثل NameIndex
+        self.taken: Dict[str, int] = {}
+        for name in names or ():
+            self.add(name)
+        self.length = max(length, self.safe_length(len(self.taken)))
+        self.batch_size = batch_size
+        # الدفعة الاولى بعدد عناصر المجلد تقريباً، ثم تتضاعف
+        self._batch: int = min(batch_size, len(self.taken) + 1)
+        self._names: List[str] = []
+
+    @staticmethod
+    def safe_length(count: int) -> int:
+        """اقل طول لا يتكرر فيه الاسم مع احد العناصر باحتمال اكبر من 1/1000
+
+        المعطيات:
+            count (int): عدد العناصر في المجلد
+
+        المخرجات:
+            int: الطول
+        """
+        length = 1
+        while len(ascii_letters) ** length < 1000 * max(count, 1):
+            length += 1
+        return length
+
+    def add(self, name: str) -> None:
+        """اضافة اسم الى الاسماء المحجوزة
+
+        المعطيات:
+            name (str): الاسم المراد حجزه
+        """
+        stem = NameIndex.stem(name)
+        self.taken[stem] = self.taken.get(stem, 0) + 1
+
+    def release(self, name: str) -> None:
+        """ازالة اسم من الاسماء المحجوزة
+
+        المعطيات:
+            name (str): الاسم المراد ازالته
+        """
+        stem = NameIndex.stem(name)
+        count = self.taken.get(stem, 0)
+        if count > 1:
+            self.taken[stem] = count - 1
+        else:
+            self.taken.pop(stem, None)
+
+    def _fill(self) -> None:
+        length = self.length
+        letters = random_letters(length * self._batch)
+        self._names = [
+            letters[start : start + length] for start in range(0, len(letters), length)
+        ]
+        self._batch = min(self._batch * 2, self.batch_size)
+
+    def allocate(self) -> str:
+        """حجز اسم عشوائي غير مستخدم وارجاعه (بدون امتداد)
+
+        المخرجات:
+            str: الاسم، مثل 'kQzTrbAwpe'
+        """
+        taken = self.taken
+        while True:
+            if not self._names:
+                self._fill()
+            stem = self._names.pop()
+            if stem not in taken:
+                taken[stem] = 1
+                return stem
+
+
+class DirNameIndex:
+    """فهرس اسماء المجلدات الابجدية في مجلد واحد
+
+    مثل NameIndex لكن بالاسماء الابجدية، يتم بناءه مرة واحدة لكل مجلد ويتم
+    حجز الاسماء بالترتيب من مؤشر، لذلك جلب الاسم التالي لا يحتاج الى قراءة
+    المجلد او تجربة جميع الحروف مع كل مجلد.
+    """
+
+    __slots__ = ("prefix", "taken", "cursor", "_freed")
+
+    def __init__(
+        self, names: Optional[Iterable[str]] = None, prefix: Optional[str] = ""
+    ) -> None:
+        """
+        المعطيات:
+            names (Optional[Iterable[str]], optional): الاسماء الموجودة في المجلد. Defaults to None.
+            prefix (Optional[str], optional): بداية الاسماء، مثل 'Z' للاسماء 'Z-a' و 'Z-b'. Defaults to "".
+        """
+        self.prefix = prefix
+        self.taken: Set[str] = set(names or ())
+        # جميع الارقام الاصغر من المؤشر محجوزة ما عدا الموجودة في _freed
+        self.cursor: int = 1
+        self._freed: List[int] = []
+
+    def _name(self, number: int) -> str:
+        name = alphabetical_name(number)
+        return f"{self.prefix}-{name}" if self.prefix else name
+
+    def _number(self, name: str) -> Optional[int]:
+        """ارجاع رقم الاسم ان كان من الاسماء التي يحجزها الفهرس"""
+        if self.prefix:
+            head, sep, name = name.rpartition("-")
+            if not sep or head != self.prefix:
+                return None
+        return _alphabetical_number(name)
+
+    def add(self, name: str) -> None:
+        """اضافة اسم الى الاسماء المحجوزة
+
+        المعطيات:
+            name (str): الاسم المراد حجزه
+        """
+        self.taken.add(name)
+
+    def release(self, name: str) -> None:
+        """ازالة اسم من الاسماء المحجوزة
+
+        المعطيات:
+            name (str): الاسم المراد ازالته
+        """
+        self.taken.discard(name)
+        number = self._number(name)
+        if number is not None and number < self.cursor:
+            heappush(self._freed, number)
+
+    def allocate(self) -> str:
+        """حجز اول اسم متاح وارجاعه
+
+        المخرجات:
+            str: الاسم المتاح، مثل 'c' او 'aB'
+        """
+        while self._freed:
+            name = self._name(heappop(self._freed))
+            if name not in self.taken:
+                self.taken.add(name)
+                return name
+        name = self._name(self.cursor)
+        while name in self.taken:
+            self.cursor += 1
+            name = self._name(self.cursor)
+        self.cursor += 1
+        self.taken.add(name)
+        return name
+
+
+class RenameDataIndex:
+    """فهرس ملفات بيانات اعادة التسمية
+
+    يتم فتح كل ملف مرة واحدة فقط، ويتم حفظ اسماء المجلدات في قاموس لكل مجلد
+    (الاسم الجديد -> الاسم القديم)، لذلك جلب المسار القديم لاي مجلد يكون
+    بعدد اجزاء المسار فقط.
+    """
+
+    __slots__ = ("data", "dir_names")
+
+    def __init__(self, data_files: Optional[Iterable[Union[str, Path]]] = None) -> None:
+        """
+        المعطيات:
+            data_files (Optional[Iterable[Union[str, Path]]], optional): ملفات البيانات المراد اضافتها للفهرس. Defaults to None.
+        """
+        # مسار المجلد -> ملف بيانات اعادة التسمية الخاص به
+        self.data: Dict[str, RenameDataFile] = {}
+        # مسار المجلد -> {الاسم الجديد للمجلد الفرعي: الاسم القديم}
+        self.dir_names: Dict[str, Dict[str, str]] = {}
+        for data_file in data_files or ():
+            self.add(data_file)
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        return os.path.normpath(os.fspath(path))
+
+    def add(self, data_file: Union[str, Path]) -> RenameDataFile:
+        """قراءة ملف البيانات واضافته الى الفهرس
+
+        المعطيات:
+            data_file (Union[str, Path]): ملف البيانات
+
+        المخرجات:
+            RenameDataFile: ملف بيانات اعادة التسمية
+        """
+        rename_data = RenameDataFile(data_file)
+        directory = os.path.dirname(self._key(data_file))
+        self.data[directory] = rename_data
+        self.dir_names[directory] = rename_data.dir_names()
+        return rename_data
+
+    def get(self, data_file: Union[str, Path]) -> RenameDataFile:
+        """ارجاع ملف البيانات، يتم قرائته اذ لم يكن في الفهرس
+
+        المعطيات:
+            data_file (Union[str, Path]): ملف البيانات
+
+        المخرجات:
+            RenameDataFile: ملف بيانات اعادة التسمية
+        """
+        rename_data = self.data.get(os.path.dirname(self._key(data_file)))
+        return self.add(data_file) if rename_data is None else rename_data
+
+    def discard(self, data_file: Union[str, Path]) -> None:
+        """حذف ملف البيانات من الفهرس بعد الانتهاء منه
+
+        المعطيات:
+            data_file (Union[str, Path]): ملف البيانات
+        """
+        directory = os.path.dirname(self._key(data_file))
+        self.data.pop(directory, None)
+        self.dir_names.pop(directory, None)
+
+    def old_name(self, directory: Union[str, Path], new_name: str) -> Optional[str]:
+        """ارجاع الاسم القديم لمجلد فرعي
+
+        المعطيات:
+            directory (Union[str, Path]): المجلد الذي يحتوي على المجلد الفرعي
+            new_name (str): الاسم الجديد للمجلد الفرعي
+
+        المخرجات:
+            Optional[str]: الاسم القديم، او None اذ لم يكن موجود في الفهرس
+        """
+        return self.dir_names.get(self._key(directory), {}).get(new_name)
+
+    def unrename_path(self, path: Union[str, Path]) -> str:
+        """جلب المسار القديم الخاص بالمسار الجديد
+
+        المعطيات:
+            path (Union[str, Path]): المسار الجديد
+
+        المخرجات:
+            str: المسار القديم
+        """
+        current_path = ""
+        unrename_path = ""
+        for part in Path(self._key(path)).parts:
+            old_part = self.dir_names.get(current_path, {}).get(part, part)
+            unrename_path = os.path.join(unrename_path, old_part)
+            current_path = os.path.join(current_path, part)
+        return unrename_path
@@ -0,0 +1,170 @@
+import errno
+import os
+import select
+import struct
+import sys
+from typing import Any, List, NamedTuple, Optional
+
+__all__ = (
+    "IN_CREATE",
+    "IN_IGNORED",
+    "IN_ISDIR",
+    "IN_MOVED_TO",
+    "IN_Q_OVERFLOW",
+    "Inotify",
+    "InotifyEvent",
+)
+
+# من sys/inotify.h
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+_IN_CLOEXEC = 0o2000000
+_IN_NONBLOCK = 0o4000
+
+# wd, mask, cookie, len ثم الاسم
+_HEADER = struct.Struct("iIII")
+# يكفي لعدة مئات من الاحداث في كل قراءة
+_READ_SIZE = 64 * 1024
+
+# inotify_* من مكتبة C، False اذ لم تكن موجودة
+_libc: Any = None
+
+
+def _load_libc() -> Any:
+    """تحميل مكتبة C عند اول استخدام، لكي لا يتم استيراد ctypes مع بدء الاداة"""
+    global _libc
+    if _libc is None:
+        _libc = False
+        if sys.platform.startswith("linux"):
+            import ctypes
+
+            try:
+                libc = ctypes.CDLL(None, use_errno=True)
+                libc.inotify_init1.argtypes = (ctypes.c_int,)
+                libc.inotify_add_watch.argtypes = (
+                    ctypes.c_int,
+                    ctypes.c_char_p,
+                    ctypes.c_uint32,
+                )
+                libc.inotify_rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+            except (OSError, AttributeError):
+                pass
+            else:
+                _libc = libc
+    return _libc
+
+
+def _error(path: Optional[str] = None) -> OSError:
+    from ctypes import get_errno
+
+    error = get_errno()
+    return OSError(error, os.strerror(error), path)
+
+
+class InotifyEvent(NamedTuple):
+    """حدث واحد من inotify"""
+
+    # رقم المراقبة الخاصة بالمجلد، -1 مع IN_Q_OVERFLOW
+    wd: int
+    mask: int
+    cookie: int
+    # اسم العنصر داخل المجلد
+    name: str
+
+
+class Inotify:
+    """مراقبة المجلدات باستخدام inotify في لينكس، بدون اي مكتبات خارجية
+
+    يتم رفع OSError عند انشائه في الانظمة الاخرى.
+    """
+
+    __slots__ = ("_fd",)
+
+    def __init__(self) -> None:
+        libc = _load_libc()
+        if not libc:
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        self._fd: Optional[int] = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            self._fd = None
+            raise _error()
+
+    @staticmethod
+    def supported() -> bool:
+        """هل inotify متاح في هذا النظام"""
+        return bool(_load_libc())
+
+    def __enter__(self) -> "Inotify":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """مراقبة مجلد، او تعديل مراقبته اذ كان مراقباً
+
+        المعطيات:
+            path (str): مسار المجلد
+            mask (int): الاحداث المطلوبة
+
+        المخرجات:
+            int: رقم المراقبة (wd)، نفس الرقم لنفس المجلد حتى لو تغير مساره
+        """
+        wd = _libc.inotify_add_watch(
+            self._fd,
+            os.fsencode(path),
+            mask | IN_ONLYDIR | IN_DONT_FOLLOW | IN_EXCL_UNLINK,
+        )
+        if wd < 0:
+            raise _error(path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        """ايقاف مراقبة مجلد
+
+        المعطيات:
+            wd (int): رقم المراقبة
+        """
+        if _libc.inotify_rm_watch(self._fd, wd) < 0:
+            raise _error()
+
+    def read(self, timeout: Optional[float] = None) -> List[InotifyEvent]:
+        """انتظار الاحداث وارجاع جميع الاحداث المتاحة
+
+        المعطيات:
+            timeout (Optional[float], optional): اقصى مدة انتظار بالثواني، او الانتظار حتى وصول حدث. Defaults to None.
+
+        المخرجات:
+            List[InotifyEvent]: الاحداث، فارغة اذ انتهت المدة
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        events: List[InotifyEvent] = []
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = _HEADER.unpack_from(data, offset)
+                offset += _HEADER.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                events.append(InotifyEvent(wd, mask, cookie, name))
+
+    def close(self) -> None:
+        """اغلاق المراقبة"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,333 @@
+import os
+from json import dumps, loads
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from typing import Dict, Iterator, List, Optional, Union
+
+from .data import _reversed_lines
+from .version import version
+
+__all__ = (
+    "Journal",
+    "JournalState",
+    "read_journal",
+    "read_journal_header",
+    "read_journal_reversed",
+)
+
+JOURNAL_FORMAT = "journal"
+
+
+class Journal:
+    """سجل العمليات (write-ahead journal)
+
+    يتم كتابة كل عملية اعادة تسمية في السجل قبل تنفيذها، لذلك اذ توقفت الاداة
+    في المنتصف يمكن اكمال العمل او التراجع عنه من السجل. كل سطر يتم كتابته
+    مباشرة الى النظام (os.write) لكي لا يضيع عند ايقاف العملية، اما fsync
+    فيتم على دفعات كل batch_size عملية او كل interval ثانية.
+    """
+
+    __slots__ = (
+        "path",
+        "batch_size",
+        "interval",
+        "_fd",
+        "_lock",
+        "_unsynced",
+        "_synced_at",
+    )
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: Optional[int] = 1000,
+        interval: Optional[float] = 0.05,
+        header: Optional[dict] = None,
+    ) -> None:
+        """
+        المعطيات:
+            path (Union[str, Path]): مسار السجل
+            batch_size (Optional[int], optional): عدد العمليات بين كل fsync. Defaults to 1000.
+            interval (Optional[float], optional): اقصى مدة بالثواني بين كل fsync. Defaults to 0.05.
+            header (Optional[dict], optional): معلومات العملية، يتم انشاء سجل جديد بها ان وجدت، والا يتم الاضافة على السجل الموجود. Defaults to None.
+        """
+        self.path = os.fspath(path)
+        self.batch_size = batch_size
+        self.interval = interval
+        # يمكن الكتابة من اكثر من خيط عند استخدام --jobs
+        self._lock = Lock()
+        self._unsynced: int = 0
+        self._synced_at = monotonic()
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        if header is not None:
+            flags |= os.O_TRUNC
+        self._fd = os.open(self.path, flags, 0o644)
+        if header is not None:
+            self._write(
+                {
+                    "frenamerVersion": version,
+                    "format": JOURNAL_FORMAT,
+                    **header,
+                }
+            )
+            self.sync()
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, exc_type, *_) -> None:
+        # يتم حذف السجل فقط اذ انتهت العملية بنجاح
+        self.close(remove=exc_type is None)
+
+    def _write(self, record: dict) -> None:
+        line = dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            os.write(self._fd, line.encode("utf-8"))
+            self._unsynced += 1
+            if (
+                self._unsynced >= self.batch_size
+                or monotonic() - self._synced_at >= self.interval
+            ):
+                self._sync()
+
+    def _sync(self) -> None:
+        os.fsync(self._fd)
+        self._unsynced = 0
+        self._synced_at = monotonic()
+
+    def sync(self) -> None:
+        """حفظ جميع العمليات في القرص"""
+        with self._lock:
+            self._sync()
+
+    def run(self, run: int, root: Union[str, Path]) -> None:
+        """بدء عملية في قاعدة البيانات
+
+        المعطيات:
+            run (int): رقم العملية
+            root (Union[str, Path]): المجلد الخاص بالعملية
+        """
+        self._write({"run": run, "root": os.fspath(root)})
+
+    def rename(self, parent: str, old_name: str, new_name: str, is_dir: bool) -> None:
+        """تسجيل اعادة تسمية قبل تنفيذها
+
+        المعطيات:
+            parent (str): المجلد الذي يحتوي على العنصر
+            old_name (str): الاسم الحالي
+            new_name (str): الاسم الذي سوف يتم اعادة التسمية اليه
+            is_dir (bool): هل العنصر مجلد
+        """
+        self._write({"p": parent, "o": old_name, "n": new_name, "d": int(is_dir)})
+
+    def failed(self, parent: str, old_name: str, new_name: str) -> None:
+        """تسجيل ان اعادة التسمية التي قبلها لم تنفذ، لان الاسم الجديد موجود
+
+        المعطيات:
+            parent (str): المجلد الذي يحتوي على العنصر
+            old_name (str): الاسم الحالي
+            new_name (str): الاسم الذي تم تجربته
+        """
+        self._write({"failed": parent, "o": old_name, "n": new_name})
+
+    def walk(self, path: Union[str, Path]) -> None:
+        """تسجيل مجلد فرعي لم تتم اعادة تسميته لكن يجب المرور عليه، بسبب الفلتر
+
+        المعطيات:
+            path (Union[str, Path]): المجلد
+        """
+        self._write({"walk": os.fspath(path)})
+
+    def done(self, path: Union[str, Path]) -> None:
+        """الانتهاء من مجلد او ملف بيانات
+
+        المعطيات:
+            path (Union[str, Path]): المجلد او ملف البيانات
+        """
+        self._write({"done": os.fspath(path)})
+
+    def delete(self, path: Union[str, Path]) -> None:
+        """تسجيل حذف ملف بيانات قبل حذفه
+
+        المعطيات:
+            path (Union[str, Path]): ملف البيانات
+        """
+        self._write({"delete": os.fspath(path)})
+
+    def finished(self, run: int, deleted: bool) -> None:
+        """تسجيل انتهاء التراجع عن عملية في قاعدة البيانات
+
+        المعطيات:
+            run (int): رقم العملية
+            deleted (bool): هل تم حذف اسماء العملية من قاعدة البيانات
+        """
+        self._write({"finished": run, "deleted": int(deleted)})
+
+    def close(self, remove: Optional[bool] = False) -> None:
+        """حفظ العمليات المتبقية واغلاق السجل
+
+        المعطيات:
+            remove (Optional[bool], optional): حذف السجل بعد اغلاقه. Defaults to False.
+        """
+        if self._fd is None:
+            return
+        with self._lock:
+            self._sync()
+            os.close(self._fd)
+            self._fd = None
+        if remove:
+            os.remove(self.path)
+
+
+def read_journal_header(path: Union[str, Path]) -> dict:
+    """قراءة معلومات العملية من السجل
+
+    المعطيات:
+        path (Union[str, Path]): مسار السجل
+
+    المخرجات:
+        dict: معلومات العملية، يتم رفع ValueError اذ لم يكن الملف سجل عمليات
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            header = loads(f.readline())
+        except ValueError:
+            header = None
+    if not isinstance(header, dict) or header.get("format") != JOURNAL_FORMAT:
+        raise ValueError(f"Invalid frenamer journal: {os.fspath(path)}")
+    return header
+
+
+def _records(lines: Iterator[Union[str, bytes]]) -> Iterator[dict]:
+    for line in lines:
+        try:
+            record = loads(line)
+        except ValueError:
+            # اخر سطر قد يكون غير مكتمل اذ توقفت الاداة اثناء كتابته،
+            # والعملية الخاصة به لم يتم تنفيذها
+            continue
+        if "format" in record:
+            continue
+        yield record
+
+
+def read_journal(path: Union[str, Path]) -> Iterator[dict]:
+    """قراءة عمليات السجل بنفس ترتيب كتابتها
+
+    المعطيات:
+        path (Union[str, Path]): مسار السجل
+
+    المخرجات:
+        Iterator[dict]: العمليات
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        yield from _records(f)
+
+
+def read_journal_reversed(path: Union[str, Path]) -> Iterator[dict]:
+    """قراءة عمليات السجل من الاحدث الى الاقدم
+
+    المعطيات:
+        path (Union[str, Path]): مسار السجل
+
+    المخرجات:
+        Iterator[dict]: العمليات
+    """
+    yield from _records(_reversed_lines(os.fspath(path)))
+
+
+class JournalState:
+    """حالة عملية اعادة التسمية عند توقفها، يتم بنائها من السجل
+
+    يتم حفظ عمليات المجلدات التي لم يتم الانتهاء منها فقط، لذلك الذاكرة
+    المستخدمة بعدد المجلدات التي كانت قيد العمل وليس بعدد العناصر.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        المعطيات:
+            path (Union[str, Path]): مسار السجل
+        """
+        self.path = os.fspath(path)
+        self.header = read_journal_header(path)
+        # المجلد الاساسي -> رقم العملية في قاعدة البيانات
+        self.runs: Dict[str, int] = {}
+        # المجلد -> العمليات التي تمت عليه قبل التوقف
+        self.pending: Dict[str, List[dict]] = {}
+        # المجلدات التي لم يتم الانتهاء من اعادة تسمية محتوياتها بالترتيب
+        self.todo: Dict[str, None] = dict.fromkeys(self.header["directories"])
+        # المجلد -> مجلداته الفرعية التي يتم المرور عليها بدون اعادة تسميتها،
+        # يتم اضافتها فقط بعد الانتهاء منه لانه يتم اعادته بالكامل اذ لم ينتهي
+        walks: Dict[str, List[str]] = {}
+        for record in read_journal(path):
+            if "p" in record:
+                self.pending.setdefault(record["p"], []).append(record)
+                if record["d"]:
+                    self.todo[os.path.join(record["p"], record["n"])] = None
+            elif "failed" in record:
+                records = self.pending.get(record["failed"])
+                if records and (records[-1]["o"], records[-1]["n"]) == (
+                    record["o"],
+                    record["n"],
+                ):
+                    if records.pop()["d"]:
+                        self.todo.pop(os.path.join(record["failed"], record["n"]), None)
+            elif "walk" in record:
+                walks.setdefault(os.path.dirname(record["walk"]), []).append(
+                    record["walk"]
+                )
+            elif "done" in record:
+                self.pending.pop(record["done"], None)
+                self.todo.pop(record["done"], None)
+                self.todo.update(dict.fromkeys(walks.pop(record["done"], ())))
+            elif "run" in record:
+                self.runs[record["root"]] = record["run"]
+
+    def discard_unapplied(self) -> None:
+        """حذف العمليات التي تم تسجيلها لكن لم يتم تنفيذها
+
+        كل مجلد يتم اعادة تسمية محتوياته من خيط واحد، لذلك اخر عملية فقط في كل
+        مجلد قد تكون لم تنفذ.
+        """
+        for parent, records in self.pending.items():
+            if not records:
+                continue
+            record = records[-1]
+            # الاسم الجديد قد يكون موجوداً مسبقاً اذ توقفت قبل تسجيل failed
+            if not os.path.lexists(
+                os.path.join(parent, record["n"])
+            ) or os.path.lexists(os.path.join(parent, record["o"])):
+                records.pop()
+                if record["d"]:
+                    self.todo.pop(os.path.join(parent, record["n"]), None)
+
+    def depth_of(self, path: Union[str, Path]) -> int:
+        """ارجاع عمق المجلد بالنسبة للمجلد الاساسي الذي يحتويه
+
+        المعطيات:
+            path (Union[str, Path]): المجلد
+
+        المخرجات:
+            int: العمق، 0 للمجلد الاساسي
+        """
+        path = os.fspath(path)
+        for root in self.header["directories"]:
+            if path.startswith(root.rstrip(os.sep) + os.sep):
+                return os.path.relpath(path, root).count(os.sep) + 1
+        return 0
+
+    def run_of(self, path: Union[str, Path]) -> Optional[int]:
+        """ارجاع رقم عملية قاعدة البيانات الخاصة بالمجلد
+
+        المعطيات:
+            path (Union[str, Path]): المجلد
+
+        المخرجات:
+            Optional[int]: رقم العملية، او None اذ لم يتم استخدام قاعدة بيانات
+        """
+        path = os.fspath(path)
+        for root, run in self.runs.items():
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                return run
+        return None
@@ -0,0 +1,364 @@
+import os
+from array import array
+from json import dump, dumps, loads
+from pathlib import Path, PurePath
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .api import DIRECTORY, FILE, RenameEvent, _timed
+from .data import DataFormat, RenameDataWriter
+from .dirfd import DirFdCache, rename_noreplace
+from .filters import EntryFilter
+from .index import DirNameIndex, NameIndex, RandomNameIndex
+from .snapshot import TreeSnapshot
+from .stats import Stats
+from .version import version
+
+__all__ = ("RenamePlan", "apply_plan", "build_plan")
+
+
+class RenamePlan:
+    """خطة اعادة تسمية كاملة يتم بناءها قبل تغيير اي شيء
+
+    المجلدات والعناصر محفوظة في مصفوفات متوازية بدلاً من كائن لكل عنصر:
+    كل مجلد له رقم المجلد الذي يحتويه واسمه بعد اعادة التسمية (المسار
+    الكامل للمجلدات الاساسية)، وكل عنصر له رقم المجلد الذي يحتويه ونوعه
+    واسمه القديم والجديد. العناصر بنفس ترتيب اعادة التسمية، لذلك المجلد
+    دائماً تتم اعادة تسميته قبل الوصول الى محتواه.
+
+    يتم حفظ الخطة بصيغة JSON Lines: سطر للخيارات، ثم سطر لكل مجلد، ثم سطر
+    لكل عنصر.
+    """
+
+    __slots__ = (
+        "options",
+        "dir_parents",
+        "dir_names",
+        "parents",
+        "kinds",
+        "old_names",
+        "new_names",
+    )
+
+    def __init__(self, options: Optional[dict] = None) -> None:
+        """
+        المعطيات:
+            options (Optional[dict], optional): خيارات حفظ البيانات (save_data و data_filename و data_format) التي يتم استخدامها عند التنفيذ. Defaults to None.
+        """
+        self.options = dict(options or {})
+        # رقم المجلد الذي يحتوي على المجلد، -1 للمجلدات الاساسية
+        self.dir_parents = array("q")
+        self.dir_names: List[str] = []
+        # رقم المجلد الذي يحتوي على العنصر
+        self.parents = array("q")
+        # 1 للمجلدات و 0 للملفات
+        self.kinds = array("b")
+        self.old_names: List[str] = []
+        self.new_names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.old_names)
+
+    @property
+    def directories(self) -> int:
+        """عدد المجلدات في الخطة، بما فيها المجلدات الاساسية"""
+        return len(self.dir_names)
+
+    def add_directory(self, parent: int, name: str) -> int:
+        """اضافة مجلد يتم المرور عليه
+
+        المعطيات:
+            parent (int): رقم المجلد الذي يحتويه، او -1 للمجلد الاساسي
+            name (str): اسمه بعد اعادة التسمية، او مساره الكامل للمجلد الاساسي
+
+        المخرجات:
+            int: رقم المجلد
+        """
+        self.dir_parents.append(parent)
+        self.dir_names.append(name)
+        return len(self.dir_names) - 1
+
+    def add(self, parent: int, old_name: str, new_name: str, is_dir: bool) -> None:
+        """اضافة عنصر يتم اعادة تسميته
+
+        المعطيات:
+            parent (int): رقم المجلد الذي يحتويه
+            old_name (str): الاسم الحالي
+            new_name (str): الاسم الجديد
+            is_dir (bool): هل العنصر مجلد
+        """
+        self.parents.append(parent)
+        self.kinds.append(is_dir)
+        self.old_names.append(old_name)
+        self.new_names.append(new_name)
+
+    def paths(self) -> List[str]:
+        """ارجاع مسار كل مجلد بعد اعادة تسميته، بنفس ترتيب ارقامها"""
+        paths: List[str] = []
+        for parent, name in zip(self.dir_parents, self.dir_names):
+            paths.append(name if parent < 0 else os.path.join(paths[parent], name))
+        return paths
+
+    def save(self, path: Union[str, Path]) -> None:
+        """حفظ الخطة في ملف
+
+        المعطيات:
+            path (Union[str, Path]): مسار الملف
+        """
+        with open(path, mode="w", encoding="utf-8") as f:
+            f.write(
+                dumps(
+                    {
+                        "frenamerPlan": version,
+                        "options": self.options,
+                        "directories": self.directories,
+                        "entries": len(self),
+                    }
+                )
+                + "\n"
+            )
+            for line in zip(self.dir_parents, self.dir_names):
+                f.write(dumps(line, ensure_ascii=False) + "\n")
+            for line in zip(self.parents, self.kinds, self.old_names, self.new_names):
+                f.write(dumps(line, ensure_ascii=False) + "\n")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "RenamePlan":
+        """قراءة خطة تم حفظها بـ save
+
+        المعطيات:
+            path (Union[str, Path]): مسار الملف
+
+        المخرجات:
+            RenamePlan: الخطة، يتم رفع ValueError اذ لم يكن الملف خطة صحيحة
+        """
+        with open(path, mode="r", encoding="utf-8") as f:
+            try:
+                header = loads(f.readline())
+            except ValueError:
+                header = None
+            if not (isinstance(header, dict) and "frenamerPlan" in header):
+                raise ValueError(f"Invalid frenamer plan: {os.fspath(path)}")
+            plan = cls(header.get("options"))
+            for _ in range(header["directories"]):
+                plan.add_directory(*loads(f.readline()))
+            for _ in range(header["entries"]):
+                parent, kind, old_name, new_name = loads(f.readline())
+                plan.add(parent, old_name, new_name, kind)
+        return plan
+
+
+def _plan_free(
+    present: Set[str],
+    index: Union[NameIndex, RandomNameIndex, DirNameIndex],
+    name: str,
+    suffix: Optional[str] = "",
+) -> str:
+    """اختيار الاسم الجديد بنفس طريقة _rename_free لكن بدون اعادة التسمية
+
+    الاسم الموجود في المجلد وليس في الفهرس (مثل ملف بنفس اسم مجلد) يبقى
+    محجوزاً ويتم تجربة الاسم التالي، كما يحدث عند اعادة التسمية.
+    """
+    while True:
+        new_name = f"{index.allocate()}{suffix}"
+        if new_name not in present:
+            break
+    present.discard(name)
+    present.add(new_name)
+    index.release(name)
+    return new_name
+
+
+def _plan_directory(
+    plan: RenamePlan,
+    number: int,
+    path: str,
+    depth: int,
+    snapshot: TreeSnapshot,
+    random: bool,
+    length: int,
+    entry_filter: Optional[EntryFilter],
+) -> List[Tuple[int, str, int]]:
+    """اضافة عناصر مجلد واحد الى الخطة بنفس ترتيب rename_directory
+
+    المخرجات:
+        List[Tuple[int, str, int]]: المجلدات الفرعية التي يتم المرور عليها (رقمها في الخطة، مسارها الحالي، عمقها)
+    """
+    _, dirs, files = snapshot.content(path)
+    present = set(dirs)
+    present.update(files)
+    if random:
+        index = dir_index = RandomNameIndex(dirs + files, length=length)
+    else:
+        # اسم المجلد بعد اعادة تسميته، مثل اعادة التسمية الفعلية
+        index = NameIndex(os.path.basename(plan.dir_names[number]), files)
+        dir_index = DirNameIndex(dirs)
+    kept_dirs: List[str] = []
+    if entry_filter is not None:
+        files = [file for file in files if entry_filter.accepts(file, False, depth + 1)]
+        accepted = {
+            sub_directory
+            for sub_directory in dirs
+            if entry_filter.accepts(sub_directory, True, depth + 1)
+        }
+        kept_dirs = [
+            sub_directory
+            for sub_directory in dirs
+            if sub_directory not in accepted
+            and not entry_filter.prunes(sub_directory, depth + 1)
+        ]
+        dirs = [sub_directory for sub_directory in dirs if sub_directory in accepted]
+    descends = entry_filter is None or entry_filter.descends(depth + 1)
+    sub_directories = (
+        [
+            (plan.add_directory(number, name), os.path.join(path, name), depth + 1)
+            for name in kept_dirs
+        ]
+        if descends
+        else []
+    )
+    for file in files:
+        suffix = "".join(PurePath(file).suffixes)
+        plan.add(number, file, _plan_free(present, index, file, suffix), False)
+    for sub_directory in dirs:
+        new_name = _plan_free(present, dir_index, sub_directory)
+        plan.add(number, sub_directory, new_name, True)
+        if descends:
+            sub_directories.append(
+                (
+                    plan.add_directory(number, new_name),
+                    os.path.join(path, sub_directory),
+                    depth + 1,
+                )
+            )
+    return sub_directories
+
+
+def build_plan(
+    directories: Iterable[Union[str, Path]],
+    random: Optional[bool] = False,
+    length: Optional[int] = 10,
+    entry_filter: Optional[EntryFilter] = None,
+    options: Optional[dict] = None,
+) -> RenamePlan:
+    """بناء خطة اعادة تسمية محتوى المجلدات بدون تغيير اي شيء
+
+    يتم قراءة كل مجلد مرة واحدة، واختيار الاسماء بنفس فهارس rename، لذلك
+    تنفيذ الخطة على نفس المجلدات ينتج نفس الاسماء الابجدية.
+
+    المعطيات:
+        directories (Iterable[Union[str, Path]]): المجلدات
+        random (Optional[bool], optional): اعادة التسمية باسماء عشوائية. Defaults to False.
+        length (Optional[int], optional): طول الاسم العشوائي. Defaults to 10.
+        entry_filter (Optional[EntryFilter], optional): تحديد العناصر التي يتم اعادة تسميتها والمجلدات التي يتم المرور عليها. Defaults to None.
+        options (Optional[dict], optional): خيارات حفظ البيانات التي يتم حفظها مع الخطة. Defaults to None.
+
+    المخرجات:
+        RenamePlan: الخطة
+    """
+    plan = RenamePlan(options)
+    with TreeSnapshot(dir_fds=True) as snapshot:
+        for directory in directories:
+            directory = os.path.abspath(directory)
+            # بدون استدعاء ذاتي مثل Renamer
+            pending = [(plan.add_directory(-1, directory), directory, 0)]
+            while pending:
+                number, path, depth = pending.pop()
+                pending.extend(
+                    reversed(
+                        _plan_directory(
+                            plan,
+                            number,
+                            path,
+                            depth,
+                            snapshot,
+                            random,
+                            length,
+                            entry_filter,
+                        )
+                    )
+                )
+    return plan
+
+
+def apply_plan(
+    plan: RenamePlan, stats: Optional[Stats] = None
+) -> Iterator[RenameEvent]:
+    """تنفيذ الخطة بدون قراءة اي مجلد او البحث عن الاسماء
+
+    اعادة التسمية لا تستبدل اي عنصر موجود، لذلك اذ تغير المجلد بعد بناء
+    الخطة يتم رفع FileExistsError او FileNotFoundError والتوقف، وملفات
+    البيانات تحتوي على العناصر التي تمت اعادة تسميتها قبل ذلك.
+
+    المعطيات:
+        plan (RenamePlan): الخطة
+        stats (Optional[Stats], optional): يتم قياس مدة اعادة التسمية وحفظ البيانات فيه. Defaults to None.
+
+    المخرجات:
+        Iterator[RenameEvent]: العمليات بنفس ترتيب تنفيذها
+    """
+    save_data = plan.options.get("save_data", False)
+    data_filename = plan.options.get("data_filename", "rename_data.json")
+    data_format = DataFormat(plan.options.get("data_format", DataFormat.json.value))
+    paths = plan.paths()
+    fds = DirFdCache() if DirFdCache.supported else None
+    current = -1
+    writer: Optional[RenameDataWriter] = None
+    # الصيغة القديمة تحتاج جميع الاسماء قبل كتابة الملف
+    names: List[dict] = []
+
+    def finish() -> None:
+        nonlocal writer
+        if writer is not None:
+            _timed(stats, "data", writer.close)
+            writer = None
+        elif names:
+            with open(
+                os.path.join(paths[current], data_filename), mode="w", encoding="utf-8"
+            ) as f:
+                obj = {"frenamerVersion": version, "names": names}
+                _timed(stats, "data", dump, obj, f, indent=4)
+            names.clear()
+
+    try:
+        for parent, is_dir, old_name, new_name in zip(
+            plan.parents, plan.kinds, plan.old_names, plan.new_names
+        ):
+            path = paths[parent]
+            if parent != current:
+                finish()
+                current = parent
+                if save_data and data_format is DataFormat.jsonl:
+                    writer = RenameDataWriter(os.path.join(path, data_filename))
+            # المجلد الفرعي تتم اعادة تسميته قبل فتح واصفه، لذلك لا تحتاج
+            # الواصفات الى تحديث
+            if fds is not None:
+                _timed(stats, "rename", fds.rename, path, old_name, new_name, True)
+            else:
+                _timed(
+                    stats,
+                    "rename",
+                    rename_noreplace,
+                    os.path.join(path, old_name),
+                    os.path.join(path, new_name),
+                )
+            if stats is not None:
+                stats.count("renames")
+            if save_data:
+                name = (
+                    {"old_name": old_name, "new_name": new_name}
+                    if is_dir
+                    else {"old": old_name, "new": new_name}
+                )
+                if writer is not None:
+                    _timed(stats, "data", writer.write, name)
+                else:
+                    names.append(name)
+            yield RenameEvent(
+                os.path.join(path, old_name),
+                os.path.join(path, new_name),
+                DIRECTORY if is_dir else FILE,
+            )
+    finally:
+        finish()
+        if fds is not None:
+            fds.close()
@@ -0,0 +1,227 @@
+from queue import Empty, Full, Queue
+from threading import Thread
+from time import monotonic
+from typing import List, Optional
+
+import typer
+
+__all__ = ("Reporter",)
+
+# انواع الاحداث التي يتم ارسالها الى خيط الطباعة
+_DIRECTORY = 0
+_RENAME = 1
+_MESSAGE = 2
+_STEP = 3
+_STOP = 4
+
+_DIRECTORY_WORD = "Directory: "
+_RENAME_WORD = " Rename "
+_TO_WORD = " to "
+# اقصى عدد من الاحداث التي تنتظر الطباعة، لكي لا تزيد الذاكرة بدون حد اذ
+# كانت الطباعة ابطأ من اعادة التسمية
+_MAX_PENDING = 64 * 1024
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}"
+
+
+class Reporter:
+    """طباعة نتائج اعادة التسمية من خيط منفصل
+
+    يتم تجميع الاسطر وكتابتها دفعة واحدة بدلاً من استدعاء typer.echo لكل عنصر،
+    او عرض سطر واحد يوضح التقدم والسرعة والوقت المتبقي، مع امكانية حفظ
+    جميع الاسطر في ملف. اذ حدث خطأ في خيط الطباعة (مثل BrokenPipeError او
+    خطأ في كتابة السجل) يتم رفعه مع اضافة الحدث التالي ومن close، لكي تتوقف
+    اعادة التسمية بدلاً من ضياع النتائج.
+    """
+
+    def __init__(
+        self,
+        quiet: Optional[bool] = False,
+        progress: Optional[bool] = False,
+        log_file: Optional[str] = None,
+        total: Optional[int] = None,
+        batch_size: Optional[int] = 4096,
+        interval: Optional[float] = 0.2,
+    ) -> None:
+        """
+        المعطيات:
+            quiet (Optional[bool], optional): عدم طباعة العناصر التي تمت اعادة تسميتها. Defaults to False.
+            progress (Optional[bool], optional): عرض سطر التقدم بدلاً من طباعة العناصر. Defaults to False.
+            log_file (Optional[str], optional): ملف يتم حفظ جميع الاسطر فيه. Defaults to None.
+            total (Optional[int], optional): عدد المجلدات المتوقع، يستخدم لحساب الوقت المتبقي. Defaults to None.
+            batch_size (Optional[int], optional): اكبر عدد من الاسطر يتم كتابته دفعة واحدة. Defaults to 4096.
+            interval (Optional[float], optional): اقل مدة بالثواني بين تحديثين لسطر التقدم. Defaults to 0.2.
+        """
+        self.quiet = quiet
+        self.progress = progress and not quiet
+        self.total = total
+        self.entries: int = 0
+        self.steps: int = 0
+        # المدة التي تم قضائها في كتابة الاسطر
+        self.output_seconds: float = 0.0
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: Queue = Queue(maxsize=_MAX_PENDING)
+        # الخطأ الذي اوقف خيط الطباعة
+        self.error: Optional[BaseException] = None
+        self._raised = False
+        self._log = open(log_file, mode="w", encoding="utf-8") if log_file else None
+        self._progress_width: int = 0
+        self._start_time = monotonic()
+        self._thread = Thread(target=self._run, name="frenamer-reporter", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "Reporter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def directory(self, path: str) -> None:
+        """اضافة مسار مجلد
+
+        المعطيات:
+            path (str): مسار المجلد
+        """
+        self._put((_DIRECTORY, path, None))
+
+    def renamed(self, old_name: str, new_name: str) -> None:
+        """اضافة عنصر تمت اعادة تسميته
+
+        المعطيات:
+            old_name (str): الاسم القديم
+            new_name (str): الاسم الجديد
+        """
+        self._put((_RENAME, old_name, new_name))
+
+    def message(self, text: str, fg: Optional[str] = None) -> None:
+        """اضافة رسالة يتم طباعتها دائماً، مثل التحذيرات
+
+        المعطيات:
+            text (str): الرسالة
+            fg (Optional[str], optional): لون الرسالة. Defaults to None.
+        """
+        self._put((_MESSAGE, text, fg))
+
+    def step(self) -> None:
+        """الانتهاء من مجلد، يستخدم لحساب الوقت المتبقي"""
+        self._put((_STEP, None, None))
+
+    def close(self) -> None:
+        """انتظار طباعة جميع الاسطر واغلاق ملف السجل، ورفع خطأ خيط الطباعة ان وجد"""
+        try:
+            if self._thread.is_alive():
+                self._put((_STOP, None, None))
+                self._thread.join()
+        finally:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+        # الخطأ الذي تم رفعه مسبقاً اثناء اعادة التسمية لا يتم رفعه مرة اخرى
+        if not self._raised:
+            self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self.error is not None:
+            self._raised = True
+            raise self.error
+
+    def _put(self, item: tuple) -> None:
+        # الانتظار اذ كانت الطباعة متأخرة، مع التوقف اذ توقف خيط الطباعة
+        while True:
+            self._raise_error()
+            try:
+                self._queue.put(item, timeout=self.interval)
+                return
+            except Full:
+                if not self._thread.is_alive():
+                    self._raise_error()
+                    return
+
+    def _run(self) -> None:
+        try:
+            self._write_batches()
+        except BaseException as error:
+            self.error = error
+
+    def _write_batches(self) -> None:
+        echo = not (self.quiet or self.progress)
+        rename_word = typer.style(_RENAME_WORD, fg="yellow")
+        to_word = typer.style(_TO_WORD, fg="yellow")
+        last_draw = 0.0
+        stop = False
+        while not stop:
+            try:
+                batch = [
+                    self._queue.get(timeout=self.interval if self.progress else None)
+                ]
+            except Empty:
+                batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+
+            lines: List[str] = []
+            log_lines: List[str] = []
+            for kind, first, second in batch:
+                if kind == _RENAME:
+                    self.entries += 1
+                    if echo:
+                        lines.append(rename_word + first + to_word + second)
+                    if self._log is not None:
+                        log_lines.append(_RENAME_WORD + first + _TO_WORD + second)
+                elif kind == _DIRECTORY:
+                    if echo:
+                        lines.append(
+                            typer.style(_DIRECTORY_WORD + first, fg=typer.colors.CYAN)
+                        )
+                    if self._log is not None:
+                        log_lines.append(_DIRECTORY_WORD + first)
+                elif kind == _MESSAGE:
+                    self._clear_progress()
+                    lines.append(typer.style(first, fg=second) if second else first)
+                    if self._log is not None:
+                        log_lines.append(first)
+                elif kind == _STEP:
+                    self.steps += 1
+                else:
+                    stop = True
+
+            start = monotonic()
+            if lines:
+                typer.echo("\n".join(lines))
+            if log_lines:
+                self._log.write("\n".join(log_lines) + "\n")
+            self.output_seconds += monotonic() - start
+            if self.progress and (stop or monotonic() - last_draw >= self.interval):
+                last_draw = monotonic()
+                self._draw_progress(last_draw)
+        if self.progress:
+            typer.echo(err=True)
+
+    def _progress_line(self, now: float) -> str:
+        elapsed = max(now - self._start_time, 1e-9)
+        line = f"Renamed {self.entries} entries ({round(self.entries / elapsed)}/s)"
+        if self.total:
+            line += f", {self.steps}/{self.total} directories"
+            if self.steps:
+                remaining = elapsed / self.steps * max(self.total - self.steps, 0)
+                line += f", ETA {_format_seconds(remaining)}"
+        return line
+
+    def _draw_progress(self, now: float) -> None:
+        line = self._progress_line(now)
+        padding = " " * max(self._progress_width - len(line), 0)
+        self._progress_width = len(line)
+        typer.echo("\r" + line + padding, nl=False, err=True)
+
+    def _clear_progress(self) -> None:
+        if self.progress and self._progress_width:
+            typer.echo("\r" + " " * self._progress_width + "\r", nl=False, err=True)
+            self._progress_width = 0
@@ -0,0 +1,384 @@
+import os
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .dirfd import DirFdCache, rename_noreplace
+
+__all__ = ("TreeSnapshot",)
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+# انواع العناصر في المجلد
+FILE = 0
+DIR = 1
+# رابط رمزي لمجلد، يعامل كمجلد لكن لا يتم الدخول اليه في walk مثل os.walk
+DIR_LINK = 2
+
+
+def _scan(
+    path: Union[str, int], inodes: Optional[Dict[str, int]] = None
+) -> Dict[str, int]:
+    entries: Dict[str, int] = {}
+    with os.scandir(path) as it:
+        for entry in it:
+            if inodes is not None:
+                # من d_ino بدون stat
+                inodes[entry.name] = entry.inode()
+            try:
+                if entry.is_dir():
+                    entries[entry.name] = DIR_LINK if entry.is_symlink() else DIR
+                else:
+                    entries[entry.name] = FILE
+            except OSError:
+                entries[entry.name] = FILE
+    return entries
+
+
+class TreeSnapshot:
+    """صورة لمحتوى المجلدات يتم قرائتها باستخدام os.scandir مرة واحدة لكل مجلد
+
+    يتم تحديث الصورة مع كل اعادة تسمية بدلاً من اعادة قراءة المجلد، ويتم حفظ
+    نوع العنصر من DirEntry لكي لا نحتاج الى stat او is_dir بعد ذلك.
+
+    مع dir_fds تتم القراءة واعادة التسمية بالنسبة لواصف كل مجلد (DirFdCache)
+    بدلاً من المسار الكامل، اذ كان النظام يدعم ذلك. يجب استدعاء close بعد
+    الانتهاء لاغلاق الواصفات.
+
+    مع inodes يتم حفظ رقم inode لكل عنصر من نفس القراءة، ويتم نقله مع العنصر
+    عند اعادة تسميته. في ويندوز لا يتم حفظها لان DirEntry.inode يحتاج stat.
+    """
+
+    __slots__ = (
+        "_listings",
+        "_inodes",
+        "_lock",
+        "scans",
+        "saved_listings",
+        "saved_stats",
+        "fds",
+    )
+
+    def __init__(
+        self,
+        dir_fds: Optional[bool] = False,
+        max_fds: Optional[int] = 64,
+        inodes: Optional[bool] = False,
+    ) -> None:
+        """
+        المعطيات:
+            dir_fds (Optional[bool], optional): استخدام واصفات المجلدات بدلاً من المسارات الكاملة. Defaults to False.
+            max_fds (Optional[int], optional): اقصى عدد من واصفات المجلدات المفتوحة. Defaults to 64.
+            inodes (Optional[bool], optional): حفظ رقم inode لكل عنصر. Defaults to False.
+        """
+        # المسار -> {اسم العنصر: نوعه}
+        self._listings: Dict[str, Dict[str, int]] = {}
+        # المسار -> {اسم العنصر: رقم inode}، نفس مفاتيح _listings
+        self._inodes: Optional[Dict[str, Dict[str, int]]] = (
+            {} if inodes and os.name != "nt" else None
+        )
+        # يمكن مشاركة الصورة بين اكثر من خيط، كل مجلد يعدل من خيط واحد فقط
+        # لكن العدادات مشتركة
+        self._lock = Lock()
+        # عدد مرات قراءة المجلدات
+        self.scans: int = 0
+        # عدد مرات القراءة التي تم توفيرها
+        self.saved_listings: int = 0
+        # عدد مرات stat التي تم توفيرها
+        self.saved_stats: int = 0
+        self.fds: Optional[DirFdCache] = (
+            DirFdCache(max_fds) if dir_fds and DirFdCache.supported else None
+        )
+
+    @property
+    def saved(self) -> int:
+        """اجمالي استدعاءات النظام التي تم توفيرها"""
+        return self.saved_listings + self.saved_stats
+
+    @staticmethod
+    def _key(path: PathLike) -> str:
+        return os.path.normpath(os.fspath(path))
+
+    def _scan(self, key: str) -> Dict[str, int]:
+        inodes: Optional[Dict[str, int]] = None if self._inodes is None else {}
+        if self.fds is None:
+            entries = _scan(key, inodes)
+        else:
+            with self.fds.lease(key) as fd:
+                entries = _scan(fd, inodes)
+        with self._lock:
+            self.scans += 1
+        self._listings[key] = entries
+        if inodes is not None:
+            self._inodes[key] = inodes
+        return entries
+
+    def entries(self, path: PathLike) -> Dict[str, int]:
+        """ارجاع عناصر المجلد مع انواعها
+
+        المعطيات:
+            path (PathLike): مسار المجلد
+
+        المخرجات:
+            Dict[str, int]: اسم العنصر ونوعه
+        """
+        key = self._key(path)
+        entries = self._listings.get(key)
+        if entries is None:
+            return self._scan(key)
+        with self._lock:
+            self.saved_listings += 1
+        return entries
+
+    def inodes(self, path: PathLike) -> Optional[Dict[str, int]]:
+        """ارجاع ارقام inode لعناصر المجلد من نفس قراءة entries
+
+        المعطيات:
+            path (PathLike): مسار المجلد
+
+        المخرجات:
+            Optional[Dict[str, int]]: اسم العنصر ورقم inode الخاص به، او None اذ لم يتم حفظها
+        """
+        if self._inodes is None:
+            return None
+        key = self._key(path)
+        inodes = self._inodes.get(key)
+        if inodes is None:
+            self.entries(key)
+            inodes = self._inodes.get(key)
+        return inodes
+
+    def inode(self, path: PathLike) -> Optional[int]:
+        """ارجاع رقم inode المحفوظ للعنصر بدون قراءة المجلد او stat
+
+        المعطيات:
+            path (PathLike): مسار العنصر
+
+        المخرجات:
+            Optional[int]: رقم inode، او None اذ لم يكن معروفاً
+        """
+        if self._inodes is None:
+            return None
+        parent, name = os.path.split(self._key(path))
+        inodes = self._inodes.get(parent)
+        return inodes.get(name) if inodes is not None else None
+
+    def content(self, path: PathLike) -> Tuple[str, List[str], List[str]]:
+        """ارجاع محتوى المجلد بنفس شكل get_dir_content
+
+        المعطيات:
+            path (PathLike): مسار المجلد
+
+        المخرجات:
+            Tuple[str, List[str], List[str]]: مسار المجلد، المجلدات التي يحتويها، الملفات التي يحتويها
+        """
+        entries = self.entries(path)
+        dirs = [name for name, kind in entries.items() if kind != FILE]
+        files = [name for name, kind in entries.items() if kind == FILE]
+        return os.fspath(path), dirs, files
+
+    def is_dir(self, path: PathLike) -> bool:
+        """هل المسار مجلد، يتم استخدام نوع العنصر المحفوظ بدلاً من stat
+
+        المعطيات:
+            path (PathLike): المسار
+
+        المخرجات:
+            bool: هل المسار مجلد
+        """
+        key = self._key(path)
+        parent, name = os.path.split(key)
+        entries = self._listings.get(parent)
+        if entries is None or name not in entries:
+            return os.path.isdir(key)
+        with self._lock:
+            self.saved_stats += 1
+        return entries[name] != FILE
+
+    def walk(
+        self,
+        path: PathLike,
+        topdown: Optional[bool] = True,
+        prune: Optional[Callable[[str, int], bool]] = None,
+    ) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """مثل os.walk لكن يقرأ كل مجلد مرة واحدة فقط ويحفظه في الصورة
+
+        المعطيات:
+            path (PathLike): المجلد المراد المرور عليه
+            topdown (Optional[bool], optional): ارجاع المجلد قبل محتوياته. Defaults to True.
+            prune (Optional[Callable[[str, int], bool]], optional): يتم استدعائها باسم وعمق كل مجلد فرعي، ولا تتم قراءة المجلد اذ ارجعت True. Defaults to None.
+        """
+        stack: List[Tuple[str, bool, int]] = [(os.fspath(path), False, 0)]
+        while stack:
+            root, visited, depth = stack.pop()
+            if visited:
+                yield self.content(root)
+                continue
+            try:
+                entries = self.entries(root)
+            except OSError:
+                continue
+            if topdown:
+                yield self.content(root)
+            else:
+                stack.append((root, True, depth))
+            stack.extend(
+                (os.path.join(root, name), False, depth + 1)
+                for name, kind in reversed(list(entries.items()))
+                if kind == DIR and (prune is None or not prune(name, depth + 1))
+            )
+
+    def add(self, path: PathLike, is_dir: Optional[bool] = False) -> None:
+        """اضافة عنصر جديد الى الصورة
+
+        المعطيات:
+            path (PathLike): مسار العنصر
+            is_dir (Optional[bool], optional): هل العنصر مجلد. Defaults to False.
+        """
+        parent, name = os.path.split(self._key(path))
+        entries = self._listings.get(parent)
+        if entries is not None:
+            entries[name] = DIR if is_dir else FILE
+        self._pop_inode(parent, name)
+
+    def remove(self, path: PathLike) -> None:
+        """حذف عنصر من الصورة
+
+        المعطيات:
+            path (PathLike): مسار العنصر
+        """
+        key = self._key(path)
+        parent, name = os.path.split(key)
+        entries = self._listings.get(parent)
+        if entries is not None:
+            entries.pop(name, None)
+        self._pop_inode(parent, name)
+        self._forget(key)
+
+    def rename(self, src: PathLike, dst: PathLike) -> None:
+        """تحديث الصورة بعد اعادة تسمية عنصر
+
+        المعطيات:
+            src (PathLike): المسار القديم
+            dst (PathLike): المسار الجديد
+        """
+        src_key, dst_key = self._key(src), self._key(dst)
+        src_parent, src_name = os.path.split(src_key)
+        dst_parent, dst_name = os.path.split(dst_key)
+        src_entries = self._listings.get(src_parent)
+        kind = src_entries.pop(src_name, None) if src_entries is not None else None
+        inode = self._pop_inode(src_parent, src_name)
+        dst_entries = self._listings.get(dst_parent)
+        if dst_entries is not None:
+            if kind is None:
+                kind = DIR if os.path.isdir(dst_key) else FILE
+            # الهدف يتم استبداله ان كان موجوداً
+            self._forget(dst_key)
+            dst_entries[dst_name] = kind
+            self._pop_inode(dst_parent, dst_name)
+            if inode is not None and dst_parent in self._inodes:
+                self._inodes[dst_parent][dst_name] = inode
+        if kind != FILE:
+            self._move(src_key, dst_key)
+            if self.fds is not None:
+                self.fds.moved(src_key, dst_key)
+
+    def rename_entry(
+        self,
+        directory: PathLike,
+        old_name: str,
+        new_name: str,
+        noreplace: Optional[bool] = False,
+    ) -> str:
+        """اعادة تسمية عنصر داخل المجلد وتحديث الصورة
+
+        يتم استخدام واصف المجلد ان وجد، والا المسار الكامل.
+
+        المعطيات:
+            directory (PathLike): المجلد الذي يحتوي على العنصر
+            old_name (str): الاسم الحالي
+            new_name (str): الاسم الجديد
+            noreplace (Optional[bool], optional): رفع FileExistsError بدلاً من استبدال العنصر الموجود بالاسم الجديد، ويتم اضافته الى الصورة. Defaults to False.
+
+        المخرجات:
+            str: المسار الجديد
+        """
+        directory = os.fspath(directory)
+        src = os.path.join(directory, old_name)
+        dst = os.path.join(directory, new_name)
+        try:
+            if self.fds is not None:
+                self.fds.rename(directory, old_name, new_name, noreplace)
+            elif noreplace:
+                rename_noreplace(src, dst)
+            else:
+                os.rename(src, dst)
+        except FileExistsError:
+            # عنصر لم يكن موجوداً عند قراءة المجلد
+            self.add(dst, is_dir=os.path.isdir(dst))
+            raise
+        self.rename(src, dst)
+        return dst
+
+    def remove_entry(self, directory: PathLike, name: str) -> None:
+        """حذف ملف داخل المجلد وتحديث الصورة
+
+        المعطيات:
+            directory (PathLike): المجلد الذي يحتوي على الملف
+            name (str): اسم الملف
+        """
+        directory = os.fspath(directory)
+        if self.fds is None:
+            os.remove(os.path.join(directory, name))
+        else:
+            self.fds.remove(directory, name)
+        self.remove(os.path.join(directory, name))
+
+    def close(self) -> None:
+        """اغلاق واصفات المجلدات ان وجدت"""
+        if self.fds is not None:
+            self.fds.close()
+
+    def __enter__(self) -> "TreeSnapshot":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _pop_inode(self, parent: str, name: str) -> Optional[int]:
+        """حذف رقم inode الخاص بالعنصر من الصورة وارجاعه"""
+        if self._inodes is None:
+            return None
+        inodes = self._inodes.get(parent)
+        return inodes.pop(name, None) if inodes is not None else None
+
+    def _forget(self, key: str) -> None:
+        """حذف المجلد وجميع المجلدات التي بداخله من الصورة"""
+        stack = [key]
+        while stack:
+            current = stack.pop()
+            entries = self._listings.pop(current, None)
+            if self._inodes is not None:
+                self._inodes.pop(current, None)
+            if entries:
+                stack.extend(
+                    os.path.join(current, name)
+                    for name, kind in entries.items()
+                    if kind != FILE
+                )
+
+    def _move(self, src_key: str, dst_key: str) -> None:
+        """نقل المجلد وجميع المجلدات التي بداخله الى المسار الجديد في الصورة"""
+        stack = [(src_key, dst_key)]
+        while stack:
+            old, new = stack.pop()
+            entries = self._listings.pop(old, None)
+            if entries is None:
+                continue
+            self._listings[new] = entries
+            if self._inodes is not None and old in self._inodes:
+                self._inodes[new] = self._inodes.pop(old)
+            stack.extend(
+                (os.path.join(old, name), os.path.join(new, name))
+                for name, kind in entries.items()
+                if kind != FILE
+            )
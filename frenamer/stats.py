@@ -0,0 +1,173 @@
+import sys
+from heapq import heappush, heappushpop
+from json import dumps
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple, Union
+
+__all__ = ("Stats",)
+
+# المراحل التي يتم قياس مدتها
+# listing: قراءة محتوى المجلدات
+# naming: اختيار الاسماء الجديدة
+# rename: اعادة التسمية نفسها
+# data: كتابة وقراءة ملفات البيانات
+# store: الحفظ في قاعدة البيانات
+# journal: الكتابة في سجل العمليات
+# output: تجهيز الاسطر وارسالها للطباعة
+# console: كتابة الاسطر في الشاشة او ملف السجل (من خيط الطباعة)
+PHASES = (
+    "listing",
+    "naming",
+    "rename",
+    "data",
+    "store",
+    "journal",
+    "output",
+    "console",
+)
+# collisions: الاسماء التي تمت تجربتها ووجدت موجودة عند اعادة التسمية
+COUNTERS = (
+    "listings",
+    "renames",
+    "collisions",
+    "stats",
+    "data_bytes",
+    "entries",
+    "directories",
+)
+
+
+class Stats:
+    """قياس مدة كل مرحلة وعدد استدعاءات النظام اثناء اعادة التسمية او التراجع عنها
+
+    يتم تمريره الى dir_renamer او unrename_from_json وغيرها بنفس طريقة reporter،
+    ويمكن وراثته وتعديل on_directory لمتابعة المجلدات اثناء العمل. المدد يتم
+    جمعها من جميع الخيوط عند استخدام --jobs، لذلك قد يكون مجموعها اكبر من
+    المدة الكلية.
+    """
+
+    def __init__(self, slowest: Optional[int] = 10) -> None:
+        """
+        المعطيات:
+            slowest (Optional[int], optional): عدد المجلدات الابطأ التي يتم حفظها. Defaults to 10.
+        """
+        self.slowest = slowest
+        self.phases: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        # عدد مرات القراءة و stat التي تم توفيرها بواسطة TreeSnapshot
+        self.saved_syscalls: int = 0
+        self._lock = Lock()
+        # اسرع مجلد من المجلدات الابطأ في البداية (min-heap)
+        self._slowest: List[Tuple[float, int, str]] = []
+        self._start = perf_counter()
+        self._end: Optional[float] = None
+
+    @staticmethod
+    def clock() -> float:
+        """الوقت الحالي المستخدم في القياس"""
+        return perf_counter()
+
+    def lap(self, phase: str, start: float) -> float:
+        """اضافة المدة منذ start الى المرحلة وارجاع الوقت الحالي
+
+        المعطيات:
+            phase (str): اسم المرحلة
+            start (float): وقت بداية المرحلة من clock
+
+        المخرجات:
+            float: الوقت الحالي، يستخدم كبداية للمرحلة التالية
+        """
+        now = perf_counter()
+        with self._lock:
+            self.phases[phase] += now - start
+        return now
+
+    def count(self, counter: str, value: Optional[int] = 1) -> None:
+        """زيادة العداد
+
+        المعطيات:
+            counter (str): اسم العداد
+            value (Optional[int], optional): مقدار الزيادة. Defaults to 1.
+        """
+        with self._lock:
+            self.counters[counter] += value
+
+    def directory(self, path: str, seconds: float, entries: int) -> None:
+        """الانتهاء من مجلد
+
+        المعطيات:
+            path (str): مسار المجلد
+            seconds (float): المدة التي استغرقها المجلد
+            entries (int): عدد العناصر التي تمت اعادة تسميتها فيه
+        """
+        with self._lock:
+            self.counters["directories"] += 1
+            self.counters["entries"] += entries
+            if self.slowest:
+                item = (seconds, entries, path)
+                if len(self._slowest) < self.slowest:
+                    heappush(self._slowest, item)
+                else:
+                    heappushpop(self._slowest, item)
+        self.on_directory(path, seconds, entries)
+
+    def on_directory(self, path: str, seconds: float, entries: int) -> None:
+        """يتم استدعائها بعد الانتهاء من كل مجلد، يمكن تعديلها عند الوراثة
+
+        المعطيات:
+            path (str): مسار المجلد
+            seconds (float): المدة التي استغرقها المجلد
+            entries (int): عدد العناصر التي تمت اعادة تسميتها فيه
+        """
+
+    def finish(self, snapshot=None, reporter=None) -> None:
+        """انهاء القياس واضافة عدادات الصورة وخيط الطباعة
+
+        المعطيات:
+            snapshot (Optional[TreeSnapshot], optional): صورة المجلدات المستخدمة. Defaults to None.
+            reporter (Optional[Reporter], optional): خيط الطباعة المستخدم. Defaults to None.
+        """
+        self._end = perf_counter()
+        if snapshot is not None:
+            self.counters["listings"] += snapshot.scans
+            self.saved_syscalls += snapshot.saved
+        if reporter is not None:
+            self.phases["console"] += reporter.output_seconds
+
+    def report(self) -> dict:
+        """ارجاع النتائج
+
+        المخرجات:
+            dict: المدة الكلية، مدة كل مرحلة، العدادات، عدد العناصر في الثانية، المجلدات الابطأ
+        """
+        wall = (self._end or perf_counter()) - self._start
+        return {
+            "wall_seconds": round(wall, 6),
+            "phases": {
+                phase: round(seconds, 6) for phase, seconds in self.phases.items()
+            },
+            "counters": dict(self.counters),
+            "saved_syscalls": self.saved_syscalls,
+            "entries_per_second": (
+                round(self.counters["entries"] / wall, 2) if wall else 0
+            ),
+            "slowest_directories": [
+                {"path": path, "seconds": round(seconds, 6), "entries": entries}
+                for seconds, entries, path in sorted(self._slowest, reverse=True)
+            ],
+        }
+
+    def write(self, file: Union[str, Path]) -> None:
+        """كتابة النتائج بصيغة JSON
+
+        المعطيات:
+            file (Union[str, Path]): مسار الملف، او '-' للطباعة في stderr
+        """
+        output = dumps(self.report(), indent=4, ensure_ascii=False)
+        if file == "-":
+            sys.stderr.write(output + "\n")
+        else:
+            with open(file, "w", encoding="utf-8") as f:
+                f.write(output + "\n")
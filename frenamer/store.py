@@ -0,0 +1,289 @@
+import os
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Iterator, List, Optional, Tuple, Union
+
+from .data import name_pair
+from .version import version
+
+__all__ = ("SQLiteStore", "open_store", "parse_store")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    root TEXT NOT NULL,
+    frenamer_version TEXT NOT NULL,
+    created REAL NOT NULL,
+    unrenamed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS names (
+    run INTEGER NOT NULL REFERENCES runs (id),
+    parent TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    new_name TEXT NOT NULL,
+    old_name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    PRIMARY KEY (run, parent, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS names_lookup ON names (parent, new_name, run);
+CREATE INDEX IF NOT EXISTS names_order ON names (run, depth, parent, seq);
+"""
+
+
+def parse_store(spec: str) -> str:
+    """ارجاع مسار قاعدة البيانات من النص المعطى، مثل 'sqlite:rename_data.db'
+
+    المعطيات:
+        spec (str): نوع المخزن ومساره
+
+    المخرجات:
+        str: مسار قاعدة البيانات
+    """
+    kind, sep, path = spec.partition(":")
+    if kind != "sqlite" or not sep or not path:
+        raise ValueError(f"Invalid store '{spec}', the supported store is sqlite:PATH")
+    return path
+
+
+def open_store(spec: str) -> "SQLiteStore":
+    """فتح مخزن الاسماء من النص المعطى، مثل 'sqlite:rename_data.db'
+
+    المعطيات:
+        spec (str): نوع المخزن ومساره
+
+    المخرجات:
+        SQLiteStore: المخزن
+    """
+    return SQLiteStore(parse_store(spec))
+
+
+class SQLiteStore:
+    """حفظ الاسماء القديمة والجديدة في قاعدة بيانات SQLite واحدة
+
+    بدلاً من ملف جيسون في كل مجلد، يتم حفظ جميع الاسماء في جدول واحد مفهرس
+    بالمسار الاب والاسم الجديد، ويتم اضافة الاسماء على دفعات داخل transaction.
+    """
+
+    def __init__(
+        self, path: Union[str, Path], batch_size: Optional[int] = 10000
+    ) -> None:
+        """
+        المعطيات:
+            path (Union[str, Path]): مسار قاعدة البيانات
+            batch_size (Optional[int], optional): عدد الاسماء التي يتم اضافتها في كل transaction. Defaults to 10000.
+        """
+        self.path = os.fspath(path)
+        self.batch_size = batch_size
+        # يمكن الاضافة من اكثر من خيط عند استخدام --jobs
+        self._lock = Lock()
+        self._rows: List[tuple] = []
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "SQLiteStore":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def start_run(self, root: Union[str, Path]) -> int:
+        """بدء عملية اعادة تسمية جديدة
+
+        المعطيات:
+            root (Union[str, Path]): المجلد الذي سوف يتم اعادة تسمية محتوياته
+
+        المخرجات:
+            int: رقم العملية
+        """
+        with self._lock, self._connection:
+            return self._connection.execute(
+                "INSERT INTO runs (root, frenamer_version, created) VALUES (?, ?, ?)",
+                (os.path.normpath(os.fspath(root)), version, time()),
+            ).lastrowid
+
+    def add(
+        self,
+        run: int,
+        parent: Union[str, Path],
+        names: List[dict],
+        start: Optional[int] = 0,
+    ) -> None:
+        """اضافة اسماء من مجلد واحد
+
+        المعطيات:
+            run (int): رقم العملية
+            parent (Union[str, Path]): المجلد الذي يحتوي على العناصر
+            names (List[dict]): الاسماء بنفس شكل ملف الجيسون وبنفس ترتيب اعادة التسمية
+            start (Optional[int], optional): ترتيب اول اسم داخل المجلد. Defaults to 0.
+        """
+        parent = os.path.normpath(os.fspath(parent))
+        depth = parent.count(os.sep)
+        rows = []
+        for seq, name in enumerate(names, start):
+            old_name, new_name = name_pair(name)
+            rows.append(
+                (run, parent, seq, depth, new_name, old_name, int("old_name" in name))
+            )
+        with self._lock:
+            self._rows.extend(rows)
+            if len(self._rows) >= self.batch_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._rows:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO names VALUES (?, ?, ?, ?, ?, ?, ?)", self._rows
+                )
+            self._rows = []
+
+    def flush(self) -> None:
+        """حفظ الاسماء المتبقية في قاعدة البيانات"""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """حفظ الاسماء المتبقية واغلاق قاعدة البيانات"""
+        self.flush()
+        self._connection.close()
+
+    def runs(self, directory: Union[str, Path]) -> List[int]:
+        """ارجاع العمليات التي لم يتم التراجع عنها داخل المجلد، الاحدث اولاً
+
+        المعطيات:
+            directory (Union[str, Path]): المجلد
+
+        المخرجات:
+            List[int]: ارقام العمليات
+        """
+        directory = os.path.normpath(os.fspath(directory))
+        prefix = directory.rstrip(os.sep) + os.sep
+        self.flush()
+        return [
+            run
+            for run, in self._connection.execute(
+                "SELECT id FROM runs WHERE unrenamed = 0"
+                " AND (root = ? OR substr(root, 1, ?) = ?) ORDER BY id DESC",
+                (directory, len(prefix), prefix),
+            )
+        ]
+
+    def names(self, run: int) -> Iterator[Tuple[str, str, str, bool]]:
+        """ارجاع اسماء العملية بالترتيب الذي يجب التراجع به، الاعمق اولاً
+        ثم عكس ترتيب اعادة التسمية داخل كل مجلد
+
+        المعطيات:
+            run (int): رقم العملية
+
+        المخرجات:
+            Iterator[Tuple[str, str, str, bool]]: المجلد، الاسم الجديد، الاسم القديم، هل هو مجلد
+        """
+        self.flush()
+        for parent, new_name, old_name, is_dir in self._connection.execute(
+            "SELECT parent, new_name, old_name, is_dir FROM names WHERE run = ?"
+            " ORDER BY depth DESC, parent, seq DESC",
+            (run,),
+        ):
+            yield parent, new_name, old_name, bool(is_dir)
+
+    def directories_count(self, run: int) -> int:
+        """عدد المجلدات التي تم حفظ اسماء محتوياتها في العملية
+
+        المعطيات:
+            run (int): رقم العملية
+
+        المخرجات:
+            int: عدد المجلدات
+        """
+        self.flush()
+        return self._connection.execute(
+            "SELECT COUNT(DISTINCT parent) FROM names WHERE run = ?", (run,)
+        ).fetchone()[0]
+
+    def old_name(
+        self, path: Union[str, Path], run: Optional[int] = None
+    ) -> Optional[str]:
+        """ارجاع الاسم القديم للعنصر، مثل 'ماذا كان اسم هذا الملف'
+
+        المعطيات:
+            path (Union[str, Path]): المسار الحالي للعنصر
+            run (Optional[int], optional): رقم العملية، يتم استخدام احدث عملية اذ لم يعطى. Defaults to None.
+
+        المخرجات:
+            Optional[str]: الاسم القديم، او None اذ لم يتم اعادة تسميته
+        """
+        parent, name = os.path.split(os.path.normpath(os.fspath(path)))
+        self.flush()
+        if run is None:
+            row = self._connection.execute(
+                "SELECT old_name FROM names WHERE parent = ? AND new_name = ?"
+                " ORDER BY run DESC LIMIT 1",
+                (parent, name),
+            ).fetchone()
+        else:
+            row = self._connection.execute(
+                "SELECT old_name FROM names WHERE parent = ? AND new_name = ? AND run = ?",
+                (parent, name, run),
+            ).fetchone()
+        return row[0] if row else None
+
+    def unrename_path(self, path: Union[str, Path], run: int) -> str:
+        """جلب المسار القديم الخاص بالمسار الجديد
+
+        المعطيات:
+            path (Union[str, Path]): المسار الجديد
+            run (int): رقم العملية
+
+        المخرجات:
+            str: المسار القديم
+        """
+        current_path = ""
+        unrename_path = ""
+        for part in Path(os.path.normpath(os.fspath(path))).parts:
+            old_part = self.old_name(os.path.join(current_path, part), run) or part
+            unrename_path = os.path.join(unrename_path, old_part)
+            current_path = os.path.join(current_path, part)
+        return unrename_path
+
+    def finish_run(self, run: int, delete: Optional[bool] = False) -> None:
+        """تعليم العملية بانه تم التراجع عنها، او حذفها
+
+        المعطيات:
+            run (int): رقم العملية
+            delete (Optional[bool], optional): حذف اسماء العملية من قاعدة البيانات. Defaults to False.
+        """
+        with self._lock, self._connection:
+            if delete:
+                self._connection.execute("DELETE FROM names WHERE run = ?", (run,))
+                self._connection.execute("DELETE FROM runs WHERE id = ?", (run,))
+            else:
+                self._connection.execute(
+                    "UPDATE runs SET unrenamed = 1 WHERE id = ?", (run,)
+                )
+
+    def reopen_run(self, run: int) -> None:
+        """اعادة العملية الى العمليات التي لم يتم التراجع عنها
+
+        المعطيات:
+            run (int): رقم العملية
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE runs SET unrenamed = 0 WHERE id = ?", (run,)
+            )
+
+    def clear_run(self, run: int) -> None:
+        """حذف اسماء العملية مع بقائها، لكي يتم اضافتها مرة اخرى
+
+        المعطيات:
+            run (int): رقم العملية
+        """
+        with self._lock:
+            self._flush()
+            with self._connection:
+                self._connection.execute("DELETE FROM names WHERE run = ?", (run,))
@@ -0,0 +1,143 @@
+import os
+import re
+from json import dump, load
+from pathlib import Path
+from threading import Thread
+from time import time
+from typing import Optional
+
+from .version import version
+
+__all__ = ("get_latest_version", "UpdateChecker")
+
+VERSION_URL = (
+    "https://raw.githubusercontent.com/TheAwiteb/frenamer/master/frenamer/version.py"
+)
+# المدة بالثواني التي يتم فيها استخدام اخر اصدار محفوظ بدون التحقق مرة اخرى
+CACHE_TTL = 24 * 60 * 60
+# المدة بالثواني قبل اعادة محاولة تحقق لم ينتهِ، مثل تحقق توقف بخروج الاداة
+RETRY_TTL = 60 * 60
+# يتم تعطيل التحقق من وجود تحديث اذا تم تعيين هذا المتغير
+DISABLE_ENV = "FRENAMER_NO_UPDATE_CHECK"
+
+
+def get_latest_version(timeout: Optional[float] = 2.0) -> Optional[str]:
+    """جلب اخر اصدار من frenamer من GitHub
+
+    المعطيات:
+        timeout (Optional[float], optional): اقصى مدة بالثواني لانتظار الرد. Defaults to 2.0.
+
+    المخرجات:
+        Optional[str]: اخر اصدار، او None اذ لم يتم جلبه
+    """
+    # يتم استيراده هنا لان استيراده يأخذ وقت طويل عند تشغيل الاداة
+    import requests
+
+    try:
+        match = re.search(
+            r'^version\s*=\s*"(.*)".*$',
+            requests.get(VERSION_URL, timeout=timeout).text,
+            flags=re.MULTILINE,
+        )
+    except Exception:
+        return None
+    return match.group(1) if match else None
+
+
+def _cache_file() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(cache_home, "frenamer", "latest_version.json")
+
+
+class UpdateChecker:
+    """التحقق من وجود اصدار جديد في الخلفية
+
+    يتم حفظ اخر اصدار في ملف مؤقت ولا يتم التحقق مرة اخرى الا بعد انتهاء
+    CACHE_TTL، والتحقق يتم في خيط منفصل لكي لا يتأخر تشغيل الاداة. التحقق
+    الذي لم ينتهِ (بدون انترنت او بخروج الاداة قبله) لا تتم اعادته الا بعد
+    RETRY_TTL.
+    """
+
+    def __init__(
+        self,
+        cache_file: Optional[Path] = None,
+        ttl: Optional[float] = CACHE_TTL,
+        timeout: Optional[float] = 2.0,
+    ) -> None:
+        """
+        المعطيات:
+            cache_file (Optional[Path], optional): الملف الذي يتم حفظ اخر اصدار فيه. Defaults to None.
+            ttl (Optional[float], optional): مدة صلاحية الاصدار المحفوظ بالثواني. Defaults to CACHE_TTL.
+            timeout (Optional[float], optional): اقصى مدة بالثواني لانتظار الرد. Defaults to 2.0.
+        """
+        self.cache_file = cache_file or _cache_file()
+        self.ttl = ttl
+        self.timeout = timeout
+        self.latest_version: Optional[str] = None
+        # وقت اخر تحقق ناجح
+        self._checked = 0.0
+        self._thread: Optional[Thread] = None
+
+    def _read_cache(self) -> Optional[dict]:
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self) -> None:
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, "w", encoding="utf-8") as f:
+                dump(
+                    {
+                        "checked": self._checked,
+                        "attempted": time(),
+                        "latestVersion": self.latest_version,
+                    },
+                    f,
+                )
+        except OSError:
+            pass
+
+    def _refresh(self) -> None:
+        # يتم حفظ وقت المحاولة قبل الطلب، لان الخيط قد لا ينتهي قبل خروج الاداة
+        # اذ لم يكن هناك انترنت، لكي لا يتم التحقق مع كل تشغيل
+        self._write_cache()
+        latest_version = get_latest_version(timeout=self.timeout)
+        if latest_version is not None:
+            self.latest_version = latest_version
+            self._checked = time()
+            self._write_cache()
+
+    def start(self) -> None:
+        """قراءة الاصدار المحفوظ، وبدء التحقق في الخلفية اذ انتهت صلاحيته"""
+        if os.environ.get(DISABLE_ENV):
+            return
+        cache = self._read_cache()
+        if cache is not None:
+            self.latest_version = cache.get("latestVersion")
+            self._checked = cache.get("checked", 0)
+            if time() - self._checked < self.ttl:
+                return
+            if time() - cache.get("attempted", 0) < RETRY_TTL:
+                return
+        self._thread = Thread(target=self._refresh, name="frenamer-update", daemon=True)
+        self._thread.start()
+
+    def finish(self, wait: Optional[float] = 0.2) -> Optional[str]:
+        """انتظار التحقق لمدة محددة فقط وارجاع الاصدار الجديد ان وجد
+
+        المعطيات:
+            wait (Optional[float], optional): اقصى مدة بالثواني لانتظار التحقق. Defaults to 0.2.
+
+        المخرجات:
+            Optional[str]: الاصدار الجديد اذ كان مختلف عن الاصدار الحالي
+        """
+        if self._thread is not None:
+            self._thread.join(wait)
+        if self.latest_version and self.latest_version != version:
+            return self.latest_version
+        return None
@@ -0,0 +1,284 @@
+import os
+from pathlib import Path
+from time import monotonic
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .api import DIRECTORY, RenameEvent, _warn, rename_directory
+from .filters import EntryFilter
+from .inotify import IN_CREATE, IN_IGNORED, IN_MOVED_TO, IN_Q_OVERFLOW, Inotify
+from .snapshot import TreeSnapshot
+
+__all__ = ("Watcher",)
+
+# الاحداث التي تعني وصول عنصر جديد الى المجلد
+_MASK = IN_CREATE | IN_MOVED_TO
+# اقصى مدة لتجميع الدفعة بالنسبة لـ delay، لكي لا يتم تأجيلها الى ما لا نهاية
+# اذ استمر وصول العناصر
+_MAX_DELAY_FACTOR = 10
+
+
+class _Arrivals(EntryFilter):
+    """قبول العناصر التي وصلت الى المجلد في الدفعة فقط"""
+
+    __slots__ = ("names",)
+
+    def __init__(self, names: Set[str]) -> None:
+        """
+        المعطيات:
+            names (Set[str]): اسماء العناصر التي وصلت الى المجلد
+        """
+        super().__init__()
+        self.names = names
+
+    def accepts(self, name: str, is_dir: bool, depth: int) -> bool:
+        return name in self.names
+
+
+class Watcher:
+    """مراقبة المجلدات باستخدام inotify واعادة تسمية العناصر الجديدة فقط
+
+    يتم تجميع الاحداث في دفعات، الدفعة تنتهي اذ لم يصل اي حدث لمدة delay،
+    ثم يتم اعادة تسمية العناصر التي وصلت فقط بنفس طريقة rename --incremental،
+    لذلك يتم اضافة الاسماء الى نهاية ملف البيانات. المجلدات الجديدة يتم اعادة
+    تسمية محتواها بالكامل ومراقبتها، واعادة التسمية التي تقوم بها الاداة
+    نفسها لا تعتبر عناصر جديدة. العناصر الموجودة في المجلدات عند البدء لا
+    تتم اعادة تسميتها الا مع initial.
+
+    مثال:
+        for event in Watcher(delay=2).watch(["inbox"]):
+            print(event.old_path, event.new_path)
+    """
+
+    __slots__ = (
+        "random",
+        "length",
+        "data_filename",
+        "delay",
+        "on_message",
+        "initial",
+        "_inotify",
+        "_paths",
+        "_own",
+        "_waiting",
+        "_stopping",
+    )
+
+    supported = staticmethod(Inotify.supported)
+
+    def __init__(
+        self,
+        random: Optional[bool] = False,
+        length: Optional[int] = 10,
+        data_filename: Optional[str] = "rename_data.json",
+        delay: Optional[float] = 1.0,
+        on_message: Optional[Callable[[str, str], None]] = None,
+        initial: Optional[bool] = False,
+    ) -> None:
+        """
+        المعطيات:
+            random (Optional[bool], optional): اعادة التسمية باسماء عشوائية. Defaults to False.
+            length (Optional[int], optional): طول الاسم العشوائي. Defaults to 10.
+            data_filename (Optional[str], optional): اسم ملفات البيانات. Defaults to "rename_data.json".
+            delay (Optional[float], optional): المدة بالثواني بدون احداث جديدة قبل اعادة تسمية الدفعة. Defaults to 1.0.
+            on_message (Optional[Callable[[str, str], None]], optional): يتم استدعائها بالتحذيرات والاخطاء، والا يتم استخدام warnings. Defaults to None.
+            initial (Optional[bool], optional): اعادة تسمية العناصر الموجودة في المجلدات عند البدء والتي لم يتم حفظها في ملفات البيانات. Defaults to False.
+        """
+        self.random = random
+        self.length = length
+        self.data_filename = data_filename
+        self.delay = delay
+        self.on_message = on_message or _warn
+        self.initial = initial
+        self._inotify: Optional[Inotify] = None
+        # رقم المراقبة -> مسار المجلد
+        self._paths: Dict[int, str] = {}
+        # (المجلد، الاسم) للعناصر التي تمت اعادة تسميتها في الدفعة السابقة،
+        # يتم تجاهل احداث وصولها
+        self._own: Set[Tuple[str, str]] = set()
+        # هل يتم انتظار الاحداث، وهل تم طلب الايقاف
+        self._waiting = False
+        self._stopping = False
+
+    def watch(self, directories: Iterable[Union[str, Path]]) -> Iterator[RenameEvent]:
+        """مراقبة المجلدات حتى استدعاء close او ايقاف الاداة
+
+        في البداية تتم مراقبة المجلدات ومجلداتها الفرعية فقط، ومع initial يتم
+        ايضاً اعادة تسمية العناصر التي وصلت منذ اخر مرة مثل rename --incremental،
+        ثم يتم انتظار الاحداث. عند الايقاف بـ KeyboardInterrupt او stop اثناء
+        الانتظار يتم اعادة تسمية الدفعة التي وصلت قبل انتهاء المراقبة.
+
+        المعطيات:
+            directories (Iterable[Union[str, Path]]): المجلدات
+
+        المخرجات:
+            Iterator[RenameEvent]: العمليات بنفس ترتيب تنفيذها
+        """
+        roots = [os.path.abspath(directory) for directory in directories]
+        self._inotify = Inotify()
+        self._stopping = False
+        try:
+            yield from self._batch(roots, {}, self.initial)
+            while self._inotify is not None and not self._stopping:
+                events, interrupt = self._wait()
+                yield from self._batch(*self._collect(roots, events))
+                if interrupt is not None and not self._stopping:
+                    raise interrupt
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        """ايقاف المراقبة بعد اعادة تسمية الدفعة الحالية
+
+        يمكن استدعائها من معالج اشارة مثل SIGTERM، اذ كانت المراقبة تنتظر
+        الاحداث يتم قطع الانتظار ثم اعادة تسمية ما وصل منها، والا يتم الايقاف
+        بعد الانتهاء من الدفعة لكي لا تتوقف اعادة التسمية قبل حفظ الاسماء.
+        """
+        self._stopping = True
+        if self._waiting:
+            raise KeyboardInterrupt
+
+    def close(self) -> None:
+        """ايقاف المراقبة"""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._paths.clear()
+        self._own.clear()
+
+    def _wait(self) -> Tuple[list, Optional[KeyboardInterrupt]]:
+        """انتظار دفعة من الاحداث
+
+        المخرجات:
+            Tuple[list, Optional[KeyboardInterrupt]]: الاحداث التي وصلت، والايقاف الذي قطع الانتظار ان وجد
+        """
+        events = []
+        self._waiting = True
+        try:
+            events.extend(self._inotify.read())
+            deadline = monotonic() + self.delay * _MAX_DELAY_FACTOR
+            while True:
+                timeout = min(self.delay, deadline - monotonic())
+                if timeout <= 0:
+                    break
+                more = self._inotify.read(timeout)
+                if not more:
+                    break
+                events.extend(more)
+        except KeyboardInterrupt as interrupt:
+            # الاحداث المتبقية في الطابور بالاضافة الى التي تمت قرائتها
+            self._waiting = False
+            events.extend(self._inotify.read(0))
+            return events, interrupt
+        finally:
+            self._waiting = False
+        return events, None
+
+    def _collect(
+        self, roots: List[str], events: list
+    ) -> Tuple[List[str], Dict[str, Set[str]], bool]:
+        """ارجاع المجلدات التي يجب المرور عليها من دفعة الاحداث
+
+        المعطيات:
+            roots (List[str]): المجلدات الاساسية
+            events (list): الاحداث
+
+        المخرجات:
+            Tuple[List[str], Dict[str, Set[str]], bool]: المجلدات التي يتم المرور عليها بالكامل، والعناصر التي وصلت الى كل مجلد، وهل تتم اعادة تسمية محتوى المجلدات التي يتم المرور عليها
+        """
+        ignored = (self.data_filename, self.data_filename + ".part")
+        changed: Dict[str, Set[str]] = {}
+        for event in events:
+            if event.mask & IN_Q_OVERFLOW:
+                # تم فقد بعض الاحداث، لذلك يتم المرور على جميع المجلدات بنفس
+                # طريقة البداية، المجلدات التي لم يتغير وقت تعديلها لا يتم قرائتها
+                self._own.clear()
+                if not self.initial:
+                    self.on_message(
+                        "Some inotify events were lost, the entries that arrived"
+                        " meanwhile are not renamed.",
+                        "warning",
+                    )
+                return roots, {}, self.initial
+            if event.mask & IN_IGNORED:
+                self._paths.pop(event.wd, None)
+                continue
+            path = self._paths.get(event.wd)
+            if path is None or event.name in ignored:
+                continue
+            key = (path, event.name)
+            if key in self._own:
+                self._own.discard(key)
+                continue
+            changed.setdefault(path, set()).add(event.name)
+        # احداث اعادة التسمية السابقة يتم ارسالها فور تنفيذها، لذلك تمت قرائتها
+        self._own.clear()
+        return [], changed, True
+
+    def _batch(
+        self, walks: List[str], changed: Dict[str, Set[str]], rename: bool
+    ) -> Iterator[RenameEvent]:
+        """اعادة تسمية العناصر الجديدة في الدفعة
+
+        المعطيات:
+            walks (List[str]): المجلدات التي يتم مراقبتها والمرور عليها مع مجلداتها الفرعية
+            changed (Dict[str, Set[str]]): المجلدات التي وصلت اليها عناصر جديدة واسماء العناصر، بدون مجلداتها الفرعية
+            rename (bool): اعادة تسمية محتوى walks، والا تتم مراقبتها فقط
+        """
+        # صورة جديدة لكل دفعة لان المجلدات تتغير بين الدفعات
+        with TreeSnapshot(dir_fds=True, inodes=True) as snapshot:
+            pending = list(reversed(walks))
+            for directory, names in changed.items():
+                try:
+                    yield from self._rename(
+                        directory, snapshot, pending, entry_filter=_Arrivals(names)
+                    )
+                except (OSError, ValueError) as error:
+                    # المجلد قد يكون تم حذفه او نقله بعد وصول الحدث
+                    self.on_message(str(error), "warning")
+            while pending:
+                directory = pending.pop()
+                try:
+                    self._paths[self._inotify.add_watch(directory, _MASK)] = directory
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+                # المراقبة تبدأ قبل قراءة المجلد، لذلك لا يتم فقد اي عنصر يصل
+                # اثناء اعادة التسمية
+                sub_directories: List[str] = []
+                try:
+                    if rename:
+                        yield from self._rename(
+                            directory, snapshot, pending, sub_directories
+                        )
+                    else:
+                        _, dirs, _ = snapshot.content(directory)
+                        sub_directories.extend(
+                            os.path.join(directory, name) for name in dirs
+                        )
+                except (OSError, ValueError) as error:
+                    self.on_message(str(error), "warning")
+                pending.extend(reversed(sub_directories))
+
+    def _rename(
+        self,
+        directory: str,
+        snapshot: TreeSnapshot,
+        pending: List[str],
+        descend: Optional[List[str]] = None,
+        entry_filter: Optional[EntryFilter] = None,
+    ) -> Iterator[RenameEvent]:
+        """اعادة تسمية العناصر الجديدة في المجلد، المجلدات الجديدة يتم اضافتها الى pending"""
+        for event in rename_directory(
+            directory,
+            random=self.random,
+            length=self.length,
+            save_data=True,
+            data_filename=self.data_filename,
+            snapshot=snapshot,
+            incremental=True,
+            descend=descend,
+            entry_filter=entry_filter,
+        ):
+            self._own.add(os.path.split(event.new_path))
+            if event.kind == DIRECTORY and descend is None:
+                pending.append(event.new_path)
+            yield event
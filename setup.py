@@ -26,7 +26,7 @@ setup(
     packages=find_packages(),
     license="MIT",
     keywords=KEYWORD,
-    entry_points={"console_scripts": ["frenamer = frenamer.__main__:app"]},
+    entry_points={"console_scripts": ["frenamer = frenamer.__main__:main"]},
     classifiers=[
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
@@ -36,4 +36,5 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requires,
+    extras_require={"test": ["pytest>=7"]},
 )
@@ -0,0 +1,32 @@
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from frenamer import Renamer
+from frenamer.stats import Stats
+
+DATA_FILENAME = "rename_data.json"
+
+
+@pytest.fixture
+def listing() -> Callable[[Path], list]:
+    """دالة ترجع جميع المسارات داخل المجلد بالنسبة له، مرتبة"""
+
+    def listing(root: Path) -> list:
+        return sorted(path.relative_to(root).as_posix() for path in root.rglob("*"))
+
+    return listing
+
+
+@pytest.fixture
+def incremental_run() -> Callable[[Path], tuple]:
+    """دالة تعيد تسمية المجلد بـ --incremental وترجع عدد العناصر التي تمت اعادة تسميتها وعدد المجلدات التي تمت قرائتها"""
+
+    def incremental_run(root: Path) -> tuple:
+        stats = Stats()
+        renamer = Renamer(data_filename=DATA_FILENAME, incremental=True, stats=stats)
+        renamed = sum(1 for _ in renamer.rename(root))
+        return renamed, stats.counters["listings"]
+
+    return incremental_run
@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from frenamer import file_renamer
+
+
+def test_file_renamer_keeps_numbers_unique(tmp_path: Path) -> None:
+    """الرقم لا يتكرر بامتداد اخر، حتى بدون فهرس او صورة للمجلد"""
+    directory = tmp_path / "dir"
+    directory.mkdir()
+    (directory / "dir-1.png").touch()
+    (directory / "photo.txt").touch()
+    name = file_renamer(directory / "photo.txt")
+    assert name == {"old": "photo.txt", "new": "dir-2.txt"}
+    assert sorted(path.name for path in directory.iterdir()) == [
+        "dir-1.png",
+        "dir-2.txt",
+    ]
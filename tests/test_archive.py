@@ -0,0 +1,114 @@
+import os
+import time
+from json import dump
+from pathlib import Path
+
+from frenamer import RenameArchive, Unrenamer
+from frenamer.data import DataFormat, RenameDataFile
+from frenamer.version import version
+
+DATA_FILENAME = "rename_data.json"
+
+
+def legacy_tree(root: Path) -> None:
+    """شجرة تمت اعادة تسميتها بالاصدار القديم، قبل اعادة التسمية كانت: الملف a والمجلد x
+
+    الملف a اصبح q ثم المجلد x اصبح a، وملف الجيسون يحتوي على المجلدات قبل الملفات.
+    """
+    (root / "a").mkdir(parents=True)
+    (root / "a" / "inner").touch()
+    (root / "q").write_text("file")
+    with open(root / DATA_FILENAME, "w", encoding="utf-8") as f:
+        dump(
+            {
+                "frenamerVersion": version,
+                "names": [
+                    {"old_name": "x", "new_name": "a"},
+                    {"old": "a", "new": "q"},
+                ],
+            },
+            f,
+            indent=4,
+        )
+
+
+def test_legacy_json_archive_unrename(tmp_path: Path, listing) -> None:
+    root = tmp_path / "root"
+    legacy_tree(root)
+    archive_file = tmp_path / "rename_data.fra"
+    assert RenameArchive.pack(archive_file, root, delete=True) == 1
+    assert listing(root) == ["a", "a/inner", "q"]
+    with RenameArchive(archive_file, root) as archive:
+        for _ in Unrenamer(archive=archive).unrename(root):
+            pass
+    assert listing(root) == ["a", "x", "x/inner"]
+    assert (root / "a").read_text() == "file"
+
+
+def test_archive_extract_roundtrip(tmp_path: Path, listing) -> None:
+    root = tmp_path / "root"
+    legacy_tree(root)
+    archive_file = tmp_path / "rename_data.fra"
+    RenameArchive.pack(archive_file, root, codec="lzma", delete=True)
+    with RenameArchive(archive_file, root) as archive:
+        assert archive.old_name(root, "a") == "x"
+        assert archive.extract() == 1
+    assert RenameDataFile(root / DATA_FILENAME).valid
+    for _ in Unrenamer(delete=True).unrename(root):
+        pass
+    assert listing(root) == ["a", "x", "x/inner"]
+
+
+def age(root: Path, data_only: bool = False) -> None:
+    """وقت تعديل قديم للمجلدات، مثل مجلد لم يتغير منذ مدة"""
+    old = time.time_ns() - 60 * 1_000_000_000
+    for directory, _, files in os.walk(root):
+        if not data_only or DATA_FILENAME in files:
+            os.utime(directory, ns=(old, old))
+
+
+def test_incremental_archive_extract(tmp_path: Path, listing, incremental_run) -> None:
+    """حالات --incremental يتم حفظها في الارشيف واعادتها مع extract بصيغة JSON Lines"""
+    root = tmp_path / "root"
+    (root / "d1" / "empty").mkdir(parents=True)
+    for file in ("a.txt", "b.txt", "d1/c.txt"):
+        (root / file).touch()
+    before = listing(root)
+    age(root)
+    assert incremental_run(root)[0] == 5
+    # المرة الثانية تجعل المجلدات بين الملفات في ملف البيانات
+    (root / "newdir").mkdir()
+    (root / "z.txt").touch()
+    before += ["newdir", "z.txt"]
+    age(root)
+    assert incremental_run(root)[0] == 2
+    state = RenameDataFile(root / DATA_FILENAME).state
+
+    archive_file = tmp_path / "rename_data.fra"
+    RenameArchive.pack(archive_file, root, delete=True)
+    with RenameArchive(archive_file, root) as archive:
+        archive.extract(data_format=DataFormat.jsonl)
+    rename_data = RenameDataFile(root / DATA_FILENAME)
+    assert sorted(rename_data.dir_names().values()) == ["d1", "newdir"]
+    # حذف ملف البيانات غير وقت تعديل المجلد، لذلك يتم قرائته مرة اخرى
+    assert rename_data.state == {**state, "mtime": None}
+    # المجلد الفارغ حالته في ملف بيانات المجلد الاعلى منه
+    assert len(rename_data.states()[1]) == 1
+
+    # المجلدات التي تم حذف ملفات بياناتها فقط، المجلدات الفارغة لا يتم قرائتها
+    age(root, data_only=True)
+    assert incremental_run(root) == (0, 2)
+    # بدون --delete لا يتغير المجلد منذ حفظ الحالة، لذلك لا يتم قرائته
+    RenameArchive.pack(archive_file, root)
+    with RenameArchive(archive_file, root) as archive:
+        archive.extract(data_format=DataFormat.jsonl)
+    assert incremental_run(root) == (0, 0)
+    (root / "new.txt").touch()
+    assert incremental_run(root) == (1, 1)
+    before.append("new.txt")
+
+    events = list(Unrenamer(data_filename=DATA_FILENAME, delete=True).unrename(root))
+    assert sorted(
+        Path(event.new_path).name for event in events if event.kind == "directory"
+    ) == ["d1", "empty", "newdir"]
+    assert listing(root) == sorted(before)
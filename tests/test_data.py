@@ -0,0 +1,15 @@
+from pathlib import Path
+
+from frenamer.data import RenameDataFile, RenameDataWriter
+
+
+def test_writer_size_counts_appended_bytes_only(tmp_path: Path) -> None:
+    data_path = tmp_path / "rename_data.json"
+    with RenameDataWriter(data_path) as writer:
+        writer.write({"old": "a", "new": "b"})
+    assert writer.size == data_path.stat().st_size
+
+    with RenameDataWriter(data_path, append=True) as writer:
+        writer.write({"old": "c", "new": "d"})
+    assert writer.size == len('{"old":"c","new":"d"}\n')
+    assert [name["new"] for name in RenameDataFile(data_path).names()] == ["b", "d"]
@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from frenamer import dirfd
+from frenamer.dirfd import DirFdCache, rename_noreplace
+
+
+@pytest.fixture(params=["renameat2", "fallback"])
+def noreplace(request, monkeypatch):
+    """rename_noreplace مع renameat2 ان وجدت، وبدونها"""
+    if request.param == "fallback":
+        monkeypatch.setattr(dirfd, "_renameat2", False)
+    elif not dirfd._load_renameat2():
+        pytest.skip("renameat2 is not available")
+    return rename_noreplace
+
+
+def test_rename_noreplace(tmp_path: Path, noreplace) -> None:
+    """اعادة التسمية تتم اذ لم يكن الهدف موجوداً، ولا يتم استبداله اذ كان موجوداً"""
+    src = tmp_path / "src.txt"
+    dst = tmp_path / "dst.txt"
+    src.write_text("src")
+    noreplace(str(src), str(dst))
+    assert not src.exists() and dst.read_text() == "src"
+
+    src.write_text("new")
+    with pytest.raises(FileExistsError):
+        noreplace(str(src), str(dst))
+    assert src.read_text() == "new" and dst.read_text() == "src"
+
+
+@pytest.mark.skipif(not DirFdCache.supported, reason="dir_fd is not supported")
+def test_rename_noreplace_dir_fd(tmp_path: Path, noreplace) -> None:
+    """المسارات بالنسبة لواصف المجلد"""
+    (tmp_path / "a").write_text("a")
+    (tmp_path / "b").write_text("b")
+    fd = os.open(tmp_path, os.O_RDONLY)
+    try:
+        with pytest.raises(FileExistsError):
+            noreplace("a", "b", src_dir_fd=fd, dst_dir_fd=fd)
+        noreplace("a", "c", src_dir_fd=fd, dst_dir_fd=fd)
+    finally:
+        os.close(fd)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["b", "c"]
+    assert (tmp_path / "b").read_text() == "b"
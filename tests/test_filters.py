@@ -0,0 +1,124 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from frenamer import EntryFilter, Renamer
+from frenamer.snapshot import TreeSnapshot
+from frenamer.stats import Stats
+
+
+def make_tree(root: Path) -> None:
+    for directory in ("photos/deep/deeper", ".git/objects", "docs"):
+        (root / directory).mkdir(parents=True)
+    for file in (
+        "a.jpg",
+        "b.txt",
+        "keep.jpg",
+        "photos/x.jpg",
+        "photos/y.txt",
+        "photos/deep/z.jpg",
+        "photos/deep/deeper/w.jpg",
+        ".git/config.jpg",
+        ".git/objects/o.jpg",
+        "docs/d.txt",
+    ):
+        (root / file).touch()
+
+
+@pytest.fixture
+def scanned(monkeypatch) -> list:
+    """المجلدات التي تمت قرائتها، بالنسبة للمجلد الاساسي"""
+    scanned = []
+    scan = TreeSnapshot._scan
+
+    def recording_scan(self, key):
+        scanned.append(key)
+        return scan(self, key)
+
+    monkeypatch.setattr(TreeSnapshot, "_scan", recording_scan)
+    return scanned
+
+
+def rename(root: Path, entry_filter: EntryFilter, scanned: list) -> dict:
+    """اعادة التسمية وارجاع الاسماء القديمة لكل نوع والمجلدات التي تمت قرائتها"""
+    stats = Stats()
+    renamed = {"file": set(), "directory": set()}
+    for event in Renamer(entry_filter=entry_filter, stats=stats).rename(root):
+        renamed[event.kind].add(os.path.basename(event.old_path))
+    assert stats.counters["listings"] == len(scanned)
+    renamed["scanned"] = {
+        Path(os.path.relpath(key, root)).as_posix() for key in scanned
+    }
+    return renamed
+
+
+def test_exclude_wins_over_include(tmp_path: Path, scanned: list) -> None:
+    """العنصر الذي يطابق exclude لا تتم اعادة تسميته حتى لو طابق include،
+    والمجلد المستبعد لا تتم قراءته، اما المجلد الذي لا يطابق include فيتم المرور عليه"""
+    make_tree(tmp_path)
+    renamed = rename(
+        tmp_path,
+        EntryFilter(include=["*.jpg", "docs"], exclude=["keep*", ".git"]),
+        scanned,
+    )
+    assert renamed["file"] == {"a.jpg", "x.jpg", "z.jpg", "w.jpg"}
+    assert renamed["directory"] == {"docs"}
+    assert ".git" not in {
+        part for path in renamed["scanned"] for part in path.split("/")
+    }
+    assert (tmp_path / "keep.jpg").exists()
+    assert (tmp_path / ".git" / "config.jpg").exists()
+
+
+def test_max_depth_prunes_before_listing(tmp_path: Path, scanned: list) -> None:
+    """المجلدات التي بعد max_depth لا تتم قرائتها ابداً"""
+    make_tree(tmp_path)
+    renamed = rename(tmp_path, EntryFilter(max_depth=2), scanned)
+    assert renamed["file"] == {
+        "a.jpg",
+        "b.txt",
+        "keep.jpg",
+        "x.jpg",
+        "y.txt",
+        "config.jpg",
+        "d.txt",
+    }
+    # المجلدات في العمق 2 تتم اعادة تسميتها بدون قراءة محتواها
+    assert renamed["directory"] == {"photos", ".git", "docs", "deep", "objects"}
+    assert len(renamed["scanned"]) == 4
+    assert "." in renamed["scanned"]
+    assert all(path.count("/") == 0 for path in renamed["scanned"])
+
+
+@pytest.mark.parametrize("files, dirs", [(True, False), (False, True)])
+def test_files_or_dirs_only(
+    tmp_path: Path, scanned: list, files: bool, dirs: bool
+) -> None:
+    """--files-only يمر على جميع المجلدات بدون اعادة تسميتها، و --dirs-only لا يعيد تسمية الملفات"""
+    make_tree(tmp_path)
+    renamed = rename(tmp_path, EntryFilter(files=files, dirs=dirs), scanned)
+    assert bool(renamed["file"]) == files
+    assert bool(renamed["directory"]) == dirs
+    if files:
+        assert len(renamed["file"]) == 10
+        assert sorted(path.name for path in tmp_path.rglob("*") if path.is_dir()) == [
+            ".git",
+            "deep",
+            "deeper",
+            "docs",
+            "objects",
+            "photos",
+        ]
+    else:
+        assert renamed["directory"] == {
+            "photos",
+            "deep",
+            "deeper",
+            ".git",
+            "objects",
+            "docs",
+        }
+        assert (tmp_path / "a.jpg").exists()
+    # جميع المجلدات تتم قرائتها في الحالتين
+    assert len(renamed["scanned"]) == 7
@@ -0,0 +1,50 @@
+import os
+import time
+from pathlib import Path
+
+from frenamer import Unrenamer
+
+DATA_FILENAME = "rename_data.json"
+
+
+def make_tree(root: Path) -> None:
+    for directory in ("docs", "empty", "outer/inner"):
+        (root / directory).mkdir(parents=True)
+    for file in ("a.txt", "b.txt", "docs/c.txt", "docs/d.txt"):
+        (root / file).touch()
+    # وقت تعديل قديم، مثل مجلد لم يتغير منذ مدة
+    old = time.time_ns() - 60 * 1_000_000_000
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, ns=(old, old))
+
+
+def data_less(root: Path) -> list:
+    return [
+        Path(directory)
+        for directory, _, files in os.walk(root)
+        if DATA_FILENAME not in files
+    ]
+
+
+def test_rerun_lists_nothing(tmp_path: Path, listing, incremental_run) -> None:
+    """المرة الثانية بدون تغيير لا تقرأ اي مجلد، بما فيها المجلدات التي ليس لها ملف بيانات"""
+    root = tmp_path / "root"
+    make_tree(root)
+    before = listing(root)
+    renamed, _ = incremental_run(root)
+    assert renamed == 8
+    empty_directories = data_less(root)
+    # المجلد الفارغ والمجلد الداخلي
+    assert len(empty_directories) == 2
+
+    assert incremental_run(root) == (0, 0)
+
+    # عنصر جديد في مجلد ليس له ملف بيانات، يتم قراءة هذا المجلد فقط
+    (empty_directories[0] / "new.txt").touch()
+    assert incremental_run(root) == (1, 1)
+
+    for _ in Unrenamer(data_filename=DATA_FILENAME, delete=True).unrename(root):
+        pass
+    after = listing(root)
+    assert set(before) <= set(after)
+    assert [path.rsplit("/", 1)[-1] for path in set(after) - set(before)] == ["new.txt"]
@@ -0,0 +1,86 @@
+from pathlib import Path
+from string import ascii_letters
+
+import pytest
+
+from frenamer.api import get_dir_name
+from frenamer.index import DirNameIndex, _alphabetical_number, alphabetical_name
+
+BASE = len(ascii_letters)
+
+
+@pytest.mark.parametrize(
+    "number, name",
+    [
+        (1, "a"),
+        (26, "z"),
+        (27, "A"),
+        (BASE, "Z"),
+        (BASE + 1, "aa"),
+        (2 * BASE, "aZ"),
+        (2 * BASE + 1, "ba"),
+        (BASE + BASE**2, "ZZ"),
+        (BASE + BASE**2 + 1, "aaa"),
+    ],
+)
+def test_alphabetical_name_boundaries(number: int, name: str) -> None:
+    assert alphabetical_name(number) == name
+    assert _alphabetical_number(name) == number
+
+
+def test_alphabetical_number_round_trip() -> None:
+    """كل رقم له اسم واحد، والاسماء بنفس ترتيب الارقام حسب الطول"""
+    names = [alphabetical_name(number) for number in range(1, 3 * BASE**2)]
+    assert len(set(names)) == len(names)
+    assert [_alphabetical_number(name) for name in names] == list(range(1, 3 * BASE**2))
+    for name in ("", "a1", "a-b", "é"):
+        assert _alphabetical_number(name) is None
+
+
+def test_allocate_crosses_lengths() -> None:
+    index = DirNameIndex()
+    index.cursor = BASE
+    assert [index.allocate() for _ in range(3)] == ["Z", "aa", "ab"]
+
+
+def test_allocate_skips_taken_names() -> None:
+    index = DirNameIndex(["a", "c", "other"])
+    assert [index.allocate() for _ in range(3)] == ["b", "d", "e"]
+
+
+def test_release_reuses_smallest_name() -> None:
+    """الاسماء التي تم تحريرها يتم حجزها مرة اخرى من الاصغر قبل التقدم بالمؤشر"""
+    index = DirNameIndex()
+    assert [index.allocate() for _ in range(4)] == ["a", "b", "c", "d"]
+    index.release("c")
+    index.release("a")
+    # اسماء بعد المؤشر او ليست ابجدية لا يتم اضافتها الى الاسماء المحررة
+    index.release("zz")
+    index.release("a1")
+    assert [index.allocate() for _ in range(3)] == ["a", "c", "e"]
+
+    # اسم محرر تم حجزه مرة اخرى قبل استخدامه يتم تخطيه
+    index.release("b")
+    index.add("b")
+    assert index.allocate() == "f"
+
+
+def test_prefix() -> None:
+    """مع prefix يتم حجز الاسماء التي تبدأ به فقط، مثل 'Z-a'"""
+    index = DirNameIndex(["Z-a", "Z-c", "b"], prefix="Z")
+    assert [index.allocate() for _ in range(2)] == ["Z-b", "Z-d"]
+    index.release("Z-b")
+    # نفس الرقم لكن بدون البداية او ببداية اخرى
+    index.release("a")
+    index.release("Y-a")
+    assert [index.allocate() for _ in range(2)] == ["Z-b", "Z-e"]
+
+    index = DirNameIndex(["my-dir-a"], prefix="my-dir")
+    assert index.allocate() == "my-dir-b"
+
+
+def test_get_dir_name_prefix(tmp_path: Path) -> None:
+    for name in ("Z-a", "Z-b", "a"):
+        (tmp_path / name).mkdir()
+    assert get_dir_name("Z", str(tmp_path)) == "Z-c"
+    assert get_dir_name("", str(tmp_path)) == "b"
@@ -0,0 +1,136 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from frenamer import Unrenamer, app, rollback_from_journal
+from frenamer.data import RenameDataFile
+from frenamer.journal import Journal, read_journal
+
+DATA_FILENAME = "rename_data.json"
+
+
+def unrename_journal(path: Path, root: Path) -> Journal:
+    return Journal(
+        path,
+        header={
+            "command": "unrename",
+            "directories": [root.as_posix()],
+            "options": {"delete": True, "data_filename": DATA_FILENAME},
+        },
+    )
+
+
+def test_rollback_interleaved_directories(tmp_path: Path, listing) -> None:
+    """unrename -d -j تتداخل فيه عمليات المجلدات، ملف كل مجلد يعاد كتابته كاملاً"""
+    root = tmp_path / "root"
+    names = {"a": [("a-1", "x1"), ("a-2", "x2")], "b": [("b-1", "y1"), ("b-2", "y2")]}
+    for directory, pairs in names.items():
+        (root / directory).mkdir(parents=True)
+        for _, old in pairs:
+            # تم التراجع عن اعادة التسمية وحذف ملف البيانات قبل التوقف
+            (root / directory / old).touch()
+    journal_file = tmp_path / "unrename.journal"
+    with unrename_journal(journal_file, root) as journal:
+        # التراجع يتم بعكس ترتيب اعادة التسمية
+        for index in (1, 0):
+            for directory, pairs in names.items():
+                new, old = pairs[index]
+                journal.rename((root / directory).as_posix(), new, old, False)
+        for directory in names:
+            journal.delete((root / directory / DATA_FILENAME).as_posix())
+        journal.close()
+
+    assert rollback_from_journal(journal_file) == (0, 4)
+    for directory, pairs in names.items():
+        assert listing(root / directory) == sorted(
+            [new for new, _ in pairs] + [DATA_FILENAME]
+        )
+        rename_data = RenameDataFile(root / directory / DATA_FILENAME)
+        assert rename_data.valid
+        assert [(name["old"], name["new"]) for name in rename_data.names()] == [
+            (old, new) for new, old in pairs
+        ]
+
+    # ملفات البيانات التي تمت اعادة كتابتها تكفي للتراجع مرة اخرى
+    for _ in Unrenamer(delete=True).unrename(root):
+        pass
+    assert listing(root) == ["a", "a/x1", "a/x2", "b", "b/y1", "b/y2"]
+
+
+# يتم ايقاف العملية (بدون اغلاق اي ملف) عند اعادة التسمية رقم limit، قبل
+# تنفيذها او بعده
+CRASHING_RENAME = """
+import os, sys
+import frenamer.dirfd as dirfd
+import frenamer.snapshot as snapshot
+from frenamer import app
+
+limit, applied = int(sys.argv[1]), sys.argv[2] == "1"
+count = 0
+
+
+def crashing(rename):
+    def wrapper(*args, **kwargs):
+        global count
+        count += 1
+        if count == limit and not applied:
+            os._exit(9)
+        rename(*args, **kwargs)
+        if count == limit:
+            os._exit(9)
+
+    return wrapper
+
+
+os.rename = crashing(os.rename)
+dirfd.rename_noreplace = snapshot.rename_noreplace = crashing(dirfd.rename_noreplace)
+app(sys.argv[3:], prog_name="frenamer")
+"""
+
+
+def make_tree(root: Path) -> None:
+    for directory in ("docs/inner", "photos"):
+        (root / directory).mkdir(parents=True)
+    for file in ("a.txt", "b.txt", "docs/c.txt", "docs/d.txt", "docs/inner/e.txt"):
+        (root / file).touch()
+    (root / "photos" / "f.png").touch()
+
+
+@pytest.mark.parametrize("applied", [False, True])
+@pytest.mark.parametrize("limit", [2, 6])
+def test_resume_after_kill(tmp_path: Path, listing, limit: int, applied: bool) -> None:
+    """ايقاف rename --journal في المنتصف ثم resume، اخر عملية في السجل قد تكون لم تنفذ"""
+    root = tmp_path / "root"
+    make_tree(root)
+    before = listing(root)
+    journal_file = tmp_path / "rename.journal"
+    crashed = subprocess.run(
+        [sys.executable, "-c", CRASHING_RENAME, str(limit), str(int(applied))]
+        + ["rename", "-s", "-q", "--journal", str(journal_file), str(root)],
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    assert crashed.returncode == 9
+    # اخر سطر في السجل هو العملية التي توقفت عندها
+    last = list(read_journal(journal_file))[-1]
+    assert "p" in last
+    assert os.path.lexists(os.path.join(last["p"], last["n"])) == applied
+
+    result = CliRunner().invoke(app, ["resume", "-q", str(journal_file)])
+    assert result.exit_code == 0, result.output
+    assert not journal_file.exists()
+    after = listing(root)
+    data_files = [path for path in after if path.endswith(DATA_FILENAME)]
+    assert len(data_files) == 4
+    # جميع العناصر تمت اعادة تسميتها مرة واحدة فقط، وتم حفظها في ملفات البيانات
+    assert not set(before) & set(after)
+    assert sum(
+        len(list(RenameDataFile(root / path).names())) for path in data_files
+    ) == len(before)
+
+    for _ in Unrenamer(data_filename=DATA_FILENAME, delete=True).unrename(root):
+        pass
+    assert listing(root) == before
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+
+from frenamer import RenamePlan, Unrenamer, apply_plan, build_plan
+
+DATA_FILENAME = "rename_data.json"
+OPTIONS = {"save_data": True, "data_filename": DATA_FILENAME, "data_format": "jsonl"}
+
+
+def make_tree(root: Path) -> None:
+    (root / "docs" / "inner").mkdir(parents=True)
+    for file in ("a.txt", "b.txt", "docs/c.txt", "docs/inner/d.txt"):
+        (root / file).touch()
+
+
+def test_saved_plan_round_trip(tmp_path: Path, listing) -> None:
+    """تنفيذ الخطة بعد حفظها وقرائتها ينتج نفس الاسماء، ويمكن التراجع عنها"""
+    root = tmp_path / "root"
+    make_tree(root)
+    before = listing(root)
+    plan_file = tmp_path / "plan.jsonl"
+    build_plan([root], options=OPTIONS).save(plan_file)
+    # بناء الخطة لا يغير اي شيء
+    assert listing(root) == before
+
+    plan = RenamePlan.load(plan_file)
+    events = list(apply_plan(plan))
+    assert [Path(event.new_path).name for event in events] == plan.new_names
+    assert len(events) == 6
+    assert not set(before) & set(listing(root))
+
+    for _ in Unrenamer(data_filename=DATA_FILENAME, delete=True).unrename(root):
+        pass
+    assert listing(root) == before
+
+
+def test_stale_plan_does_not_replace(tmp_path: Path) -> None:
+    """اذ تغير المجلد بعد بناء الخطة يتم التوقف بدون استبدال اي عنصر"""
+    root = tmp_path / "root"
+    make_tree(root)
+    plan = build_plan([root], options=OPTIONS)
+    taken = root / plan.new_names[1]
+    taken.write_text("keep")
+
+    with pytest.raises(FileExistsError):
+        for _ in apply_plan(plan):
+            pass
+    assert taken.read_text() == "keep"
+    # العنصر الذي تمت اعادة تسميته قبل التوقف محفوظ في ملف البيانات
+    assert (root / plan.new_names[0]).exists()
+    assert plan.new_names[0] in (root / DATA_FILENAME).read_text()
+
+
+def test_invalid_plan_file(tmp_path: Path) -> None:
+    """الملف الذي ليس خطة يرفع ValueError"""
+    plan_file = tmp_path / "plan.jsonl"
+    plan_file.write_text('{"names": []}\n')
+    with pytest.raises(ValueError):
+        RenamePlan.load(plan_file)
@@ -0,0 +1,36 @@
+import pytest
+
+import frenamer.reporter as reporter_module
+from frenamer.reporter import Reporter
+
+
+def broken_echo(*args, **kwargs):
+    raise BrokenPipeError(32, "Broken pipe")
+
+
+def test_output_error_stops_renaming(monkeypatch) -> None:
+    """خطأ خيط الطباعة يتم رفعه مع الحدث التالي، ولا يتم رفعه مرة اخرى من close"""
+    monkeypatch.setattr(reporter_module.typer, "echo", broken_echo)
+    reporter = Reporter()
+    reporter.renamed("a", "b")
+    reporter._thread.join(5)
+    with pytest.raises(BrokenPipeError):
+        reporter.renamed("c", "d")
+    reporter.close()
+
+
+def test_output_error_raised_from_close(monkeypatch) -> None:
+    monkeypatch.setattr(reporter_module.typer, "echo", broken_echo)
+    with pytest.raises(BrokenPipeError):
+        with Reporter() as reporter:
+            reporter.renamed("a", "b")
+
+
+def test_log_is_written(tmp_path) -> None:
+    log_file = tmp_path / "renamed.log"
+    with Reporter(quiet=True, log_file=log_file) as reporter:
+        reporter.directory("root")
+        reporter.renamed("a", "b")
+    assert reporter.entries == 1
+    assert reporter._queue.maxsize == reporter_module._MAX_PENDING
+    assert log_file.read_text().splitlines() == ["Directory: root", " Rename a to b"]
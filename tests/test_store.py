@@ -0,0 +1,82 @@
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from frenamer import Renamer, Unrenamer, app
+from frenamer.store import SQLiteStore
+
+
+def make_tree(root: Path) -> None:
+    for directory in ("docs/inner", "photos"):
+        (root / directory).mkdir(parents=True)
+    for file in ("a.txt", "b.txt", "docs/c.txt", "docs/inner/d.txt", "photos/e.png"):
+        (root / file).touch()
+
+
+def names_count(database: Path) -> int:
+    with sqlite3.connect(database) as connection:
+        return connection.execute("SELECT COUNT(*) FROM names").fetchone()[0]
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_store_round_trip(tmp_path: Path, listing, jobs: int) -> None:
+    """rename --store ثم البحث عن الاسماء القديمة ثم unrename --store"""
+    root = tmp_path / "root"
+    make_tree(root)
+    before = listing(root)
+    database = tmp_path / "names.db"
+    store_spec = f"sqlite:{database}"
+    runner = CliRunner()
+
+    result = runner.invoke(
+        app, ["rename", "--store", store_spec, "--jobs", str(jobs), "-q", str(root)]
+    )
+    assert result.exit_code == 0, result.output
+    after = listing(root)
+    assert not set(before) & set(after)
+    # الاسماء في قاعدة البيانات فقط
+    assert not [path for path in after if path.endswith(".json")]
+
+    with SQLiteStore(database) as store:
+        (run,) = store.runs(root)
+        assert store.directories_count(run) == 4
+        old_paths = {
+            Path(store.unrename_path(root / path, run)).relative_to(root).as_posix()
+            for path in after
+        }
+        assert old_paths == set(before)
+        renamed_file = next(path for path in after if path.endswith(".png"))
+        assert store.old_name(root / renamed_file) == "e.png"
+        assert store.old_name(root / "missing") is None
+
+    result = runner.invoke(
+        app, ["unrename", "--store", store_spec, "-d", "-q", str(root)]
+    )
+    assert result.exit_code == 0, result.output
+    assert listing(root) == before
+    with SQLiteStore(database) as store:
+        assert store.runs(root) == []
+    assert names_count(database) == 0
+
+
+def test_store_batches_and_keeps_finished_runs(tmp_path: Path, listing) -> None:
+    """الاضافة على دفعات صغيرة، والتراجع بدون حذف يبقي الاسماء"""
+    root = tmp_path / "root"
+    make_tree(root)
+    before = listing(root)
+    database = tmp_path / "names.db"
+    with SQLiteStore(database, batch_size=2) as store:
+        renamed = list(Renamer(store=store).rename(root))
+        assert len(renamed) == 8
+        # الاسماء التي لم تكتمل دفعتها يتم حفظها قبل البحث
+        assert store.old_name(renamed[-1].new_path) == os.path.basename(
+            renamed[-1].old_path
+        )
+        unrenamed = list(Unrenamer(store=store).unrename(root))
+        assert len(unrenamed) == 8
+        assert store.runs(root) == []
+    assert listing(root) == before
+    assert names_count(database) == 8
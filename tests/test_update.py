@@ -0,0 +1,62 @@
+from json import load
+from pathlib import Path
+from threading import Event
+
+import frenamer.update as update
+from frenamer.update import UpdateChecker
+
+
+def test_hanging_check_is_cached(tmp_path: Path, monkeypatch) -> None:
+    """التحقق الذي لا ينتهي قبل خروج الاداة يتم حفظ وقته، ولا يتكرر مع كل تشغيل"""
+    release = Event()
+    calls = []
+
+    def get_latest_version(timeout=None):
+        calls.append(timeout)
+        release.wait(5)
+        return None
+
+    monkeypatch.delenv(update.DISABLE_ENV, raising=False)
+    monkeypatch.setattr(update, "get_latest_version", get_latest_version)
+    cache_file = tmp_path / "latest_version.json"
+    checker = UpdateChecker(cache_file=cache_file)
+    checker.start()
+    assert checker.finish(wait=0.05) is None
+    assert cache_file.exists()
+
+    second = UpdateChecker(cache_file=cache_file)
+    second.start()
+    assert second._thread is None
+    release.set()
+    assert len(calls) == 1
+
+
+def test_successful_check_updates_version(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv(update.DISABLE_ENV, raising=False)
+    monkeypatch.setattr(update, "get_latest_version", lambda timeout=None: "99.0.0")
+    cache_file = tmp_path / "latest_version.json"
+    checker = UpdateChecker(cache_file=cache_file)
+    checker.start()
+    assert checker.finish(wait=5) == "99.0.0"
+    cached = UpdateChecker(cache_file=cache_file)
+    cached.start()
+    assert cached._thread is None
+    assert cached.finish() == "99.0.0"
+
+
+def test_unfinished_check_is_retried(tmp_path: Path, monkeypatch) -> None:
+    """التحقق الذي لم ينتهِ تتم اعادته بعد RETRY_TTL، مع الاحتفاظ بوقت اخر تحقق ناجح"""
+    monkeypatch.delenv(update.DISABLE_ENV, raising=False)
+    monkeypatch.setattr(update, "get_latest_version", lambda timeout=None: None)
+    cache_file = tmp_path / "latest_version.json"
+    cache_file.write_text('{"checked": 1, "latestVersion": "99.0.0"}')
+    checker = UpdateChecker(cache_file=cache_file)
+    checker.start()
+    assert checker.finish(wait=5) == "99.0.0"
+
+    monkeypatch.setattr(update, "RETRY_TTL", 0)
+    retried = UpdateChecker(cache_file=cache_file)
+    retried.start()
+    assert retried._thread is not None
+    assert retried.finish(wait=5) == "99.0.0"
+    assert load(cache_file.open())["checked"] == 1
@@ -0,0 +1,153 @@
+import json
+import os
+from pathlib import Path
+
+from frenamer import (
+    DRIFTED,
+    FOREIGN,
+    MISSING,
+    Mismatch,
+    Renamer,
+    Unrenamer,
+    verify_data_file,
+)
+from frenamer.data import RenameDataFile, name_pair
+
+DATA_FILENAME = "rename_data.json"
+
+
+def make_tree(root: Path) -> None:
+    (root / "docs").mkdir(parents=True)
+    for file in ("a.txt", "b.txt", "c.txt", "docs/d.txt"):
+        (root / file).touch()
+
+
+def rename(root: Path) -> dict:
+    """اعادة تسمية المجلد مع حفظ ارقام inode، وارجاع الاسم القديم -> الاسم الجديد"""
+    for _ in Renamer(data_filename=DATA_FILENAME, save_data=True).rename(root):
+        pass
+    return dict(
+        name_pair(names) for names in RenameDataFile(root / DATA_FILENAME).names()
+    )
+
+
+def change(root: Path, names: dict) -> None:
+    """نقل a.txt، واستبدال c.txt بملف جديد بنفس الاسم، وحذف b.txt
+
+    يتم الاستبدال قبل الحذف لكي لا يحصل الملف الجديد على رقم inode المحذوف
+    """
+    (root / names["a.txt"]).rename(root / "moved.txt")
+    other = root / "other"
+    other.touch()
+    os.replace(other, root / names["c.txt"])
+    (root / names["b.txt"]).unlink()
+
+
+def test_verify_clean_tree(tmp_path: Path) -> None:
+    """لا يوجد اي اختلاف بعد اعادة التسمية مباشرة"""
+    make_tree(tmp_path)
+    rename(tmp_path)
+    assert list(verify_data_file(tmp_path / DATA_FILENAME)) == []
+    assert list(Unrenamer(data_filename=DATA_FILENAME).verify(tmp_path)) == []
+
+
+def test_verify_reports_each_mismatch(tmp_path: Path, listing) -> None:
+    """العنصر الذي تم نقله DRIFTED بمساره الحالي، والمحذوف MISSING، والمستبدل FOREIGN"""
+    make_tree(tmp_path)
+    names = rename(tmp_path)
+    change(tmp_path, names)
+    after = listing(tmp_path)
+
+    root = tmp_path.as_posix()
+    expected = sorted(
+        [
+            Mismatch(
+                DRIFTED,
+                os.path.join(root, names["a.txt"]),
+                os.path.join(root, "moved.txt"),
+            ),
+            Mismatch(MISSING, os.path.join(root, names["b.txt"])),
+            Mismatch(FOREIGN, os.path.join(root, names["c.txt"])),
+        ]
+    )
+    assert sorted(verify_data_file(tmp_path / DATA_FILENAME)) == expected
+    # المجلد الفرعي لم يتغير، ولا يتم تغيير اي شيء عند المقارنة
+    unrenamer = Unrenamer(data_filename=DATA_FILENAME)
+    assert sorted(unrenamer.verify(tmp_path)) == expected
+    assert listing(tmp_path) == after
+
+
+def test_verify_without_inode_compares_names(tmp_path: Path) -> None:
+    """العناصر المحفوظة من جهاز اخر تتم مقارنتها بالاسم فقط"""
+    make_tree(tmp_path)
+    names = rename(tmp_path)
+    data_file = tmp_path / DATA_FILENAME
+    data = json.loads(data_file.read_text())
+    for item in data["names"]:
+        item["dev"] += 1
+    data_file.write_text(json.dumps(data))
+    change(tmp_path, names)
+
+    root = tmp_path.as_posix()
+    # الملف المستبدل موجود بنفس الاسم، لذلك لا يتم اعتباره FOREIGN
+    assert sorted(verify_data_file(data_file)) == sorted(
+        Mismatch(MISSING, os.path.join(root, names[name]))
+        for name in ("a.txt", "b.txt")
+    )
+
+
+def test_unrename_recovers_by_inode(tmp_path: Path, listing) -> None:
+    """العنصر الذي تمت اعادة تسميته بعد frenamer يتم التراجع عنه من اسمه الحالي"""
+    make_tree(tmp_path)
+    before = listing(tmp_path)
+    names = rename(tmp_path)
+    (tmp_path / names["a.txt"]).rename(tmp_path / "moved.txt")
+    (tmp_path / names["docs"]).rename(tmp_path / "moved")
+
+    messages = []
+    unrenamer = Unrenamer(
+        data_filename=DATA_FILENAME,
+        delete=True,
+        on_message=lambda text, level: messages.append((level, text)),
+    )
+    events = {
+        Path(event.new_path).name: Path(event.old_path).name
+        for event in unrenamer.unrename(tmp_path)
+    }
+    assert events["a.txt"] == "moved.txt"
+    assert events["docs"] == "moved"
+    assert sorted(messages) == sorted(
+        (
+            "warning",
+            f"Recovered by inode: {(tmp_path / names[name]).as_posix()} is now {current}",
+        )
+        for name, current in (("a.txt", "moved.txt"), ("docs", "moved"))
+    )
+    assert listing(tmp_path) == before
+
+
+def test_unrename_skips_missing_and_foreign(tmp_path: Path) -> None:
+    """العنصر المحذوف او المستبدل لا يتم التراجع عنه، مع تحذير"""
+    make_tree(tmp_path)
+    names = rename(tmp_path)
+    change(tmp_path, names)
+
+    messages = []
+    unrenamer = Unrenamer(
+        data_filename=DATA_FILENAME,
+        delete=True,
+        on_message=lambda text, level: messages.append(text),
+    )
+    restored = sorted(
+        Path(event.new_path).name for event in unrenamer.unrename(tmp_path)
+    )
+    assert restored == ["a.txt", "d.txt", "docs"]
+    assert sorted(messages) == sorted(
+        [
+            f"Recovered by inode: {(tmp_path / names['a.txt']).as_posix()} is now moved.txt",
+            f"Missing: {(tmp_path / names['b.txt']).as_posix()}",
+            f"Missing: {(tmp_path / names['c.txt']).as_posix()}",
+        ]
+    )
+    # الملف الجديد يبقى باسمه
+    assert (tmp_path / names["c.txt"]).exists()
@@ -0,0 +1,54 @@
+import signal
+import threading
+from pathlib import Path
+
+import pytest
+
+from frenamer import Watcher
+
+pytestmark = pytest.mark.skipif(
+    not Watcher.supported(), reason="inotify is not available"
+)
+
+
+def stop_on_alarm(watcher: Watcher, seconds: float) -> None:
+    """استدعاء stop من معالج اشارة كما يتم مع SIGTERM في الاداة"""
+    signal.signal(signal.SIGALRM, lambda signum, frame: watcher.stop())
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+
+
+def test_existing_entries_are_kept(tmp_path: Path) -> None:
+    """العناصر الموجودة عند البدء لا تتم اعادة تسميتها، والدفعة التي وصلت يتم اعادة تسميتها عند الايقاف"""
+    (tmp_path / "pre.txt").touch()
+    (tmp_path / "old").mkdir()
+    watcher = Watcher(delay=5)
+    # الدفعة لا تنتهي قبل الايقاف بسبب delay
+    threading.Timer(0.3, (tmp_path / "old" / "new.txt").touch).start()
+    stop_on_alarm(watcher, 1.0)
+    try:
+        events = list(watcher.watch([tmp_path]))
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, signal.SIG_DFL)
+
+    assert [(Path(event.old_path).name, event.kind) for event in events] == [
+        ("new.txt", "file")
+    ]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["old", "pre.txt"]
+    assert sorted(path.name for path in (tmp_path / "old").iterdir()) == [
+        "old-1.txt",
+        "rename_data.json",
+    ]
+
+
+def test_initial_renames_existing_entries(tmp_path: Path) -> None:
+    """مع initial يتم اعادة تسمية العناصر الموجودة عند البدء"""
+    (tmp_path / "pre.txt").touch()
+    events = Watcher(initial=True).watch([tmp_path])
+    try:
+        event = next(events)
+    finally:
+        events.close()
+
+    assert Path(event.old_path).name == "pre.txt"
+    assert not (tmp_path / "pre.txt").exists()